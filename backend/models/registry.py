@@ -0,0 +1,357 @@
+"""
+Versioned model artifact registry in the ML models bucket.
+
+Layout, per model:
+    registry/{model}/manifest.json       latest version plus per-version file table
+    registry/{model}/blobs/{sha256}      content-addressed artifact files
+
+A version is a set of named files (weights shards, vocabularies, configs),
+each stored once by content hash. Lambdas resolve "latest" with one small
+manifest read and download only the files they open, into /tmp keyed by
+hash, so warm containers never download the same bytes twice. Files are
+stored uncompressed so they can be memory-mapped straight from /tmp.
+
+Manifest updates are conditional writes (If-Match on the ETag read, or
+If-None-Match for a new manifest), so concurrent publishers retry instead
+of overwriting each other's versions.
+
+Usage:
+    python -m models.registry publish sentiment-head weights=model.npy vocab=vocab.json
+    python -m models.registry list sentiment-head
+    python -m models.registry promote sentiment-head <version>
+"""
+
+import os
+import json
+import mmap
+import time
+import hashlib
+import argparse
+import tempfile
+from datetime import datetime
+from typing import Dict, Any, Optional, Callable, Tuple
+import boto3
+from botocore.exceptions import ClientError
+
+AWS_REGION = os.environ.get("AWS_REGION", "us-east-1")
+ML_MODELS_BUCKET = os.environ.get("ML_MODELS_BUCKET", "")
+
+REGISTRY_PREFIX = "registry"
+CACHE_DIR = os.environ.get("MODEL_CACHE_DIR", "/tmp/model-cache")
+
+# Lambda /tmp defaults to 512 MB; keep room for everything else
+CACHE_MAX_BYTES = int(os.environ.get("MODEL_CACHE_MAX_BYTES", 400 * 1024 * 1024))
+MANIFEST_TTL_SECONDS = 60
+MAX_MANIFEST_VERSIONS = 20
+MANIFEST_WRITE_ATTEMPTS = 5
+
+# Per-container caches
+_manifests: Dict[str, Any] = {}
+_loaded: Dict[str, Any] = {}
+
+
+def manifest_key(model_name: str) -> str:
+    return f"{REGISTRY_PREFIX}/{model_name}/manifest.json"
+
+
+def blob_key(model_name: str, sha256: str) -> str:
+    return f"{REGISTRY_PREFIX}/{model_name}/blobs/{sha256}"
+
+
+def file_sha256(path: str) -> str:
+    """Streaming SHA-256 of a local file"""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def is_not_found(error: ClientError) -> bool:
+    return error.response["Error"]["Code"] in ("404", "NoSuchKey", "NotFound")
+
+
+def read_manifest(s3_client, bucket: str, model_name: str) -> Tuple[Dict[str, Any], Optional[str]]:
+    """Read a model's manifest from S3 with its ETag (None if not yet published)"""
+    try:
+        response = s3_client.get_object(Bucket=bucket, Key=manifest_key(model_name))
+    except ClientError as e:
+        if not is_not_found(e):
+            raise
+        return {"model": model_name, "latest": None, "versions": {}}, None
+
+    return json.loads(response["Body"].read()), response["ETag"]
+
+
+def get_manifest(bucket: str, model_name: str, refresh: bool = False) -> Dict[str, Any]:
+    """Read a model's manifest, reusing this container's copy for MANIFEST_TTL_SECONDS"""
+    cached = _manifests.get(model_name)
+    if cached and not refresh and time.time() - cached[0] < MANIFEST_TTL_SECONDS:
+        return cached[1]
+
+    s3_client = boto3.client("s3", region_name=AWS_REGION)
+    manifest, _ = read_manifest(s3_client, bucket, model_name)
+
+    _manifests[model_name] = (time.time(), manifest)
+    return manifest
+
+
+def update_manifest(
+    bucket: str, model_name: str, change: Callable[[Dict[str, Any]], Any]
+) -> Any:
+    """
+    Read-modify-write a manifest with a conditional put, retrying on conflicts.
+
+    Args:
+        bucket: ML models bucket
+        model_name: Registry name
+        change: Applied to a fresh manifest before each write attempt
+
+    Returns:
+        Whatever `change` returned for the manifest that was written
+    """
+    s3_client = boto3.client("s3", region_name=AWS_REGION)
+
+    for attempt in range(MANIFEST_WRITE_ATTEMPTS):
+        manifest, etag = read_manifest(s3_client, bucket, model_name)
+        result = change(manifest)
+
+        condition = {"IfMatch": etag} if etag else {"IfNoneMatch": "*"}
+        try:
+            s3_client.put_object(
+                Bucket=bucket,
+                Key=manifest_key(model_name),
+                Body=json.dumps(manifest, indent=2),
+                ContentType="application/json",
+                CacheControl="no-cache",
+                **condition,
+            )
+        except ClientError as e:
+            code = e.response["Error"]["Code"]
+            if code not in ("PreconditionFailed", "ConditionalRequestConflict"):
+                raise
+            print(f"Manifest for {model_name} changed concurrently, retrying ({attempt + 1})")
+            continue
+
+        _manifests[model_name] = (time.time(), manifest)
+        return result
+
+    raise RuntimeError(
+        f"Manifest for {model_name} kept changing; gave up after "
+        f"{MANIFEST_WRITE_ATTEMPTS} attempts"
+    )
+
+
+def publish_model(
+    bucket: str,
+    model_name: str,
+    files: Dict[str, str],
+    metadata: Optional[Dict[str, Any]] = None,
+    set_latest: bool = True,
+) -> Dict[str, Any]:
+    """
+    Publish a model version.
+
+    Files already in the registry (same hash) are not uploaded again. The
+    version id is derived from the file hashes, so republishing identical
+    artifacts is a no-op.
+
+    Args:
+        bucket: ML models bucket
+        model_name: Registry name, e.g. "sentiment-head"
+        files: {file name: local path}
+        metadata: Free-form metadata (metrics, training data range, ...)
+        set_latest: Point "latest" at this version
+
+    Returns:
+        dict: Published version entry
+    """
+    s3_client = boto3.client("s3", region_name=AWS_REGION)
+
+    file_table = {}
+    for name, path in sorted(files.items()):
+        sha256 = file_sha256(path)
+        size = os.path.getsize(path)
+        key = blob_key(model_name, sha256)
+
+        try:
+            s3_client.head_object(Bucket=bucket, Key=key)
+            print(f"Blob for {name} already stored ({sha256[:12]})")
+        except ClientError as e:
+            if not is_not_found(e):
+                raise
+            s3_client.upload_file(path, bucket, key)
+            print(f"✅ Uploaded {name} ({size} bytes) as {sha256[:12]}")
+
+        file_table[name] = {"sha256": sha256, "size": size}
+
+    version = hashlib.sha256(
+        json.dumps(file_table, sort_keys=True).encode("utf-8")
+    ).hexdigest()[:16]
+
+    published_at = datetime.now().isoformat()
+
+    def add_version(manifest: Dict[str, Any]) -> Dict[str, Any]:
+        entry = manifest["versions"].get(version) or {
+            "version": version,
+            "files": file_table,
+            "metadata": metadata or {},
+            "published_at": published_at,
+        }
+        manifest["versions"][version] = entry
+        if set_latest:
+            manifest["latest"] = version
+
+        # Keep the manifest small: drop the oldest versions beyond the limit
+        ordered = sorted(manifest["versions"].values(), key=lambda v: v["published_at"])
+        for old in ordered[:-MAX_MANIFEST_VERSIONS]:
+            if old["version"] != manifest.get("latest"):
+                manifest["versions"].pop(old["version"])
+        return entry
+
+    entry = update_manifest(bucket, model_name, add_version)
+    print(f"✅ Published {model_name} version {version}")
+    return entry
+
+
+def promote_version(bucket: str, model_name: str, version: str) -> Dict[str, Any]:
+    """Point "latest" at an already published version (rollback/roll forward)"""
+
+    def set_latest_version(manifest: Dict[str, Any]) -> Dict[str, Any]:
+        if version not in manifest["versions"]:
+            raise ValueError(f"Unknown version {version} for {model_name}")
+        manifest["latest"] = version
+        return manifest["versions"][version]
+
+    return update_manifest(bucket, model_name, set_latest_version)
+
+
+def resolve_version(bucket: str, model_name: str, version: str = "latest") -> Dict[str, Any]:
+    """Version entry for a concrete version id or "latest" """
+    manifest = get_manifest(bucket, model_name)
+    version_id = manifest["latest"] if version == "latest" else version
+    if not version_id or version_id not in manifest["versions"]:
+        raise ValueError(f"No version {version} published for {model_name}")
+    return manifest["versions"][version_id]
+
+
+def evict_cache(keep_bytes: int = CACHE_MAX_BYTES):
+    """Delete least recently used cached blobs until the cache fits keep_bytes"""
+    if not os.path.isdir(CACHE_DIR):
+        return
+
+    entries = []
+    for name in os.listdir(CACHE_DIR):
+        path = os.path.join(CACHE_DIR, name)
+        if os.path.isfile(path):
+            stat = os.stat(path)
+            entries.append((stat.st_mtime, stat.st_size, path))
+
+    total = sum(size for _, size, _ in entries)
+    for _, size, path in sorted(entries):
+        if total <= keep_bytes:
+            break
+        os.remove(path)
+        total -= size
+
+
+def fetch_artifact(
+    bucket: str, model_name: str, file_name: str, version: str = "latest"
+) -> str:
+    """
+    Local path of one artifact file, downloading it only if not cached.
+
+    Downloads go to a temp file and are renamed into place, so a crashed
+    download never leaves a truncated blob behind.
+
+    Returns:
+        str: Path under CACHE_DIR named by the file's SHA-256
+    """
+    entry = resolve_version(bucket, model_name, version)
+    if file_name not in entry["files"]:
+        raise ValueError(f"{model_name} {entry['version']} has no file {file_name}")
+
+    file_info = entry["files"][file_name]
+    path = os.path.join(CACHE_DIR, file_info["sha256"])
+
+    if os.path.exists(path) and os.path.getsize(path) == file_info["size"]:
+        os.utime(path)
+        return path
+
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    evict_cache(CACHE_MAX_BYTES - file_info["size"])
+
+    s3_client = boto3.client("s3", region_name=AWS_REGION)
+    fd, temp_path = tempfile.mkstemp(dir=CACHE_DIR, prefix=".download-")
+    os.close(fd)
+    try:
+        s3_client.download_file(bucket, blob_key(model_name, file_info["sha256"]), temp_path)
+        os.replace(temp_path, path)
+    finally:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+
+    print(f"✅ Downloaded {model_name}/{file_name} ({file_info['size']} bytes)")
+    return path
+
+
+def open_artifact_mmap(
+    bucket: str, model_name: str, file_name: str, version: str = "latest"
+) -> mmap.mmap:
+    """Read-only memory map of an artifact file"""
+    path = fetch_artifact(bucket, model_name, file_name, version)
+    with open(path, "rb") as f:
+        return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+
+def load_model(
+    model_name: str,
+    file_name: str,
+    loader: Callable[[str], Any],
+    version: str = "latest",
+    bucket: Optional[str] = None,
+) -> Any:
+    """
+    Lazily load an artifact with `loader(path)`, once per container per content hash.
+
+    Example:
+        weights = load_model("sentiment-head", "weights", lambda p: np.load(p, mmap_mode="r"))
+    """
+    bucket = bucket or ML_MODELS_BUCKET
+    entry = resolve_version(bucket, model_name, version)
+    sha256 = entry["files"][file_name]["sha256"]
+
+    if sha256 not in _loaded:
+        _loaded[sha256] = loader(fetch_artifact(bucket, model_name, file_name, version))
+    return _loaded[sha256]
+
+
+def main():
+    """Command line entry point for publishing and promoting model versions"""
+    parser = argparse.ArgumentParser(description="Model artifact registry")
+    parser.add_argument("command", choices=["publish", "list", "promote"])
+    parser.add_argument("model")
+    parser.add_argument("args", nargs="*", help="publish: name=path ...; promote: version")
+    parser.add_argument("--bucket", default=ML_MODELS_BUCKET)
+    parser.add_argument("--metadata", default="{}", help="JSON metadata for publish")
+    parser.add_argument("--no-latest", action="store_true")
+    args = parser.parse_args()
+
+    if not args.bucket:
+        parser.error("--bucket or ML_MODELS_BUCKET is required")
+
+    if args.command == "publish":
+        files = dict(item.split("=", 1) for item in args.args)
+        result = publish_model(
+            args.bucket, args.model, files, json.loads(args.metadata), not args.no_latest
+        )
+    elif args.command == "promote":
+        result = promote_version(args.bucket, args.model, args.args[0])
+    else:
+        result = get_manifest(args.bucket, args.model, refresh=True)
+
+    print(json.dumps(result, indent=2))
+
+
+if __name__ == "__main__":
+    main()
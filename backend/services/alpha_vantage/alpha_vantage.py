@@ -8,21 +8,71 @@ import json
 import uuid
 from datetime import datetime, timedelta
 import time
+from concurrent.futures import ThreadPoolExecutor, wait
 from typing import Dict, List, Any
 from decimal import Decimal
 import boto3
-import requests
+from ..shared.profiling import profiled
+from ..shared.quarters import FiscalQuarter, current_quarter, quarter_range
+from ..shared.quota_ledger import QuotaExhaustedError, acquire_quota
+from .backfill_checkpoints import (
+    DONE,
+    MAX_ATTEMPTS,
+    RATE_LIMITED,
+    CheckpointLeaseError,
+    backfill_job_id,
+    claim_checkpoint,
+    continue_backfill,
+    get_checkpoint_table,
+    pending_quarters,
+    quarter_outcome,
+    record_quarter,
+    release_checkpoint,
+    reset_checkpoint,
+)
+from .calendar_dispatch import dispatch_recent_transcripts
+from .corpus_export import compact_corpus_quarter
+from .dedup import content_hash, find_duplicate
+from .fingerprints import build_fingerprints, language_shifts
+from .hot_cache import hot_cache
+from .rollups import (
+    get_period_rollups,
+    get_rollup,
+    get_sector,
+    update_sentiment_rollups,
+)
+from .search_index import compact_quarter, index_transcript, search_transcripts
+from .sentiment_series import (
+    get_period_series,
+    get_sentiment_series,
+    record_transcript_sentiment,
+)
+from .speaker_roles import build_role_index
+from .streaming_upload import export_symbol_history
+
+
+# Hand a backfill over to a new invocation when less time than this remains
+CONTINUATION_MARGIN_MS = 120_000
+
+# Clients are created once per container and reused across warm invocations
+_clients: Dict[str, Any] = {}
 
 
 # Instantiate clients
 def get_dynamodb_client(region_name: str = "us-east-1"):
     """Get DynamoDB resource client"""
-    return boto3.resource("dynamodb", region_name=region_name)
+    key = f"dynamodb:{region_name}"
+    if key not in _clients:
+        _clients[key] = boto3.resource("dynamodb", region_name=region_name)
+    return _clients[key]
 
 
 def get_s3_client(region_name: str = "us-east-1"):
     """Get S3 client"""
-    return boto3.client("s3", region_name=region_name)
+    key = f"s3:{region_name}"
+    if key not in _clients:
+        _clients[key] = boto3.client("s3", region_name=region_name)
+    return _clients[key]
 
 
 # Convert numeric values to Decimal for DynamoDB
@@ -48,6 +98,8 @@ def store_transcript_dual_storage(
     dynamodb_table_name: str,
     s3_bucket_name: str,
     region_name: str = "us-east-1",
+    rollups_table_name: str = None,
+    series_table_name: str = None,
 ) -> Dict[str, Any]:
     """
     Store transcript data in both DynamoDB (metadata) and S3 (full content).
@@ -57,6 +109,8 @@ def store_transcript_dual_storage(
         dynamodb_table_name: DynamoDB table name for metadata
         s3_bucket_name: S3 bucket name for full transcripts
         region_name: AWS region
+        rollups_table_name: Analytics rollups table to update (optional)
+        series_table_name: Sentiment series table to update (optional)
 
     Returns:
         dict: Summary of storage results
@@ -72,13 +126,21 @@ def store_transcript_dual_storage(
     transcript_segments = transcript_response.get("transcript", [])
 
     if not transcript_segments:
+        # Alpha Vantage answers "transcript": [] for quarters without a call
         return {
             "success": False,
+            "no_transcript": True,
             "message": "No transcript segments found",
             "symbol": symbol,
             "quarter": quarter,
         }
 
+    # Validate the quarter before anything is written
+    try:
+        fiscal_quarter = FiscalQuarter.parse(quarter)
+    except ValueError as e:
+        return {"success": False, "error": str(e), "symbol": symbol, "quarter": quarter}
+
     # Generate unique transcript ID for this earnings call
     transcript_id = generate_transcript_id(symbol, quarter)
 
@@ -92,7 +154,35 @@ def store_transcript_dual_storage(
     # TTL - expire after 5 years (optional)
     ttl = int((now + timedelta(days=365 * 5)).timestamp())
 
+    # Per-section language fingerprints for quarter-over-quarter diffing
+    try:
+        fingerprints = build_fingerprints(transcript_segments)
+    except Exception as e:
+        print(f"❌ Error fingerprinting transcript for {symbol} {quarter}: {e}")
+        fingerprints = None
+
     try:
+        # 0. Skip calls already stored for this or an adjacent quarter
+        transcript_hash = content_hash(transcript_segments)
+        duplicate = find_duplicate(table, symbol, quarter, transcript_hash, fingerprints)
+        if duplicate:
+            print(
+                f"Skipping {symbol} {quarter}: {duplicate['match']} of stored "
+                f"{duplicate['quarter']} (similarity {duplicate['similarity']})"
+            )
+            return {
+                "success": True,
+                "skipped": True,
+                "duplicate_of": duplicate,
+                "transcript_id": duplicate["transcript_id"],
+                "symbol": symbol,
+                "quarter": quarter,
+                "s3_key": duplicate["s3_key"],
+                "s3_bucket": s3_bucket_name,
+                "total_segments": 0,
+                "total_words": 0,
+            }
+
         # 1. Store full transcript in S3
         s3_client.put_object(
             Bucket=s3_bucket_name,
@@ -109,6 +199,19 @@ def store_transcript_dual_storage(
 
         print(f"✅ Stored full transcript in S3: s3://{s3_bucket_name}/{s3_key}")
 
+        # This container's cached copies are stale now; others expire by TTL
+        hot_cache.discard(("s3", s3_bucket_name, symbol, quarter))
+        hot_cache.discard(("segments", dynamodb_table_name, symbol, quarter))
+        hot_cache.discard(("symbol", dynamodb_table_name, symbol))
+
+        # Add the transcript's postings to the full-text search index
+        try:
+            index_transcript(
+                s3_client, s3_bucket_name, symbol, quarter, transcript_segments
+            )
+        except Exception as e:
+            print(f"❌ Error indexing transcript for {symbol} {quarter}: {e}")
+
         # 2. Calculate metadata for DynamoDB
         total_segments = len(transcript_segments)
         total_words = sum(
@@ -137,6 +240,8 @@ def store_transcript_dual_storage(
             "transcript_id": transcript_id,
             "symbol": symbol,
             "quarter": quarter,
+            "quarter_index": fiscal_quarter.index,
+            "sector": get_sector(symbol, transcript_response),
             "s3_bucket": s3_bucket_name,
             "s3_key": s3_key,
             "total_segments": total_segments,
@@ -144,17 +249,52 @@ def store_transcript_dual_storage(
             "avg_sentiment": convert_to_decimal(avg_sentiment),
             "speakers": speakers,
             "speaker_count": len(speakers),
+            "role_index": build_role_index(transcript_segments),
+            "content_hash": transcript_hash,
             "processed_for_training": False,
             "created_at": created_at,
             "ttl": ttl,
             "file_size_bytes": len(json.dumps(transcript_response)),
             "status": "stored",
         }
+        if fingerprints:
+            metadata_item["fingerprints"] = fingerprints
 
-        table.put_item(Item=metadata_item)
+        previous_item = table.put_item(
+            Item=metadata_item, ReturnValues="ALL_OLD"
+        ).get("Attributes")
 
         print(f"✅ Stored metadata in DynamoDB for {symbol} {quarter}")
 
+        # 4. Fold sentiment into the sector/period rollups
+        if rollups_table_name:
+            update_sentiment_rollups(
+                rollups_table_name,
+                symbol,
+                quarter,
+                avg_sentiment,
+                previous_sentiment=(
+                    float(previous_item["avg_sentiment"]) if previous_item else None
+                ),
+                sector=metadata_item["sector"],
+                previous_sector=previous_item.get("sector") if previous_item else None,
+                region_name=region_name,
+                transcripts_table_name=dynamodb_table_name,
+            )
+
+        # 5. Refresh the per-role sentiment time series and its rollups
+        if series_table_name:
+            try:
+                record_transcript_sentiment(
+                    dynamodb.Table(series_table_name),
+                    symbol,
+                    quarter,
+                    transcript_segments,
+                    metadata_item["role_index"],
+                )
+            except Exception as e:
+                print(f"❌ Error updating sentiment series for {symbol} {quarter}: {e}")
+
         return {
             "success": True,
             "transcript_id": transcript_id,
@@ -176,10 +316,16 @@ def store_transcript_dual_storage(
 
 # Keep original function for backward compatibility
 def store_transcript_data(
-    transcript_response: Dict[str, Any], table_name: str, region_name: str = "us-east-1"
+    transcript_response: Dict[str, Any],
+    table_name: str,
+    region_name: str = "us-east-1",
+    chunked: bool = False,
 ) -> Dict[str, Any]:
     """
     Store complete transcript data in DynamoDB (original function for compatibility).
+
+    With chunked=True, segments are packed into compressed chunk items plus a
+    per-segment index item (see segment_chunks.py) instead of one item each.
     """
     dynamodb = get_dynamodb_client(region_name)
     table = dynamodb.Table(table_name)
@@ -209,6 +355,29 @@ def store_transcript_data(
     stored_segments = []
 
     try:
+        if chunked:
+            from .segment_chunks import store_transcript_chunked
+
+            chunk_result = store_transcript_chunked(
+                transcript_id,
+                symbol,
+                quarter,
+                transcript_segments,
+                table,
+                created_at,
+                ttl,
+            )
+            return {
+                "success": True,
+                "transcript_id": transcript_id,
+                "symbol": symbol,
+                "quarter": quarter,
+                "segments_stored": len(transcript_segments),
+                "chunks_stored": chunk_result["chunks"],
+                "items_written": chunk_result["items_written"],
+                "created_at": created_at,
+            }
+
         with table.batch_writer() as batch:
             for index, segment in enumerate(transcript_segments):
                 # Create DynamoDB item for each transcript segment
@@ -260,21 +429,7 @@ def get_current_fiscal_quarter() -> str:
     Get the current fiscal quarter based on today's date.
     Returns quarter in YYYYQX format.
     """
-    now = datetime.now()
-    year = now.year
-    month = now.month
-
-    # Determine quarter based on month
-    if month <= 3:
-        quarter = 1
-    elif month <= 6:
-        quarter = 2
-    elif month <= 9:
-        quarter = 3
-    else:
-        quarter = 4
-
-    return f"{year}Q{quarter}"
+    return str(current_quarter())
 
 
 def parse_fiscal_quarter(quarter_str: str) -> tuple:
@@ -287,19 +442,8 @@ def parse_fiscal_quarter(quarter_str: str) -> tuple:
     Returns:
         tuple: (year, quarter_number)
     """
-    if not quarter_str or "Q" not in quarter_str:
-        raise ValueError(
-            f"Invalid quarter format: {quarter_str}. Expected YYYYQX format."
-        )
-
-    year_str, quarter_str = quarter_str.split("Q")
-    year = int(year_str)
-    quarter = int(quarter_str)
-
-    if not 1 <= quarter <= 4:
-        raise ValueError(f"Quarter must be 1-4, got: {quarter}")
-
-    return year, quarter
+    fiscal_quarter = FiscalQuarter.parse(quarter_str)
+    return fiscal_quarter.year, fiscal_quarter.quarter
 
 
 def generate_quarters_forward(start_quarter: str, end_quarter: str = None) -> List[str]:
@@ -313,40 +457,19 @@ def generate_quarters_forward(start_quarter: str, end_quarter: str = None) -> Li
     Returns:
         List of quarters in YYYYQX format
     """
-    if end_quarter is None:
-        end_quarter = get_current_fiscal_quarter()
-
-    start_year, start_q = parse_fiscal_quarter(start_quarter)
-    end_year, end_q = parse_fiscal_quarter(end_quarter)
+    start = FiscalQuarter.parse(start_quarter)
+    end = FiscalQuarter.parse(end_quarter) if end_quarter else current_quarter()
 
-    quarters = []
-
-    current_year = start_year
-    current_quarter = start_q
-
-    while True:
-        quarter_str = f"{current_year}Q{current_quarter}"
-        quarters.append(quarter_str)
-
-        # Stop if we've reached the end quarter
-        if current_year == end_year and current_quarter == end_q:
-            break
-
-        # Move to next quarter
-        current_quarter += 1
-        if current_quarter > 4:
-            current_quarter = 1
-            current_year += 1
-
-        # Safety check to prevent infinite loops
-        if current_year > end_year + 1:
-            break
-
-    return quarters
+    return [str(quarter) for quarter in quarter_range(start, end)]
 
 
 def fetch_earnings_transcript(
-    symbol: str, quarter: str, api_key: str, retry_delay: float = 1.0
+    symbol: str,
+    quarter: str,
+    api_key: str,
+    retry_delay: float = 1.0,
+    quota_table: str = None,
+    region_name: str = "us-east-1",
 ) -> dict:
     """
     Fetch earnings transcript for a specific symbol and quarter.
@@ -355,11 +478,19 @@ def fetch_earnings_transcript(
         symbol: Stock symbol (e.g., "IBM")
         quarter: Fiscal quarter in YYYYQX format (e.g., "2024Q1")
         api_key: Alpha Vantage API key
-        retry_delay: Delay between API calls to respect rate limits
+        retry_delay: Delay after the call when no quota ledger is configured
+        quota_table: Quota ledger table shared by all invocations (optional)
+        region_name: AWS region
 
     Returns:
         dict: API response data
+
+    Raises:
+        QuotaExhaustedError: When the key's daily quota is used up
     """
+    # Imported here so dispatch/search invocations don't pay for it at cold start
+    import requests
+
     url = "https://www.alphavantage.co/query"
     params = {
         "function": "EARNINGS_CALL_TRANSCRIPT",
@@ -368,12 +499,17 @@ def fetch_earnings_transcript(
         "apikey": api_key,
     }
 
+    # Concurrent invocations share the key's quota through the ledger; the
+    # fixed delay only protects a single caller
+    if quota_table:
+        acquire_quota(quota_table, "alpha_vantage", api_key, region_name=region_name)
+
     try:
         response = requests.get(url, params=params, timeout=30)
         response.raise_for_status()
 
-        # Add delay to respect API rate limits
-        time.sleep(retry_delay)
+        if not quota_table:
+            time.sleep(retry_delay)
 
         return response.json()
 
@@ -391,6 +527,10 @@ def process_earnings_transcripts_with_dual_storage(
     end_quarter: str = None,
     delay: float = 1.0,
     region_name: str = "us-east-1",
+    rollups_table_name: str = None,
+    quarters: List[str] = None,
+    quota_table: str = None,
+    series_table_name: str = None,
 ):
     """
     Process earnings transcripts and store them in both DynamoDB and S3.
@@ -404,11 +544,16 @@ def process_earnings_transcripts_with_dual_storage(
         end_quarter: Ending quarter (optional, defaults to current)
         delay: Delay between API calls
         region_name: AWS region
+        rollups_table_name: Analytics rollups table to update (optional)
+        quarters: Explicit quarters to process instead of the start..end range
+        quota_table: Quota ledger table consulted before each API call (optional)
+        series_table_name: Sentiment series table to update (optional)
 
     Yields:
         dict: Results for each quarter processed including storage status
     """
-    quarters = generate_quarters_forward(start_quarter, end_quarter)
+    if quarters is None:
+        quarters = generate_quarters_forward(start_quarter, end_quarter)
 
     print(
         f"Processing {symbol} for {len(quarters)} quarters with dual storage: {start_quarter} to {end_quarter or get_current_fiscal_quarter()}"
@@ -418,17 +563,34 @@ def process_earnings_transcripts_with_dual_storage(
         print(f"Fetching {symbol} {quarter}...")
 
         # Fetch transcript from API
-        transcript_data = fetch_earnings_transcript(symbol, quarter, api_key, delay)
+        transcript_data = fetch_earnings_transcript(
+            symbol, quarter, api_key, delay, quota_table=quota_table, region_name=region_name
+        )
 
         api_success = bool(transcript_data and "transcript" in transcript_data)
         storage_result = None
 
+        # Distinguish "no transcript for this quarter" from a failed request,
+        # which is worth retrying, and a rate-limit notice, which stops the run
+        api_error = None
+        rate_limited = False
+        if not transcript_data:
+            api_error = "request failed"
+        elif not api_success:
+            api_error = transcript_data.get("Information") or transcript_data.get("Note")
+            rate_limited = bool(api_error)
+
         if api_success:
             print(f"✅ Successfully fetched {symbol} {quarter}")
 
             # Store in both DynamoDB and S3
             storage_result = store_transcript_dual_storage(
-                transcript_data, dynamodb_table_name, s3_bucket_name, region_name
+                transcript_data,
+                dynamodb_table_name,
+                s3_bucket_name,
+                region_name,
+                rollups_table_name=rollups_table_name,
+                series_table_name=series_table_name,
             )
 
         else:
@@ -438,6 +600,8 @@ def process_earnings_transcripts_with_dual_storage(
             "symbol": symbol,
             "quarter": quarter,
             "api_success": api_success,
+            "api_error": api_error,
+            "rate_limited": rate_limited,
             "storage_result": storage_result,
             "timestamp": datetime.now().isoformat(),
         }
@@ -446,6 +610,7 @@ def process_earnings_transcripts_with_dual_storage(
 
 
 # Updated Lambda handler with dual storage
+@profiled("earnings-transcripts")
 def lambda_handler(event, context):
     """
     Lambda function to process earnings transcripts and store in DynamoDB + S3.
@@ -454,11 +619,106 @@ def lambda_handler(event, context):
     {
         "symbol": "IBM",
         "start_quarter": "2024Q1",
+        "end_quarter": "2024Q4",  // optional
+        "restart": false  // optional, start the job's checkpoint over
+    }
+
+    Any event can carry "profile": true (or "cprofile") to write a
+    flame-graph profile of the invocation; see services/shared/profiling.py.
+
+    Progress is checkpointed per job; quarters already done are skipped and
+    a run close to the timeout continues itself in a new invocation.
+
+    Dispatch mode (scheduled by EventBridge) enqueues one invocation per
+    company that reported in the last `days_back` days:
+    {
+        "mode": "dispatch",
+        "days_back": 3  // optional
+    }
+
+    Search mode queries the full-text index; compact_index folds new
+    transcripts into the quarter's term shards:
+    {
+        "mode": "search",
+        "query": "guidance cut",
+        "quarters": ["2024Q3"],
+        "speaker": "CEO",  // optional
+        "role": "executive",  // optional: executive | analyst | operator
+        "phase": "qa",  // optional: prepared | qa
+        "phrase": true  // optional
+    }
+    {
+        "mode": "compact_index",
+        "quarters": ["2024Q3"]
+    }
+
+    compact_corpus rolls the quarter's transcripts into large segment-row
+    shards under corpus/ for bulk readers:
+    {
+        "mode": "compact_corpus",
+        "quarters": ["2024Q3"],
+        "force": false  // optional, rebuild even if unchanged
+    }
+
+    language_shift ranks symbols by how much their wording changed since
+    the previous quarter, using only the fingerprints stored at ingest:
+    {
+        "mode": "language_shift",
+        "quarter": "2024Q3",
+        "section": "executive",  // optional: all | executive | analyst
+        "symbols": ["IBM"]  // optional
+    }
+
+    Read modes serve stored transcripts through the container's hot cache:
+    {
+        "mode": "transcript",
+        "symbol": "AAPL",
+        "quarter": "2024Q3"
+    }
+    {
+        "mode": "cache_stats"
+    }
+
+    sentiment_series reads precomputed per-role sentiment points, either a
+    range per symbol or every symbol for one period; rebuild_series
+    recomputes them from stored transcripts:
+    {
+        "mode": "sentiment_series",
+        "symbols": ["AAPL", "MSFT"],
+        "role": "executive",  // optional: all | executive | analyst
+        "resolution": "trailing_4q",  // optional: quarter | year | trailing_4q
+        "start_quarter": "2022Q1",  // optional
         "end_quarter": "2024Q4"  // optional
     }
+    {
+        "mode": "sentiment_series",
+        "period": "2024Q3",  // "2024" for resolution "year"
+        "resolution": "quarter"
+    }
+    {
+        "mode": "rebuild_series",
+        "symbols": ["AAPL"]
+    }
+
+    rollups reads the sector/period sentiment averages kept on ingest: one
+    sector (or "ALL") with "sector", otherwise every rollup in the period:
+    {
+        "mode": "rollups",
+        "period": "2024Q3",  // optional, default "ALL"
+        "sector": "Technology"  // optional
+    }
+
+    Export mode streams a symbol's stored transcripts into one gzipped
+    JSON Lines object under exports/ via a parallel multipart upload:
+    {
+        "mode": "export",
+        "symbol": "IBM",
+        "quarters": ["2023Q1", "2023Q2"]  // optional, default everything stored
+    }
     """
     print(f"Request ID: {context.aws_request_id}")
     print(f"Event: {event}")
+    print(f"Hot cache: {hot_cache.snapshot()}")
 
     # Get configuration from Parameter Store
     PROJECT_NAME = os.environ.get("PROJECT_NAME", "earnings-sentiment")
@@ -484,6 +744,216 @@ def lambda_handler(event, context):
         s3_bucket_name = get_parameter(
             f"/{PROJECT_NAME}/{ENVIRONMENT}/earnings-data-bucket"
         )
+        rollups_table_name = get_parameter(
+            f"/{PROJECT_NAME}/{ENVIRONMENT}/analytics-rollups-table"
+        )
+        series_table_name = get_parameter(
+            f"/{PROJECT_NAME}/{ENVIRONMENT}/sentiment-series-table"
+        )
+
+        if event.get("mode") in ("search", "compact_index", "compact_corpus"):
+            s3_client = get_s3_client(AWS_REGION)
+            if event.get("recent_quarters"):
+                # Calls report on the previous quarter, so the scheduled
+                # compaction covers the last few quarters up to the current one
+                start = current_quarter() - (int(event["recent_quarters"]) - 1)
+                quarters = generate_quarters_forward(str(start))
+            else:
+                quarters = event.get("quarters") or generate_quarters_forward(
+                    event.get("start_quarter", get_current_fiscal_quarter()),
+                    event.get("end_quarter"),
+                )
+
+            if event["mode"] == "compact_corpus":
+                table = get_dynamodb_client(AWS_REGION).Table(dynamodb_table_name)
+                body = {
+                    "results": [
+                        compact_corpus_quarter(
+                            s3_client,
+                            table,
+                            s3_bucket_name,
+                            quarter,
+                            force=bool(event.get("force", False)),
+                        )
+                        for quarter in quarters
+                    ]
+                }
+            elif event["mode"] == "compact_index":
+                body = {
+                    "results": [
+                        compact_quarter(
+                            s3_client,
+                            s3_bucket_name,
+                            quarter,
+                            force=bool(event.get("force", False)),
+                        )
+                        for quarter in quarters
+                    ]
+                }
+            else:
+                matches = search_transcripts(
+                    s3_client,
+                    s3_bucket_name,
+                    event.get("query", ""),
+                    quarters,
+                    speaker=event.get("speaker"),
+                    phrase=event.get("phrase", True),
+                    limit=int(event.get("limit", 100)),
+                    role=event.get("role"),
+                    phase=event.get("phase"),
+                )
+                body = {"query": event.get("query", ""), "matches": matches}
+
+            return {
+                "statusCode": 200,
+                "body": json.dumps(
+                    {**body, "quarters": quarters, "timestamp": datetime.now().isoformat()}
+                ),
+            }
+
+        if event.get("mode") == "transcript":
+            symbol = event["symbol"].upper()
+            transcript = get_transcript_from_s3(
+                symbol, event["quarter"], s3_bucket_name, AWS_REGION
+            )
+            return {
+                "statusCode": 200 if transcript else 404,
+                "body": json.dumps(
+                    transcript or {"error": f"No transcript for {symbol} {event['quarter']}"}
+                ),
+            }
+
+        if event.get("mode") == "cache_stats":
+            return {"statusCode": 200, "body": json.dumps(hot_cache.snapshot())}
+
+        if event.get("mode") == "language_shift":
+            table = get_dynamodb_client(AWS_REGION).Table(dynamodb_table_name)
+            shifts = language_shifts(
+                table,
+                event.get("quarter") or get_current_fiscal_quarter(),
+                symbols=event.get("symbols"),
+                section=event.get("section", "executive"),
+                limit=int(event.get("limit", 50)),
+            )
+            return {
+                "statusCode": 200,
+                "body": json.dumps({**shifts, "timestamp": datetime.now().isoformat()}),
+            }
+
+        if event.get("mode") == "sentiment_series":
+            series_table = get_dynamodb_client(AWS_REGION).Table(series_table_name)
+            role = event.get("role", "all")
+            resolution = event.get("resolution", "quarter")
+            if event.get("period"):
+                body = {
+                    "period": event["period"],
+                    "points": get_period_series(
+                        series_table, event["period"], role, resolution
+                    ),
+                }
+            else:
+                body = {
+                    "series": get_sentiment_series(
+                        series_table,
+                        event.get("symbols") or [event.get("symbol", "IBM")],
+                        role,
+                        resolution,
+                        event.get("start_quarter"),
+                        event.get("end_quarter"),
+                    )
+                }
+            return {
+                "statusCode": 200,
+                "body": json.dumps(
+                    {
+                        **body,
+                        "role": role,
+                        "resolution": resolution,
+                        "timestamp": datetime.now().isoformat(),
+                    }
+                ),
+            }
+
+        if event.get("mode") == "rebuild_series":
+            rebuilt = {
+                symbol.upper(): rebuild_sentiment_series(
+                    symbol.upper(),
+                    dynamodb_table_name,
+                    series_table_name,
+                    s3_bucket_name,
+                    AWS_REGION,
+                )
+                for symbol in event.get("symbols") or [event.get("symbol", "IBM")]
+            }
+            return {
+                "statusCode": 200,
+                "body": json.dumps(
+                    {"rebuilt": rebuilt, "timestamp": datetime.now().isoformat()}
+                ),
+            }
+
+        if event.get("mode") == "rollups":
+            period = event.get("period", "ALL")
+            if event.get("sector"):
+                rollup_id = (
+                    "ALL" if event["sector"] == "ALL" else f"SECTOR#{event['sector']}"
+                )
+                rollup = get_rollup(rollups_table_name, rollup_id, period, AWS_REGION)
+                return {
+                    "statusCode": 200 if rollup else 404,
+                    "body": json.dumps(
+                        rollup or {"error": f"No rollup for {event['sector']} {period}"}
+                    ),
+                }
+            return {
+                "statusCode": 200,
+                "body": json.dumps(
+                    {
+                        "period": period,
+                        "rollups": get_period_rollups(
+                            rollups_table_name, period, AWS_REGION
+                        ),
+                        "timestamp": datetime.now().isoformat(),
+                    }
+                ),
+            }
+
+        if event.get("mode") == "export":
+            export_result = export_symbol_history(
+                get_s3_client(AWS_REGION),
+                s3_bucket_name,
+                event["symbol"].upper(),
+                quarters=event.get("quarters"),
+            )
+            return {
+                "statusCode": 200,
+                "body": json.dumps(
+                    {**export_result, "timestamp": datetime.now().isoformat()}
+                ),
+            }
+
+        if event.get("mode") == "dispatch":
+            calendar_table_name = get_parameter(
+                f"/{PROJECT_NAME}/{ENVIRONMENT}/earnings-calendar-table"
+            )
+            dispatch_result = dispatch_recent_transcripts(
+                calendar_table_name=calendar_table_name,
+                transcripts_table_name=dynamodb_table_name,
+                function_name=context.function_name,
+                days_back=int(event.get("days_back", 3)),
+                region_name=AWS_REGION,
+            )
+
+            return {
+                "statusCode": 200,
+                "body": json.dumps(
+                    {
+                        "message": f"Enqueued {dispatch_result['jobs_enqueued']} transcript jobs",
+                        **dispatch_result,
+                        "timestamp": datetime.now().isoformat(),
+                    }
+                ),
+            }
 
         # Get event parameters
         symbol = event.get("symbol", "IBM")
@@ -494,46 +964,156 @@ def lambda_handler(event, context):
         print(f"Using S3 bucket: {s3_bucket_name}")
         print(f"Using DynamoDB table: {dynamodb_table_name}")
 
+        # Resume from the job's checkpoint; long backfills continue in a chain
+        # of invocations instead of hitting the timeout
+        checkpoint_table = get_checkpoint_table(
+            get_parameter(f"/{PROJECT_NAME}/{ENVIRONMENT}/backfill-checkpoints-table"),
+            AWS_REGION,
+        )
+        job_id = event.get("job_id") or backfill_job_id(symbol, start_quarter, end_quarter)
+        lease_owner = context.aws_request_id
+
+        try:
+            checkpoint = claim_checkpoint(
+                checkpoint_table, job_id, lease_owner, symbol, start_quarter, end_quarter
+            )
+            if event.get("restart"):
+                checkpoint = reset_checkpoint(checkpoint_table, job_id, lease_owner)
+        except CheckpointLeaseError as e:
+            print(str(e))
+            return {"statusCode": 409, "body": json.dumps({"error": str(e), "job_id": job_id})}
+
+        quota_table = get_parameter(f"/{PROJECT_NAME}/{ENVIRONMENT}/api-quota-table")
+
+        all_quarters = generate_quarters_forward(start_quarter, end_quarter)
+        quarters = pending_quarters(checkpoint, all_quarters)
+        previous_failures = checkpoint.get("failed", {})
+        print(f"Backfill {job_id}: {len(quarters)} of {len(all_quarters)} quarters pending")
+
         # Process transcripts with dual storage
         results = []
-        for result in process_earnings_transcripts_with_dual_storage(
-            symbol=symbol,
-            start_quarter=start_quarter,
-            api_key=api_key,
-            dynamodb_table_name=dynamodb_table_name,
-            s3_bucket_name=s3_bucket_name,
-            end_quarter=end_quarter,
-            delay=1.0,
-            region_name=AWS_REGION,
-        ):
-            results.append(
-                {
-                    "quarter": result["quarter"],
-                    "api_success": result["api_success"],
-                    "storage_success": (
-                        result["storage_result"]["success"]
-                        if result["storage_result"]
-                        else False
-                    ),
-                    "s3_key": (
-                        result["storage_result"]["s3_key"]
-                        if result["storage_result"]
-                        and result["storage_result"]["success"]
-                        else None
-                    ),
-                    "total_segments": (
-                        result["storage_result"]["total_segments"]
-                        if result["storage_result"]
-                        and result["storage_result"]["success"]
-                        else 0
-                    ),
-                    "total_words": (
-                        result["storage_result"]["total_words"]
-                        if result["storage_result"]
-                        and result["storage_result"]["success"]
-                        else 0
+        retryable = []
+        continued = False
+        quota_exhausted = False
+        rate_limited = False
+
+        try:
+            for position, result in enumerate(
+                process_earnings_transcripts_with_dual_storage(
+                    symbol=symbol,
+                    start_quarter=start_quarter,
+                    api_key=api_key,
+                    dynamodb_table_name=dynamodb_table_name,
+                    s3_bucket_name=s3_bucket_name,
+                    end_quarter=end_quarter,
+                    delay=1.0,
+                    region_name=AWS_REGION,
+                    rollups_table_name=rollups_table_name,
+                    quarters=quarters,
+                    quota_table=quota_table,
+                    series_table_name=series_table_name,
+                )
+            ):
+                quarter = result["quarter"]
+                outcome = quarter_outcome(
+                    result["api_success"],
+                    result["api_error"],
+                    result["storage_result"],
+                    rate_limited=result["rate_limited"],
+                )
+                if outcome == RATE_LIMITED:
+                    # Like quota exhaustion: keep the checkpoint open without
+                    # spending an attempt; re-invoking the job later resumes it
+                    print(
+                        f"❌ Rate limited on {symbol} {quarter}: {result['api_error']}; "
+                        f"stopping backfill {job_id}"
+                    )
+                    rate_limited = True
+                    break
+
+                done = outcome == DONE
+                attempts = int(previous_failures.get(quarter, {}).get("attempts", 0))
+
+                record_quarter(
+                    checkpoint_table,
+                    job_id,
+                    lease_owner,
+                    quarter,
+                    quarters[position + 1] if position + 1 < len(quarters) else None,
+                    success=done,
+                    error=(
+                        result["api_error"]
+                        or (result["storage_result"] or {}).get("error", "")
                     ),
-                }
+                    attempts=attempts,
+                )
+                if not done and attempts + 1 < MAX_ATTEMPTS:
+                    retryable.append(quarter)
+
+                results.append(
+                    {
+                        "quarter": result["quarter"],
+                        "api_success": result["api_success"],
+                        "storage_success": (
+                            result["storage_result"]["success"]
+                            if result["storage_result"]
+                            else False
+                        ),
+                        "s3_key": (
+                            result["storage_result"]["s3_key"]
+                            if result["storage_result"]
+                            and result["storage_result"]["success"]
+                            else None
+                        ),
+                        "total_segments": (
+                            result["storage_result"]["total_segments"]
+                            if result["storage_result"]
+                            and result["storage_result"]["success"]
+                            else 0
+                        ),
+                        "total_words": (
+                            result["storage_result"]["total_words"]
+                            if result["storage_result"]
+                            and result["storage_result"]["success"]
+                            else 0
+                        ),
+                        "duplicate_of": (result["storage_result"] or {}).get("duplicate_of"),
+                    }
+                )
+
+                # Leave time to checkpoint and hand over before the timeout
+                if (
+                    position + 1 < len(quarters)
+                    and context.get_remaining_time_in_millis() < CONTINUATION_MARGIN_MS
+                ):
+                    continued = True
+                    break
+        except CheckpointLeaseError as e:
+            print(str(e))
+            return {"statusCode": 409, "body": json.dumps({"error": str(e), "job_id": job_id})}
+        except QuotaExhaustedError as e:
+            # Keep the checkpoint open; re-invoking the job later resumes it
+            print(f"❌ {e}; stopping backfill {job_id}")
+            quota_exhausted = True
+
+        stopped = quota_exhausted or rate_limited
+        continued = (continued or bool(retryable)) and not stopped
+        release_checkpoint(
+            checkpoint_table,
+            job_id,
+            lease_owner,
+            finished=not continued and not stopped,
+        )
+        if continued:
+            continue_backfill(
+                context.function_name,
+                {
+                    "symbol": symbol,
+                    "start_quarter": start_quarter,
+                    "end_quarter": end_quarter,
+                    "job_id": job_id,
+                },
+                AWS_REGION,
             )
 
         successful_quarters = sum(
@@ -552,6 +1132,11 @@ def lambda_handler(event, context):
                     "successful_quarters": successful_quarters,
                     "total_segments_stored": total_segments,
                     "total_words_processed": total_words,
+                    "job_id": job_id,
+                    "skipped_quarters": len(all_quarters) - len(quarters),
+                    "continued": continued,
+                    "quota_exhausted": quota_exhausted,
+                    "rate_limited": rate_limited,
                     "s3_bucket": s3_bucket_name,
                     "results": results,
                     "timestamp": datetime.now().isoformat(),
@@ -568,7 +1153,12 @@ def lambda_handler(event, context):
 def get_transcript_by_symbol_quarter(
     symbol: str, quarter: str, table_name: str, region_name: str = "us-east-1"
 ) -> List[Dict]:
-    """Query transcript segments by symbol and quarter"""
+    """Query transcript segments by symbol and quarter (served from the hot cache when warm)"""
+    cache_key = ("segments", table_name, symbol, quarter)
+    cached = hot_cache.get(cache_key)
+    if cached is not None:
+        return cached
+
     dynamodb = get_dynamodb_client(region_name)
     table = dynamodb.Table(table_name)
 
@@ -581,6 +1171,8 @@ def get_transcript_by_symbol_quarter(
 
         # Sort by segment_index
         segments = sorted(response["Items"], key=lambda x: int(x["segment_index"]))
+        if segments:
+            hot_cache.put(cache_key, segments, len(str(segments)))
         return segments
 
     except Exception as e:
@@ -591,7 +1183,12 @@ def get_transcript_by_symbol_quarter(
 def get_all_transcripts_for_symbol(
     symbol: str, table_name: str, region_name: str = "us-east-1"
 ) -> Dict[str, List]:
-    """Get all transcript quarters for a specific symbol"""
+    """Get all transcript quarters for a specific symbol (served from the hot cache when warm)"""
+    cache_key = ("symbol", table_name, symbol)
+    cached = hot_cache.get(cache_key)
+    if cached is not None:
+        return cached
+
     dynamodb = get_dynamodb_client(region_name)
     table = dynamodb.Table(table_name)
 
@@ -616,6 +1213,8 @@ def get_all_transcripts_for_symbol(
                 quarters_data[quarter], key=lambda x: int(x["segment_index"])
             )
 
+        if quarters_data:
+            hot_cache.put(cache_key, quarters_data, len(str(quarters_data)))
         return quarters_data
 
     except Exception as e:
@@ -624,16 +1223,155 @@ def get_all_transcripts_for_symbol(
 
 
 def get_transcript_from_s3(
-    symbol: str, quarter: str, s3_bucket_name: str, region_name: str = "us-east-1"
+    symbol: str,
+    quarter: str,
+    s3_bucket_name: str,
+    region_name: str = "us-east-1",
+    use_cache: bool = True,
+    s3_client=None,
 ) -> Dict[str, Any]:
-    """Retrieve full transcript from S3"""
-    s3_client = get_s3_client(region_name)
+    """
+    Retrieve full transcript from S3 (served from the hot cache when warm).
+
+    use_cache=False reads S3 directly without touching the hot cache, for
+    bulk passes that would otherwise evict the transcripts readers want.
+    Worker threads pass an s3_client created up front, since creating
+    clients concurrently is not thread-safe.
+    """
+    cache_key = ("s3", s3_bucket_name, symbol, quarter)
+    if use_cache:
+        cached = hot_cache.get(cache_key)
+        if cached is not None:
+            return cached
+
+    s3_client = s3_client or get_s3_client(region_name)
     s3_key = f"transcripts/{symbol}/{quarter}/transcript.json"
 
     try:
         response = s3_client.get_object(Bucket=s3_bucket_name, Key=s3_key)
-        transcript_data = json.loads(response["Body"].read())
+        body = response["Body"].read()
+        transcript_data = json.loads(body)
+        if use_cache:
+            hot_cache.put(cache_key, transcript_data, len(body))
         return transcript_data
     except Exception as e:
         print(f"Error retrieving transcript from S3 {s3_key}: {e}")
         return {}
+
+
+def rebuild_sentiment_series(
+    symbol: str,
+    dynamodb_table_name: str,
+    series_table_name: str,
+    s3_bucket_name: str,
+    region_name: str = "us-east-1",
+) -> int:
+    """
+    Recompute a symbol's sentiment series from its stored transcripts.
+
+    Returns:
+        int: Quarters recorded
+    """
+    dynamodb = get_dynamodb_client(region_name)
+    table = dynamodb.Table(dynamodb_table_name)
+    series_table = dynamodb.Table(series_table_name)
+
+    items = []
+    kwargs = {
+        "KeyConditionExpression": "symbol = :symbol",
+        "ProjectionExpression": "#quarter, role_index",
+        "ExpressionAttributeNames": {"#quarter": "quarter"},
+        "ExpressionAttributeValues": {":symbol": symbol},
+    }
+    while True:
+        response = table.query(**kwargs)
+        items.extend(response["Items"])
+        if "LastEvaluatedKey" not in response:
+            break
+        kwargs["ExclusiveStartKey"] = response["LastEvaluatedKey"]
+
+    recorded = 0
+    for item in items:
+        # A one-off pass over every quarter: keep it out of the hot cache
+        segments = get_transcript_from_s3(
+            symbol, item["quarter"], s3_bucket_name, region_name, use_cache=False
+        ).get("transcript", [])
+        if not segments:
+            continue
+        try:
+            record_transcript_sentiment(
+                series_table,
+                symbol,
+                item["quarter"],
+                segments,
+                item.get("role_index") or build_role_index(segments),
+            )
+            recorded += 1
+        except Exception as e:
+            print(f"❌ Error rebuilding sentiment series for {symbol} {item['quarter']}: {e}")
+
+    print(f"✅ Rebuilt sentiment series for {symbol}: {recorded}/{len(items)} quarters")
+    return recorded
+
+
+def prewarm_hot_symbols(
+    s3_bucket_name: str,
+    symbols: List[str],
+    quarters_back: int = 2,
+    budget_seconds: float = 3.0,
+    region_name: str = "us-east-1",
+) -> int:
+    """
+    Load the latest transcripts of hot symbols into the cache, in parallel.
+
+    Stops waiting after budget_seconds so INIT stays well inside its limit;
+    loads still running keep filling the cache in the background.
+
+    Returns:
+        int: Transcripts cached before the budget ran out
+    """
+    # Calls report on the previous quarter, so that is the latest stored one
+    latest = current_quarter() - 1
+    lookups = [
+        (symbol, str(latest - offset))
+        for symbol in symbols
+        for offset in range(quarters_back)
+    ]
+
+    # One client for all workers: concurrent client creation races in botocore
+    s3_client = get_s3_client(region_name)
+    executor = ThreadPoolExecutor(max_workers=8)
+    futures = [
+        executor.submit(
+            get_transcript_from_s3,
+            symbol,
+            quarter,
+            s3_bucket_name,
+            region_name,
+            s3_client=s3_client,
+        )
+        for symbol, quarter in lookups
+    ]
+    done, _ = wait(futures, timeout=budget_seconds)
+    executor.shutdown(wait=False)
+
+    loaded = sum(1 for future in done if not future.exception() and future.result())
+    print(f"✅ Prewarmed {loaded}/{len(lookups)} hot transcripts")
+    return loaded
+
+
+# Optional prewarm on INIT: HOT_SYMBOLS="AAPL,MSFT,NVDA"
+if os.environ.get("HOT_SYMBOLS") and os.environ.get("EARNINGS_DATA_BUCKET"):
+    try:
+        prewarm_hot_symbols(
+            os.environ["EARNINGS_DATA_BUCKET"],
+            [
+                symbol.strip().upper()
+                for symbol in os.environ["HOT_SYMBOLS"].split(",")
+                if symbol.strip()
+            ],
+            quarters_back=int(os.environ.get("HOT_SYMBOL_QUARTERS", 2)),
+            region_name=os.environ.get("AWS_REGION", "us-east-1"),
+        )
+    except Exception as e:
+        print(f"❌ Error prewarming hot symbols: {e}")
@@ -0,0 +1,266 @@
+"""
+Resumable backfill checkpoints in DynamoDB.
+One item per backfill job records the quarters already done, per-quarter
+failures and the next cursor. Every write is conditional on the invocation
+holding the job's lease, so a chained continuation and a retried invocation
+can never both advance the same job.
+
+A quarter is done once stored, skipped as a duplicate, or when the API has no
+transcript for it; request and storage failures are retried up to
+MAX_ATTEMPTS. A rate-limit notice stops the run without spending an attempt
+and leaves the checkpoint open for the next invocation to resume.
+
+Item layout (keyed by job_id):
+    symbol, start_quarter, end_quarter, status ("running" | "completed")
+    completed:     string set of finished quarters (stored or no transcript)
+    failed:        {quarter: {"attempts": n, "error": "..."}}
+    next_quarter:  cursor, first quarter not yet attempted
+    lease_owner / lease_expires: invocation currently advancing the job
+"""
+
+import json
+import time
+from datetime import datetime
+from typing import Dict, List, Any, Optional
+import boto3
+from botocore.exceptions import ClientError
+
+MAX_ATTEMPTS = 3
+LEASE_SECONDS = 960  # longer than the 900s Lambda timeout
+
+# Outcomes of one fetched quarter
+DONE = "done"
+FAILED = "failed"
+RATE_LIMITED = "rate_limited"
+
+
+class CheckpointLeaseError(Exception):
+    """Another invocation holds the job's lease"""
+
+
+def backfill_job_id(symbol: str, start_quarter: str, end_quarter: Optional[str]) -> str:
+    return f"{symbol}#{start_quarter}#{end_quarter or 'current'}"
+
+
+def get_checkpoint_table(table_name: str, region_name: str = "us-east-1"):
+    return boto3.resource("dynamodb", region_name=region_name).Table(table_name)
+
+
+def claim_checkpoint(
+    table,
+    job_id: str,
+    owner: str,
+    symbol: str,
+    start_quarter: str,
+    end_quarter: Optional[str],
+) -> Dict[str, Any]:
+    """
+    Create the job's checkpoint or take over its lease.
+
+    Succeeds only if the job has no lease, its lease expired, or this
+    invocation already owns it.
+
+    Returns:
+        dict: Checkpoint item after the claim
+
+    Raises:
+        CheckpointLeaseError: When another live invocation holds the lease
+    """
+    now = int(time.time())
+    try:
+        response = table.update_item(
+            Key={"job_id": job_id},
+            UpdateExpression=(
+                "SET lease_owner = :owner, lease_expires = :expires, "
+                "symbol = if_not_exists(symbol, :symbol), "
+                "start_quarter = if_not_exists(start_quarter, :start), "
+                "end_quarter = if_not_exists(end_quarter, :end), "
+                "next_quarter = if_not_exists(next_quarter, :start), "
+                "failed = if_not_exists(failed, :empty), "
+                "#status = :running, "
+                "created_at = if_not_exists(created_at, :now_iso), "
+                "updated_at = :now_iso "
+                "ADD invocations :one"
+            ),
+            ConditionExpression=(
+                "attribute_not_exists(lease_expires) OR lease_expires < :now "
+                "OR lease_owner = :owner"
+            ),
+            ExpressionAttributeNames={"#status": "status"},
+            ExpressionAttributeValues={
+                ":owner": owner,
+                ":expires": now + LEASE_SECONDS,
+                ":now": now,
+                ":symbol": symbol,
+                ":start": start_quarter,
+                ":end": end_quarter or "current",
+                ":empty": {},
+                ":running": "running",
+                ":now_iso": datetime.now().isoformat(),
+                ":one": 1,
+            },
+            ReturnValues="ALL_NEW",
+        )
+    except ClientError as e:
+        if e.response["Error"]["Code"] == "ConditionalCheckFailedException":
+            raise CheckpointLeaseError(f"Backfill {job_id} is held by another invocation") from e
+        raise
+
+    checkpoint = response["Attributes"]
+    print(
+        f"✅ Claimed backfill {job_id}: {len(checkpoint.get('completed', set()))} quarters done, "
+        f"next {checkpoint['next_quarter']}"
+    )
+    return checkpoint
+
+
+def reset_checkpoint(table, job_id: str, owner: str) -> Dict[str, Any]:
+    """
+    Forget a job's progress so it starts over (e.g. to refetch stored quarters).
+
+    Only the invocation holding the lease may reset it, so claim first.
+
+    Returns:
+        dict: Checkpoint item after the reset
+
+    Raises:
+        CheckpointLeaseError: When the lease was lost
+    """
+    try:
+        response = table.update_item(
+            Key={"job_id": job_id},
+            UpdateExpression=(
+                "SET next_quarter = start_quarter, failed = :empty, updated_at = :now_iso "
+                "REMOVE completed"
+            ),
+            ConditionExpression="lease_owner = :owner",
+            ExpressionAttributeValues={
+                ":owner": owner,
+                ":empty": {},
+                ":now_iso": datetime.now().isoformat(),
+            },
+            ReturnValues="ALL_NEW",
+        )
+    except ClientError as e:
+        if e.response["Error"]["Code"] == "ConditionalCheckFailedException":
+            raise CheckpointLeaseError(f"Lost lease on backfill {job_id}") from e
+        raise
+
+    print(f"Reset backfill {job_id}")
+    return response["Attributes"]
+
+
+def quarter_outcome(
+    api_success: bool,
+    api_error: Optional[str],
+    storage_result: Optional[Dict[str, Any]],
+    rate_limited: bool = False,
+) -> str:
+    """
+    Classify one fetched quarter.
+
+    Returns:
+        str: DONE (stored, duplicate or no transcript), RATE_LIMITED, or FAILED
+    """
+    if rate_limited:
+        return RATE_LIMITED
+    if storage_result and (storage_result.get("success") or storage_result.get("no_transcript")):
+        return DONE
+    if not api_success and not api_error:
+        return DONE
+    return FAILED
+
+
+def pending_quarters(checkpoint: Dict[str, Any], quarters: List[str]) -> List[str]:
+    """Quarters still to attempt: not completed and under the retry limit"""
+    completed = checkpoint.get("completed", set())
+    failed = checkpoint.get("failed", {})
+    return [
+        quarter
+        for quarter in quarters
+        if quarter not in completed
+        and int(failed.get(quarter, {}).get("attempts", 0)) < MAX_ATTEMPTS
+    ]
+
+
+def record_quarter(
+    table,
+    job_id: str,
+    owner: str,
+    quarter: str,
+    next_quarter: Optional[str],
+    success: bool,
+    error: str = "",
+    attempts: int = 0,
+):
+    """
+    Record one quarter's outcome and advance the cursor, if we still hold the lease.
+
+    Raises:
+        CheckpointLeaseError: When the lease was lost (e.g. it expired and
+            another invocation took over)
+    """
+    values = {
+        ":owner": owner,
+        ":next": next_quarter or "done",
+        ":now_iso": datetime.now().isoformat(),
+    }
+    if success:
+        update = (
+            "SET next_quarter = :next, updated_at = :now_iso "
+            "REMOVE failed.#quarter ADD completed :quarter_set"
+        )
+        values[":quarter_set"] = {quarter}
+    else:
+        update = "SET next_quarter = :next, updated_at = :now_iso, failed.#quarter = :failure"
+        values[":failure"] = {"attempts": attempts + 1, "error": error[:500]}
+
+    try:
+        table.update_item(
+            Key={"job_id": job_id},
+            UpdateExpression=update,
+            ConditionExpression="lease_owner = :owner",
+            ExpressionAttributeNames={"#quarter": quarter},
+            ExpressionAttributeValues=values,
+        )
+    except ClientError as e:
+        if e.response["Error"]["Code"] == "ConditionalCheckFailedException":
+            raise CheckpointLeaseError(f"Lost lease on backfill {job_id}") from e
+        raise
+
+
+def release_checkpoint(table, job_id: str, owner: str, finished: bool):
+    """Drop the lease; mark the job completed when nothing is left to attempt"""
+    update = "REMOVE lease_owner, lease_expires SET updated_at = :now_iso"
+    values = {":owner": owner, ":now_iso": datetime.now().isoformat()}
+    names = {}
+    if finished:
+        update += ", #status = :completed"
+        names["#status"] = "status"
+        values[":completed"] = "completed"
+
+    kwargs = {
+        "Key": {"job_id": job_id},
+        "UpdateExpression": update,
+        "ConditionExpression": "lease_owner = :owner",
+        "ExpressionAttributeValues": values,
+    }
+    if names:
+        kwargs["ExpressionAttributeNames"] = names
+
+    try:
+        table.update_item(**kwargs)
+    except ClientError as e:
+        if e.response["Error"]["Code"] != "ConditionalCheckFailedException":
+            raise
+
+
+def continue_backfill(function_name: str, event: Dict[str, Any], region_name: str = "us-east-1"):
+    """Invoke the next link of the chain asynchronously with the same job"""
+    lambda_client = boto3.client("lambda", region_name=region_name)
+    lambda_client.invoke(
+        FunctionName=function_name,
+        InvocationType="Event",
+        Payload=json.dumps(event).encode("utf-8"),
+    )
+    print(f"Continuing backfill {event.get('job_id')} in a new invocation")
@@ -0,0 +1,204 @@
+"""
+Dispatch transcript fetches from the earnings calendar.
+Reads recently-passed earnings dates written by the FMP calendar Lambda and
+enqueues one transcripts invocation per (symbol, quarter) that is not yet stored.
+"""
+
+import json
+from datetime import datetime, timedelta
+from typing import Dict, List, Any, Tuple
+import boto3
+from ..shared.quarters import reported_quarter
+
+
+def get_lambda_client(region_name: str = "us-east-1"):
+    """Get Lambda client"""
+    return boto3.client("lambda", region_name=region_name)
+
+
+def get_recent_earnings_events(
+    calendar_table_name: str,
+    days_back: int = 3,
+    region_name: str = "us-east-1",
+) -> List[Dict[str, Any]]:
+    """
+    Read calendar rows whose earnings_date fell within the last `days_back` days.
+
+    The earnings-date-index is hashed on a single date, so this issues one
+    query per day in the window (today excluded - calls may not have happened yet).
+
+    Args:
+        calendar_table_name: DynamoDB earnings calendar table name
+        days_back: Number of past days to look at
+        region_name: AWS region
+
+    Returns:
+        List of calendar items
+    """
+    dynamodb = boto3.resource("dynamodb", region_name=region_name)
+    table = dynamodb.Table(calendar_table_name)
+
+    today = datetime.now().date()
+    events = []
+
+    for offset in range(1, days_back + 1):
+        earnings_date = (today - timedelta(days=offset)).strftime("%Y-%m-%d")
+        query_kwargs = {
+            "IndexName": "earnings-date-index",
+            "KeyConditionExpression": "earnings_date = :earnings_date",
+            "ExpressionAttributeValues": {":earnings_date": earnings_date},
+        }
+
+        try:
+            while True:
+                response = table.query(**query_kwargs)
+                events.extend(response["Items"])
+
+                if "LastEvaluatedKey" not in response:
+                    break
+                query_kwargs["ExclusiveStartKey"] = response["LastEvaluatedKey"]
+
+        except Exception as e:
+            print(f"Error querying calendar for {earnings_date}: {e}")
+
+    print(f"Found {len(events)} earnings events in the last {days_back} days")
+    return events
+
+
+def transcript_already_stored(table, symbol: str, quarter: str) -> bool:
+    """Check whether transcript metadata already exists for (symbol, quarter)"""
+    try:
+        response = table.get_item(
+            Key={"symbol": symbol, "quarter": quarter},
+            ProjectionExpression="symbol",
+        )
+        return "Item" in response
+    except Exception as e:
+        print(f"Error checking stored transcript for {symbol} {quarter}: {e}")
+        return False
+
+
+def build_transcript_jobs(
+    events: List[Dict[str, Any]],
+    transcripts_table_name: str,
+    region_name: str = "us-east-1",
+) -> List[Tuple[str, str]]:
+    """
+    Turn calendar events into unique (symbol, quarter) pairs still to be fetched.
+
+    Args:
+        events: Calendar items with stock_symbol and earnings_date
+        transcripts_table_name: DynamoDB transcripts metadata table name
+        region_name: AWS region
+
+    Returns:
+        Sorted list of (symbol, quarter) pairs
+    """
+    dynamodb = boto3.resource("dynamodb", region_name=region_name)
+    table = dynamodb.Table(transcripts_table_name)
+
+    pairs = set()
+    for event in events:
+        symbol = event.get("stock_symbol", "")
+        earnings_date = event.get("earnings_date", "")
+        if not symbol or not earnings_date:
+            continue
+
+        try:
+            quarter = str(reported_quarter(symbol, earnings_date))
+        except ValueError:
+            print(f"Skipping {symbol}: invalid earnings_date {earnings_date}")
+            continue
+
+        pairs.add((symbol, quarter))
+
+    jobs = [
+        (symbol, quarter)
+        for symbol, quarter in sorted(pairs)
+        if not transcript_already_stored(table, symbol, quarter)
+    ]
+
+    print(f"{len(jobs)} of {len(pairs)} (symbol, quarter) pairs need transcripts")
+    return jobs
+
+
+def enqueue_transcript_jobs(
+    jobs: List[Tuple[str, str]],
+    function_name: str,
+    region_name: str = "us-east-1",
+) -> Dict[str, Any]:
+    """
+    Enqueue one asynchronous transcripts invocation per (symbol, quarter).
+
+    Lambda's async invocation queue holds the jobs, so each fetch gets its
+    own timeout budget and retries independently.
+
+    Args:
+        jobs: (symbol, quarter) pairs to fetch
+        function_name: Transcripts Lambda function name
+        region_name: AWS region
+
+    Returns:
+        dict: Summary of enqueued and failed jobs
+    """
+    lambda_client = get_lambda_client(region_name)
+
+    enqueued = []
+    failed = []
+
+    for symbol, quarter in jobs:
+        # restart: a quarter checked before its transcript was published must be retried
+        payload = {
+            "symbol": symbol,
+            "start_quarter": quarter,
+            "end_quarter": quarter,
+            "restart": True,
+        }
+
+        try:
+            lambda_client.invoke(
+                FunctionName=function_name,
+                InvocationType="Event",
+                Payload=json.dumps(payload).encode("utf-8"),
+            )
+            enqueued.append(f"{symbol}_{quarter}")
+        except Exception as e:
+            print(f"❌ Error enqueuing {symbol} {quarter}: {e}")
+            failed.append(f"{symbol}_{quarter}")
+
+    print(f"✅ Enqueued {len(enqueued)} transcript jobs ({len(failed)} failed)")
+
+    return {"enqueued": enqueued, "failed": failed}
+
+
+def dispatch_recent_transcripts(
+    calendar_table_name: str,
+    transcripts_table_name: str,
+    function_name: str,
+    days_back: int = 3,
+    region_name: str = "us-east-1",
+) -> Dict[str, Any]:
+    """
+    Enqueue transcript fetches for every company that reported recently.
+
+    Args:
+        calendar_table_name: DynamoDB earnings calendar table name
+        transcripts_table_name: DynamoDB transcripts metadata table name
+        function_name: Transcripts Lambda function name to invoke
+        days_back: Number of past days to look at
+        region_name: AWS region
+
+    Returns:
+        dict: Dispatch summary
+    """
+    events = get_recent_earnings_events(calendar_table_name, days_back, region_name)
+    jobs = build_transcript_jobs(events, transcripts_table_name, region_name)
+    result = enqueue_transcript_jobs(jobs, function_name, region_name)
+
+    return {
+        "events_found": len(events),
+        "jobs_enqueued": len(result["enqueued"]),
+        "jobs_failed": len(result["failed"]),
+        "enqueued": result["enqueued"],
+        "failed": result["failed"],
+    }
@@ -0,0 +1,256 @@
+"""
+Corpus-level sharded export of stored transcripts for bulk analytics.
+
+Rolls the per-transcript objects of a quarter into a few large gzipped JSON
+Lines shards with one row per transcript segment, so a full-corpus scan is a
+handful of sequential reads instead of one GET per transcript.
+
+Layout in the earnings data bucket, partitioned by quarter:
+    corpus/quarter={QUARTER}/part-{run_id}-{NNNN}.jsonl.gz   segment rows
+    corpus/quarter={QUARTER}/manifest.json                   current shards
+
+Consumers read the manifest and then only the shards it lists. A rebuild
+writes new shards and swaps the manifest, so readers never see a
+half-written quarter. The shards it replaced are kept for one more
+generation (listed as previous_shards) so readers still holding the old
+manifest can finish; the next rebuild deletes them.
+"""
+
+import json
+import hashlib
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Dict, List, Any, Iterator, Optional, Tuple
+
+from .streaming_upload import MultipartGzipWriter
+
+CORPUS_PREFIX = "corpus"
+CORPUS_FORMAT_VERSION = 1
+
+# Uncompressed bytes per shard; transcripts never straddle two shards
+DEFAULT_SHARD_BYTES = 256 * 1024 * 1024
+
+ROW_FIELDS = [
+    "transcript_id",
+    "symbol",
+    "quarter",
+    "segment_index",
+    "speaker",
+    "title",
+    "content",
+    "sentiment",
+]
+
+
+def corpus_shard_key(quarter: str, run_id: str, part: int) -> str:
+    return f"{CORPUS_PREFIX}/quarter={quarter}/part-{run_id}-{part:04d}.jsonl.gz"
+
+
+def corpus_manifest_key(quarter: str) -> str:
+    return f"{CORPUS_PREFIX}/quarter={quarter}/manifest.json"
+
+
+def load_corpus_manifest(s3_client, bucket: str, quarter: str) -> Dict[str, Any]:
+    try:
+        response = s3_client.get_object(Bucket=bucket, Key=corpus_manifest_key(quarter))
+        return json.loads(response["Body"].read())
+    except s3_client.exceptions.NoSuchKey:
+        return {}
+
+
+def list_quarter_transcripts(table, quarter: str) -> List[Dict[str, Any]]:
+    """Metadata items of every transcript stored for a quarter, via quarter-index"""
+    request = {
+        "IndexName": "quarter-index",
+        "KeyConditionExpression": "#quarter = :quarter",
+        "ProjectionExpression": "#symbol, #quarter, transcript_id, s3_bucket, s3_key, created_at",
+        "ExpressionAttributeNames": {"#symbol": "symbol", "#quarter": "quarter"},
+        "ExpressionAttributeValues": {":quarter": quarter},
+    }
+    items = []
+    while True:
+        response = table.query(**request)
+        items.extend(response["Items"])
+        if "LastEvaluatedKey" not in response:
+            break
+        request["ExclusiveStartKey"] = response["LastEvaluatedKey"]
+
+    return sorted(items, key=lambda item: item["symbol"])
+
+
+def source_fingerprint(items: List[Dict[str, Any]]) -> str:
+    """Hash of the transcripts (and their ingest times) a quarter's corpus is built from"""
+    digest = hashlib.sha256()
+    for item in items:
+        digest.update(
+            f"{item['symbol']}|{item.get('transcript_id', '')}|{item.get('created_at', '')}\n".encode(
+                "utf-8"
+            )
+        )
+    return digest.hexdigest()
+
+
+def iter_transcripts(
+    s3_client, bucket: str, items: List[Dict[str, Any]], workers: int = 8
+) -> Iterator[Tuple[Dict[str, Any], Optional[Dict[str, Any]]]]:
+    """
+    Yield (item, transcript) in order, fetching a bounded window of objects in parallel.
+
+    transcript is None when the object is missing or unreadable.
+    """
+
+    def fetch(item):
+        try:
+            response = s3_client.get_object(
+                Bucket=item.get("s3_bucket", bucket), Key=item["s3_key"]
+            )
+            return json.loads(response["Body"].read())
+        except Exception as e:
+            print(f"❌ Error reading {item.get('s3_key')}: {e}")
+            return None
+
+    window = workers * 2
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        for start in range(0, len(items), window):
+            batch = items[start : start + window]
+            yield from zip(batch, executor.map(fetch, batch))
+
+
+def segment_rows(item: Dict[str, Any], transcript: Dict[str, Any]) -> Iterator[Dict[str, Any]]:
+    """One corpus row per transcript segment"""
+    for index, segment in enumerate(transcript.get("transcript", [])):
+        yield {
+            "transcript_id": item.get("transcript_id", ""),
+            "symbol": item["symbol"],
+            "quarter": item["quarter"],
+            "segment_index": index,
+            "speaker": segment.get("speaker", ""),
+            "title": segment.get("title", ""),
+            "content": segment.get("content", ""),
+            "sentiment": float(segment.get("sentiment") or 0),
+        }
+
+
+def compact_corpus_quarter(
+    s3_client,
+    table,
+    bucket: str,
+    quarter: str,
+    shard_bytes: int = DEFAULT_SHARD_BYTES,
+    force: bool = False,
+) -> Dict[str, Any]:
+    """
+    Rebuild a quarter's corpus shards from the stored transcripts.
+
+    Skipped when the quarter's transcripts are unchanged since the current
+    manifest was written, unless force is set.
+
+    Args:
+        s3_client: boto3 S3 client
+        table: Earnings transcripts DynamoDB table
+        bucket: Earnings data bucket
+        quarter: Quarter to compact (YYYYQX)
+        shard_bytes: Uncompressed bytes per shard before starting a new one
+        force: Rebuild even if nothing changed
+
+    Returns:
+        dict: Compaction summary
+    """
+    items = list_quarter_transcripts(table, quarter)
+    fingerprint = source_fingerprint(items)
+    previous = load_corpus_manifest(s3_client, bucket, quarter)
+
+    if not force and previous.get("source_hash") == fingerprint:
+        print(f"Corpus for {quarter} is up to date ({previous.get('transcripts', 0)} transcripts)")
+        return {"quarter": quarter, "skipped": True, "transcripts": previous.get("transcripts", 0)}
+
+    run_id = datetime.now().strftime("%Y%m%dT%H%M%S")
+    shards: List[Dict[str, Any]] = []
+    writer = None
+    shard_stats = {}
+    missing = []
+
+    def finish_shard():
+        summary = writer.close()
+        shards.append(
+            {
+                "key": summary["key"],
+                "rows": shard_stats["rows"],
+                "transcripts": shard_stats["transcripts"],
+                "raw_bytes": summary["raw_bytes"],
+                "compressed_bytes": summary["compressed_bytes"],
+            }
+        )
+
+    try:
+        for item, transcript in iter_transcripts(s3_client, bucket, items):
+            if transcript is None:
+                missing.append(item["symbol"])
+                continue
+
+            if writer is None or writer.raw_bytes >= shard_bytes:
+                if writer is not None:
+                    finish_shard()
+                writer = MultipartGzipWriter(
+                    s3_client, bucket, corpus_shard_key(quarter, run_id, len(shards))
+                )
+                shard_stats = {"rows": 0, "transcripts": 0}
+
+            for row in segment_rows(item, transcript):
+                writer.write_json_line(row)
+                shard_stats["rows"] += 1
+            shard_stats["transcripts"] += 1
+
+        if writer is not None:
+            finish_shard()
+    except Exception:
+        if writer is not None:
+            writer.abort()
+        raise
+
+    manifest = {
+        "quarter": quarter,
+        "format": "jsonl.gz",
+        "format_version": CORPUS_FORMAT_VERSION,
+        "fields": ROW_FIELDS,
+        "run_id": run_id,
+        "source_hash": fingerprint,
+        "transcripts": sum(shard["transcripts"] for shard in shards),
+        "rows": sum(shard["rows"] for shard in shards),
+        "shards": shards,
+        # Kept until the next rebuild for readers of the previous manifest
+        "previous_shards": [shard["key"] for shard in previous.get("shards", [])],
+        "missing": missing,
+        "compacted_at": datetime.now().isoformat(),
+    }
+    s3_client.put_object(
+        Bucket=bucket,
+        Key=corpus_manifest_key(quarter),
+        Body=json.dumps(manifest, indent=2),
+        ContentType="application/json",
+        CacheControl="no-cache",
+    )
+
+    # Readers follow the new manifest now; the generation before the one it
+    # replaced has had a full rebuild interval to drain, so drop its shards
+    retained = set(manifest["previous_shards"]) | {shard["key"] for shard in shards}
+    stale = [
+        {"Key": key}
+        for key in previous.get("previous_shards", [])
+        if key not in retained
+    ]
+    if stale:
+        s3_client.delete_objects(Bucket=bucket, Delete={"Objects": stale, "Quiet": True})
+
+    print(
+        f"✅ Compacted {manifest['transcripts']} transcripts ({manifest['rows']} segments) "
+        f"into {len(shards)} corpus shards for {quarter}"
+    )
+    return {
+        "quarter": quarter,
+        "skipped": False,
+        "transcripts": manifest["transcripts"],
+        "rows": manifest["rows"],
+        "shards": len(shards),
+        "missing": len(missing),
+    }
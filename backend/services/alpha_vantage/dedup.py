@@ -0,0 +1,96 @@
+"""
+Duplicate and re-issued transcript detection at ingest.
+
+Alpha Vantage sometimes answers adjacent quarter requests with the same call,
+or re-issues a call with small edits. Before a transcript is written it is
+compared with what is already stored for the same and the adjacent quarters:
+    exact match     SHA-256 of the normalized speaker/content text
+    near duplicate  estimated Jaccard similarity of the whole-call MinHash
+                    sketch (see fingerprints.py) at or above the threshold,
+                    adjacent quarters only
+A match skips every write, so neither storage nor the training corpus holds
+the same call twice. A near duplicate of the same quarter is a re-issued
+(corrected) call and overwrites the stored one.
+"""
+
+import re
+import hashlib
+from typing import Dict, List, Any, Optional
+
+from .fingerprints import decode_sketch, sketch_similarity
+from ..shared.quarters import FiscalQuarter
+
+NEAR_DUPLICATE_THRESHOLD = 0.9
+
+WHITESPACE = re.compile(r"\s+")
+
+
+def content_hash(segments: List[Dict[str, Any]]) -> str:
+    """Hash of the transcript text, insensitive to case and whitespace changes"""
+    digest = hashlib.sha256()
+    for segment in segments:
+        speaker = WHITESPACE.sub(" ", segment.get("speaker", "")).strip().lower()
+        content = WHITESPACE.sub(" ", segment.get("content", "")).strip().lower()
+        digest.update(f"{speaker}\x1f{content}\x1e".encode("utf-8"))
+    return digest.hexdigest()
+
+
+def find_duplicate(
+    table,
+    symbol: str,
+    quarter: str,
+    transcript_hash: str,
+    fingerprints: Optional[Dict[str, Any]],
+    threshold: float = NEAR_DUPLICATE_THRESHOLD,
+) -> Optional[Dict[str, Any]]:
+    """
+    Stored transcript of this or an adjacent quarter that matches the new one.
+
+    The same quarter matches only on an identical content_hash, so edited
+    re-issues replace the stored call; adjacent quarters also match on
+    near-duplicate similarity.
+
+    Args:
+        table: Earnings transcripts DynamoDB table
+        symbol: Stock symbol
+        quarter: Quarter being ingested
+        transcript_hash: content_hash of the new transcript
+        fingerprints: build_fingerprints of the new transcript (optional)
+        threshold: Minimum estimated Jaccard similarity for a near duplicate
+
+    Returns:
+        dict with the stored item's quarter, transcript_id, s3_key, match type
+        and similarity, or None
+    """
+    current = FiscalQuarter.parse(quarter)
+    new_sketch = None
+    if fingerprints and "all" in fingerprints.get("sections", {}):
+        new_sketch = decode_sketch(fingerprints["sections"]["all"]["minhash"])
+
+    for candidate in (quarter, str(current - 1), str(current + 1)):
+        item = table.get_item(
+            Key={"symbol": symbol, "quarter": candidate},
+            ProjectionExpression="#quarter, transcript_id, s3_key, content_hash, fingerprints",
+            ExpressionAttributeNames={"#quarter": "quarter"},
+        ).get("Item")
+        if not item:
+            continue
+
+        match = {
+            "quarter": candidate,
+            "transcript_id": item.get("transcript_id", ""),
+            "s3_key": item.get("s3_key", ""),
+        }
+        if item.get("content_hash") == transcript_hash:
+            return {**match, "match": "identical", "similarity": 1.0}
+
+        if candidate == quarter:
+            continue
+
+        stored_section = (item.get("fingerprints") or {}).get("sections", {}).get("all")
+        if new_sketch and stored_section:
+            similarity = sketch_similarity(new_sketch, decode_sketch(stored_section["minhash"]))
+            if similarity >= threshold:
+                return {**match, "match": "near_duplicate", "similarity": round(similarity, 4)}
+
+    return None
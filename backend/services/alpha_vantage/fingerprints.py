@@ -0,0 +1,232 @@
+"""
+Compact per-transcript language fingerprints for quarter-over-quarter diffing.
+
+At ingest each transcript gets one fingerprint per speaker section (the whole
+call, executives, analysts), stored on its metadata item:
+    minhash   bottom-k sketch of 3-word shingle hashes (Jaccard similarity)
+    simhash   64-bit SimHash of term frequencies (overall wording drift)
+    phrases   most frequent content phrases (novel-phrase detection)
+
+Comparing two quarters then needs only the metadata items from quarter-index,
+never the transcripts themselves.
+"""
+
+import base64
+import hashlib
+import heapq
+import struct
+from collections import Counter
+from typing import Dict, List, Any, Optional, Tuple
+
+from ..shared.quarters import FiscalQuarter
+from .search_index import tokenize
+from .speaker_roles import classify_segments
+
+FINGERPRINT_VERSION = 1
+SHINGLE_SIZE = 3
+SKETCH_SIZE = 64
+TOP_PHRASES = 15
+
+STOPWORDS = frozenset(
+    "a an and are as at be been but by for from had has have i in is it its of on "
+    "or our so that the their there this to was we were what which will with you "
+    "they them us about also just very more can would could think know going really "
+    "yes thank thanks question quarter".split()
+)
+
+
+def hash64(text: str) -> int:
+    return int.from_bytes(hashlib.blake2b(text.encode("utf-8"), digest_size=8).digest(), "big")
+
+
+def shingles(tokens: List[str], size: int = SHINGLE_SIZE) -> List[str]:
+    return [" ".join(tokens[i : i + size]) for i in range(len(tokens) - size + 1)]
+
+
+def minhash_sketch(tokens: List[str], k: int = SKETCH_SIZE) -> List[int]:
+    """Bottom-k sketch: the k smallest distinct shingle hashes, ascending"""
+    return heapq.nsmallest(k, {hash64(shingle) for shingle in shingles(tokens)})
+
+
+def simhash(tokens: List[str]) -> int:
+    """64-bit SimHash over term frequencies"""
+    weights = [0] * 64
+    for term, count in Counter(tokens).items():
+        if term in STOPWORDS:
+            continue
+        value = hash64(term)
+        for bit in range(64):
+            weights[bit] += count if value >> bit & 1 else -count
+    return sum(1 << bit for bit in range(64) if weights[bit] > 0)
+
+
+def top_phrases(tokens: List[str], limit: int = TOP_PHRASES) -> List[str]:
+    """Most frequent 2-word phrases without stopwords"""
+    counts = Counter(
+        f"{first} {second}"
+        for first, second in zip(tokens, tokens[1:])
+        if first not in STOPWORDS and second not in STOPWORDS and not first.isdigit()
+    )
+    return [phrase for phrase, count in counts.most_common(limit) if count > 1]
+
+
+def encode_sketch(sketch: List[int]) -> str:
+    return base64.b64encode(struct.pack(f">{len(sketch)}Q", *sketch)).decode("ascii")
+
+
+def decode_sketch(encoded: str) -> List[int]:
+    raw = base64.b64decode(encoded)
+    return list(struct.unpack(f">{len(raw) // 8}Q", raw))
+
+
+def section_fingerprint(tokens: List[str]) -> Dict[str, Any]:
+    return {
+        "minhash": encode_sketch(minhash_sketch(tokens)),
+        "simhash": f"{simhash(tokens):016x}",
+        "phrases": top_phrases(tokens),
+        "tokens": len(tokens),
+    }
+
+
+def build_fingerprints(segments: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Fingerprints of a transcript, per speaker section.
+
+    Returns:
+        dict: {"version": n, "sections": {"all" | "executive" | "analyst": fingerprint}}
+    """
+    by_section: Dict[str, List[str]] = {"all": [], "executive": [], "analyst": []}
+    for segment, section in zip(segments, classify_segments(segments)):
+        tokens = tokenize(segment.get("content", ""))
+        by_section["all"].extend(tokens)
+        if section in by_section:
+            by_section[section].extend(tokens)
+
+    return {
+        "version": FINGERPRINT_VERSION,
+        "sections": {
+            name: section_fingerprint(tokens)
+            for name, tokens in by_section.items()
+            if len(tokens) >= SHINGLE_SIZE
+        },
+    }
+
+
+def sketch_similarity(first: List[int], second: List[int], k: int = SKETCH_SIZE) -> float:
+    """Estimated Jaccard similarity of two bottom-k sketches"""
+    if not first or not second:
+        return 0.0
+    first_set, second_set = set(first), set(second)
+    union_bottom = heapq.nsmallest(k, first_set | second_set)
+    shared = sum(1 for value in union_bottom if value in first_set and value in second_set)
+    return shared / len(union_bottom)
+
+
+def simhash_similarity(first: str, second: str) -> float:
+    """1 - normalized Hamming distance of two hex SimHashes"""
+    return 1 - bin(int(first, 16) ^ int(second, 16)).count("1") / 64
+
+
+def compare_fingerprints(
+    current: Dict[str, Any], previous: Dict[str, Any]
+) -> Dict[str, Any]:
+    """
+    Section-by-section similarity of two fingerprints plus phrases new in `current`.
+
+    Returns:
+        dict: {section: {"jaccard", "simhash_similarity", "novel_phrases"}}
+    """
+    result = {}
+    for name, section in current.get("sections", {}).items():
+        before = previous.get("sections", {}).get(name)
+        if not before:
+            continue
+        known_phrases = set(before["phrases"])
+        result[name] = {
+            "jaccard": round(
+                sketch_similarity(
+                    decode_sketch(section["minhash"]), decode_sketch(before["minhash"])
+                ),
+                4,
+            ),
+            "simhash_similarity": round(
+                simhash_similarity(section["simhash"], before["simhash"]), 4
+            ),
+            "novel_phrases": [
+                phrase for phrase in section["phrases"] if phrase not in known_phrases
+            ],
+        }
+    return result
+
+
+def previous_quarter(quarter: str) -> str:
+    return str(FiscalQuarter.parse(quarter) - 1)
+
+
+def load_quarter_fingerprints(table, quarter: str) -> Dict[str, Dict[str, Any]]:
+    """{symbol: fingerprints} for every transcript of a quarter, via quarter-index"""
+    request = {
+        "IndexName": "quarter-index",
+        "KeyConditionExpression": "#quarter = :quarter",
+        "ProjectionExpression": "#symbol, fingerprints",
+        "ExpressionAttributeNames": {"#symbol": "symbol", "#quarter": "quarter"},
+        "ExpressionAttributeValues": {":quarter": quarter},
+    }
+    fingerprints = {}
+    while True:
+        response = table.query(**request)
+        for item in response["Items"]:
+            if item.get("fingerprints"):
+                fingerprints[item["symbol"]] = item["fingerprints"]
+        if "LastEvaluatedKey" not in response:
+            break
+        request["ExclusiveStartKey"] = response["LastEvaluatedKey"]
+    return fingerprints
+
+
+def language_shifts(
+    table,
+    quarter: str,
+    symbols: Optional[List[str]] = None,
+    section: str = "executive",
+    limit: int = 50,
+) -> Dict[str, Any]:
+    """
+    Rank symbols by how much their language changed since the previous quarter.
+
+    Args:
+        table: Earnings transcripts DynamoDB table
+        quarter: Quarter to compare against the one before it
+        symbols: Restrict to these symbols (default: every symbol in both quarters)
+        section: Speaker section used for ranking ("all", "executive", "analyst")
+        limit: Number of results, largest shift first
+
+    Returns:
+        dict: Quarter pair and per-symbol comparisons
+    """
+    before_quarter = previous_quarter(quarter)
+    current = load_quarter_fingerprints(table, quarter)
+    previous = load_quarter_fingerprints(table, before_quarter)
+
+    shifts: List[Tuple[float, Dict[str, Any]]] = []
+    for symbol in sorted(set(current) & set(previous)):
+        if symbols and symbol not in symbols:
+            continue
+        comparison = compare_fingerprints(current[symbol], previous[symbol])
+        if section not in comparison:
+            continue
+        shifts.append(
+            (
+                comparison[section]["jaccard"],
+                {"symbol": symbol, "sections": comparison},
+            )
+        )
+
+    shifts.sort(key=lambda entry: entry[0])
+    return {
+        "quarter": quarter,
+        "previous_quarter": before_quarter,
+        "section": section,
+        "compared": len(shifts),
+        "shifts": [entry for _, entry in shifts[:limit]],
+    }
@@ -0,0 +1,102 @@
+"""
+Bounded in-process cache for read paths on warm Lambda containers.
+
+Entries expire after a TTL and the least recently used ones are evicted once
+the cache exceeds its entry or byte budget. Around earnings season a handful
+of mega-cap symbols dominate reads, so those lookups are served from memory
+instead of DynamoDB/S3. Cached values are shared: callers must not mutate them.
+
+Configuration (environment):
+    HOT_CACHE_TTL_SECONDS   entry lifetime (default 300)
+    HOT_CACHE_MAX_ENTRIES   entry budget (default 256)
+    HOT_CACHE_MAX_BYTES     approximate byte budget (default 64 MB)
+"""
+
+import os
+import time
+import threading
+from collections import OrderedDict
+from typing import Dict, Any, Hashable, Optional
+
+
+class HotCache:
+    """TTL + LRU cache with hit/miss/eviction counters"""
+
+    def __init__(
+        self,
+        ttl_seconds: float = 300,
+        max_entries: int = 256,
+        max_bytes: int = 64 * 1024 * 1024,
+    ):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.stats = {"hits": 0, "misses": 0, "expired": 0, "evictions": 0}
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.stats["misses"] += 1
+                return None
+
+            expires_at, size, value = entry
+            if expires_at < time.monotonic():
+                self._remove(key)
+                self.stats["expired"] += 1
+                self.stats["misses"] += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self.stats["hits"] += 1
+            return value
+
+    def put(self, key: Hashable, value: Any, size: int = 1):
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = (time.monotonic() + self.ttl_seconds, size, value)
+            self._bytes += size
+
+            while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                oldest = next(iter(self._entries))
+                self._remove(oldest)
+                self.stats["evictions"] += 1
+
+    def discard(self, key: Hashable):
+        """Drop a key, e.g. after the underlying data was rewritten"""
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+
+    def _remove(self, key: Hashable):
+        _, size, _ = self._entries.pop(key)
+        self._bytes -= size
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Counters plus current size, for logs and the cache_stats mode"""
+        lookups = self.stats["hits"] + self.stats["misses"]
+        return {
+            **self.stats,
+            "hit_rate": round(self.stats["hits"] / lookups, 4) if lookups else 0.0,
+            "entries": len(self._entries),
+            "bytes": self._bytes,
+        }
+
+
+# One cache per container, shared by every read path
+hot_cache = HotCache(
+    ttl_seconds=float(os.environ.get("HOT_CACHE_TTL_SECONDS", 300)),
+    max_entries=int(os.environ.get("HOT_CACHE_MAX_ENTRIES", 256)),
+    max_bytes=int(os.environ.get("HOT_CACHE_MAX_BYTES", 64 * 1024 * 1024)),
+)
@@ -0,0 +1,281 @@
+"""
+Sector and period sentiment rollups maintained on ingest.
+Each stored transcript adds to running sums and counts in the analytics
+rollups table, so the analytics page reads averages with single-item lookups.
+
+Rollup items are keyed by (rollup_id, period):
+    rollup_id: "ALL" or "SECTOR#{sector}"
+    period:    "YYYYQX" or "ALL"
+
+Each item holds sentiment_sum and transcript_count (one per stored
+transcript, so a symbol counts once per quarter in the "ALL" period) and a
+string set of the distinct symbols behind them.
+"""
+
+from datetime import datetime
+from decimal import Decimal
+from typing import Dict, List, Any, Optional, Tuple
+import boto3
+from boto3.dynamodb.conditions import Key
+
+ALL = "ALL"
+UNKNOWN_SECTOR = "Unknown"
+
+# Sector lookup for symbols we track; transcripts may also carry an explicit "sector"
+SYMBOL_SECTORS: Dict[str, str] = {
+    "AAPL": "Technology",
+    "MSFT": "Technology",
+    "NVDA": "Technology",
+    "GOOGL": "Technology",
+    "META": "Technology",
+    "IBM": "Technology",
+    "ORCL": "Technology",
+    "CSCO": "Technology",
+    "ADBE": "Technology",
+    "AMZN": "Consumer",
+    "TSLA": "Consumer",
+    "WMT": "Consumer",
+    "HD": "Consumer",
+    "COST": "Consumer",
+    "NKE": "Consumer",
+    "JPM": "Finance",
+    "BAC": "Finance",
+    "GS": "Finance",
+    "MS": "Finance",
+    "V": "Finance",
+    "JNJ": "Healthcare",
+    "PFE": "Healthcare",
+    "UNH": "Healthcare",
+    "MRK": "Healthcare",
+    "ABBV": "Healthcare",
+    "XOM": "Energy",
+    "CVX": "Energy",
+}
+
+
+def get_sector(symbol: str, transcript_response: Optional[Dict[str, Any]] = None) -> str:
+    """Resolve a symbol's sector, preferring one carried on the transcript"""
+    if transcript_response and transcript_response.get("sector"):
+        return transcript_response["sector"]
+    return SYMBOL_SECTORS.get(symbol.upper(), UNKNOWN_SECTOR)
+
+
+def rollup_keys(sector: str, quarter: str) -> List[Dict[str, str]]:
+    """All rollup items a single (sector, quarter) observation contributes to"""
+    sector_id = f"SECTOR#{sector}"
+    return [
+        {"rollup_id": sector_id, "period": quarter},
+        {"rollup_id": sector_id, "period": ALL},
+        {"rollup_id": ALL, "period": quarter},
+        {"rollup_id": ALL, "period": ALL},
+    ]
+
+
+def rollup_changes(
+    sector: str,
+    quarter: str,
+    sentiment: Decimal,
+    previous: Optional[Tuple[str, Decimal]] = None,
+) -> Dict[Tuple[str, str], Tuple[Decimal, int]]:
+    """
+    Net (sentiment_sum, transcript_count) change per rollup item for one transcript.
+
+    Args:
+        sector: Sector of the stored transcript
+        quarter: Quarter in YYYYQX format
+        sentiment: avg_sentiment of the stored transcript
+        previous: (sector, avg_sentiment) of the transcript it replaces, if any
+
+    Returns:
+        dict: {(rollup_id, period): (sentiment delta, count delta)}
+    """
+    changes: Dict[Tuple[str, str], Tuple[Decimal, int]] = {}
+
+    def add(keys: List[Dict[str, str]], delta: Decimal, count: int):
+        for key in keys:
+            item = (key["rollup_id"], key["period"])
+            total, total_count = changes.get(item, (Decimal("0"), 0))
+            changes[item] = (total + delta, total_count + count)
+
+    if previous is not None:
+        previous_sector, previous_sentiment = previous
+        add(rollup_keys(previous_sector, quarter), -previous_sentiment, -1)
+    add(rollup_keys(sector, quarter), sentiment, 1)
+
+    return changes
+
+
+def has_other_sector_quarters(
+    transcripts_table, symbol: str, sector: str, quarter: str
+) -> bool:
+    """Whether the symbol has stored quarters other than `quarter` filed under `sector`"""
+    query_kwargs = {
+        "KeyConditionExpression": Key("symbol").eq(symbol),
+        "ProjectionExpression": "#quarter, #sector",
+        "ExpressionAttributeNames": {"#quarter": "quarter", "#sector": "sector"},
+    }
+    while True:
+        response = transcripts_table.query(**query_kwargs)
+        for item in response.get("Items", []):
+            if item.get("quarter") != quarter and get_sector(symbol, item) == sector:
+                return True
+        if "LastEvaluatedKey" not in response:
+            return False
+        query_kwargs["ExclusiveStartKey"] = response["LastEvaluatedKey"]
+
+
+def update_sentiment_rollups(
+    rollups_table_name: str,
+    symbol: str,
+    quarter: str,
+    avg_sentiment: float,
+    previous_sentiment: Optional[float] = None,
+    sector: Optional[str] = None,
+    previous_sector: Optional[str] = None,
+    region_name: str = "us-east-1",
+    transcripts_table_name: Optional[str] = None,
+) -> Dict[str, Any]:
+    """
+    Add one transcript's sentiment to the sector/period running sums.
+
+    When the (symbol, quarter) was already stored, pass its previous
+    avg_sentiment and sector so the sums are corrected instead of double
+    counted; if the sector changed, the old contribution moves out of the
+    previous sector's rollups into the new one's. The symbol stays in the
+    previous sector's "ALL" symbol set while it has other quarters stored
+    under that sector.
+
+    Args:
+        rollups_table_name: DynamoDB analytics rollups table name
+        symbol: Stock symbol
+        quarter: Quarter in YYYYQX format
+        avg_sentiment: Average segment sentiment of the stored transcript
+        previous_sentiment: avg_sentiment of the replaced item, if any
+        sector: Sector override (defaults to SYMBOL_SECTORS lookup)
+        previous_sector: Sector of the replaced item, if any
+        region_name: AWS region
+        transcripts_table_name: Transcripts table, checked for the symbol's
+            other quarters when its sector changed
+
+    Returns:
+        dict: Summary of rollup updates
+    """
+    dynamodb = boto3.resource("dynamodb", region_name=region_name)
+    table = dynamodb.Table(rollups_table_name)
+
+    sector = sector or get_sector(symbol)
+    is_new = previous_sentiment is None
+    previous_sector = previous_sector or sector
+    updated_at = datetime.now().isoformat()
+
+    # Net (sentiment delta, transcript count delta) per rollup item
+    changes = rollup_changes(
+        sector,
+        quarter,
+        Decimal(str(avg_sentiment)),
+        None if is_new else (previous_sector, Decimal(str(previous_sentiment))),
+    )
+    moved_from = {
+        (key["rollup_id"], key["period"]) for key in rollup_keys(previous_sector, quarter)
+    } - {(key["rollup_id"], key["period"]) for key in rollup_keys(sector, quarter)}
+    if (
+        moved_from
+        and transcripts_table_name
+        and has_other_sector_quarters(
+            dynamodb.Table(transcripts_table_name),
+            symbol.upper(),
+            previous_sector,
+            quarter,
+        )
+    ):
+        # Only this quarter moved; the previous sector still holds the symbol
+        moved_from.discard((f"SECTOR#{previous_sector}", ALL))
+
+    updated = 0
+    for (rollup_id, period), (delta, count) in changes.items():
+        # The symbol leaves the previous sector's symbol sets and joins the new ones
+        symbols_action = "DELETE" if (rollup_id, period) in moved_from else "ADD"
+        try:
+            table.update_item(
+                Key={"rollup_id": rollup_id, "period": period},
+                UpdateExpression=(
+                    "ADD sentiment_sum :delta, transcript_count :count "
+                    f"{symbols_action} symbols :symbol "
+                    "SET updated_at = :updated_at"
+                ),
+                ExpressionAttributeValues={
+                    ":delta": delta,
+                    ":count": count,
+                    ":symbol": {symbol.upper()},
+                    ":updated_at": updated_at,
+                },
+            )
+            updated += 1
+        except Exception as e:
+            print(f"❌ Error updating rollup {rollup_id} {period}: {e}")
+
+    print(f"✅ Updated {updated} rollups for {symbol} {quarter} ({sector})")
+
+    return {
+        "sector": sector,
+        "previous_sector": previous_sector,
+        "rollups_updated": updated,
+        "is_new": is_new,
+    }
+
+
+def summarize_rollup(item: Dict[str, Any]) -> Dict[str, Any]:
+    """Turn a raw rollup item into averages"""
+    transcript_count = int(item.get("transcript_count", 0))
+
+    return {
+        "rollup_id": item["rollup_id"],
+        "sector": item["rollup_id"].split("#", 1)[-1],
+        "period": item["period"],
+        "stock_count": len(item.get("symbols", ())),
+        "transcript_count": transcript_count,
+        "avg_sentiment": (
+            float(item.get("sentiment_sum", 0)) / transcript_count
+            if transcript_count
+            else 0.0
+        ),
+        "updated_at": item.get("updated_at"),
+    }
+
+
+def get_rollup(
+    rollups_table_name: str,
+    rollup_id: str,
+    period: str = ALL,
+    region_name: str = "us-east-1",
+) -> Dict[str, Any]:
+    """Single-item lookup of one sector/period rollup"""
+    dynamodb = boto3.resource("dynamodb", region_name=region_name)
+    table = dynamodb.Table(rollups_table_name)
+
+    try:
+        response = table.get_item(Key={"rollup_id": rollup_id, "period": period})
+        return summarize_rollup(response["Item"]) if "Item" in response else {}
+    except Exception as e:
+        print(f"Error reading rollup {rollup_id} {period}: {e}")
+        return {}
+
+
+def get_period_rollups(
+    rollups_table_name: str, period: str = ALL, region_name: str = "us-east-1"
+) -> List[Dict[str, Any]]:
+    """All sector rollups for one period (one query on period-index)"""
+    dynamodb = boto3.resource("dynamodb", region_name=region_name)
+    table = dynamodb.Table(rollups_table_name)
+
+    try:
+        response = table.query(
+            IndexName="period-index",
+            KeyConditionExpression="#period = :period",
+            ExpressionAttributeNames={"#period": "period"},
+            ExpressionAttributeValues={":period": period},
+        )
+        return [summarize_rollup(item) for item in response["Items"]]
+    except Exception as e:
+        print(f"Error querying rollups for {period}: {e}")
+        return []
@@ -0,0 +1,382 @@
+"""
+Inverted full-text and speaker index over stored transcripts.
+
+Layout in the earnings data bucket, partitioned by quarter:
+    search-index/docs/{QUARTER}/{SYMBOL}.json.gz      per-transcript postings, written on ingest
+    search-index/shards/{QUARTER}/{NN}.json.gz        compacted postings, sharded by term hash
+    search-index/shards/{QUARTER}/docs.json.gz        speaker/title/role info of the compacted docs
+    search-index/shards/{QUARTER}/manifest.json       docs folded into the shards
+
+Ingest only writes the transcript's own doc file, so concurrent ingests never
+contend. compact_quarter merges doc files into term shards (run on a schedule
+for recent quarters); queries read the shards for their terms plus any doc
+files not yet compacted.
+"""
+
+import re
+import gzip
+import json
+import zlib
+from datetime import datetime
+from typing import Dict, List, Any, Optional, Set
+
+from .speaker_roles import build_role_index, segment_roles
+
+INDEX_PREFIX = "search-index"
+SHARD_COUNT = 16
+
+TOKEN_PATTERN = re.compile(r"[a-z0-9]+(?:'[a-z]+)?")
+
+# Shards loaded by this container, keyed by S3 key -> (etag, postings)
+_shard_cache: Dict[str, Any] = {}
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercase word tokens used for both indexing and queries"""
+    return TOKEN_PATTERN.findall(text.lower())
+
+
+def term_shard(term: str) -> int:
+    """Stable shard number for a term"""
+    return zlib.crc32(term.encode("utf-8")) % SHARD_COUNT
+
+
+def doc_key(symbol: str, quarter: str) -> str:
+    return f"{INDEX_PREFIX}/docs/{quarter}/{symbol}.json.gz"
+
+
+def shard_key(quarter: str, shard: int) -> str:
+    return f"{INDEX_PREFIX}/shards/{quarter}/{shard:02d}.json.gz"
+
+
+def docs_key(quarter: str) -> str:
+    return f"{INDEX_PREFIX}/shards/{quarter}/docs.json.gz"
+
+
+def manifest_key(quarter: str) -> str:
+    return f"{INDEX_PREFIX}/shards/{quarter}/manifest.json"
+
+
+def build_document(
+    symbol: str, quarter: str, segments: List[Dict[str, Any]]
+) -> Dict[str, Any]:
+    """
+    Build one transcript's postings.
+
+    Returns:
+        dict with doc_id, per-segment speaker/title, role index and
+        postings {term: [[segment_index, position, ...], ...]}
+    """
+    postings: Dict[str, Dict[int, List[int]]] = {}
+
+    for segment_index, segment in enumerate(segments):
+        for position, term in enumerate(tokenize(segment.get("content", ""))):
+            postings.setdefault(term, {}).setdefault(segment_index, []).append(position)
+
+    role_index = build_role_index(segments)
+
+    return {
+        "doc_id": f"{symbol}/{quarter}",
+        "symbol": symbol,
+        "quarter": quarter,
+        "speakers": [segment.get("speaker", "") for segment in segments],
+        "titles": [segment.get("title", "") for segment in segments],
+        "roles": role_index["roles"],
+        "qa_start": role_index["qa_start"],
+        "postings": {
+            term: [[segment_index] + positions for segment_index, positions in hits.items()]
+            for term, hits in postings.items()
+        },
+    }
+
+
+def put_gzip_json(s3_client, bucket: str, key: str, data: Any):
+    s3_client.put_object(
+        Bucket=bucket,
+        Key=key,
+        Body=gzip.compress(json.dumps(data, separators=(",", ":")).encode("utf-8")),
+        ContentType="application/json",
+        ContentEncoding="gzip",
+    )
+
+
+def get_gzip_json(s3_client, bucket: str, key: str) -> Optional[Any]:
+    try:
+        response = s3_client.get_object(Bucket=bucket, Key=key)
+    except s3_client.exceptions.NoSuchKey:
+        return None
+    return json.loads(gzip.decompress(response["Body"].read()))
+
+
+def index_transcript(
+    s3_client,
+    bucket: str,
+    symbol: str,
+    quarter: str,
+    segments: List[Dict[str, Any]],
+) -> Dict[str, Any]:
+    """
+    Write a transcript's postings on ingest (idempotent per symbol/quarter).
+
+    Returns:
+        dict: Index summary
+    """
+    document = build_document(symbol, quarter, segments)
+    put_gzip_json(s3_client, bucket, doc_key(symbol, quarter), document)
+
+    print(f"✅ Indexed {len(document['postings'])} terms for {symbol} {quarter}")
+    return {"doc_id": document["doc_id"], "terms": len(document["postings"])}
+
+
+def list_doc_keys(s3_client, bucket: str, quarter: str) -> Dict[str, str]:
+    """Map of doc file key -> ETag for every doc file in a quarter"""
+    paginator = s3_client.get_paginator("list_objects_v2")
+    keys = {}
+    for page in paginator.paginate(Bucket=bucket, Prefix=f"{INDEX_PREFIX}/docs/{quarter}/"):
+        for obj in page.get("Contents", []):
+            keys[obj["Key"]] = obj["ETag"]
+    return keys
+
+
+def load_manifest(s3_client, bucket: str, quarter: str) -> Dict[str, Any]:
+    try:
+        response = s3_client.get_object(Bucket=bucket, Key=manifest_key(quarter))
+        return json.loads(response["Body"].read())
+    except s3_client.exceptions.NoSuchKey:
+        return {"quarter": quarter, "docs": {}}
+
+
+def compact_quarter(
+    s3_client, bucket: str, quarter: str, force: bool = False
+) -> Dict[str, Any]:
+    """
+    Merge a quarter's doc files into term-hash shards.
+
+    Shards hold {"postings": {term: {doc_id: [[segment_index, positions...]]}}};
+    the doc info {doc_id: {symbol, speakers, titles, roles, qa_start}} is
+    written once to docs.json.gz, and the manifest records the ETag of each
+    doc file folded in. A quarter whose doc files all match the manifest is
+    skipped unless `force` is set.
+    """
+    doc_keys = list_doc_keys(s3_client, bucket, quarter)
+    manifest = load_manifest(s3_client, bucket, quarter)
+    if not force and manifest["docs"] == doc_keys:
+        print(f"Search index for {quarter} is up to date ({len(doc_keys)} transcripts)")
+        return {"quarter": quarter, "documents": len(doc_keys), "shards": 0, "skipped": True}
+
+    docs = {}
+    shards = [{"postings": {}} for _ in range(SHARD_COUNT)]
+
+    for key in sorted(doc_keys):
+        document = get_gzip_json(s3_client, bucket, key)
+        if not document:
+            continue
+
+        doc_id = document["doc_id"]
+        docs[doc_id] = {
+            "symbol": document["symbol"],
+            "speakers": document["speakers"],
+            "titles": document["titles"],
+            "roles": document.get("roles", ""),
+            "qa_start": document.get("qa_start", 0),
+        }
+        for term, hits in document["postings"].items():
+            shards[term_shard(term)]["postings"].setdefault(term, {})[doc_id] = hits
+
+    put_gzip_json(s3_client, bucket, docs_key(quarter), docs)
+    for shard_number, shard in enumerate(shards):
+        put_gzip_json(s3_client, bucket, shard_key(quarter, shard_number), shard)
+
+    manifest = {
+        "quarter": quarter,
+        "docs": doc_keys,
+        "compacted_at": datetime.now().isoformat(),
+    }
+    s3_client.put_object(
+        Bucket=bucket,
+        Key=manifest_key(quarter),
+        Body=json.dumps(manifest),
+        ContentType="application/json",
+    )
+
+    print(f"✅ Compacted {len(docs)} transcripts into {SHARD_COUNT} shards for {quarter}")
+    return {"quarter": quarter, "documents": len(docs), "shards": SHARD_COUNT}
+
+
+def load_cached_object(s3_client, bucket: str, key: str, default: Any) -> Any:
+    """Load a compacted object, reusing this container's copy while its ETag is unchanged"""
+    try:
+        head = s3_client.head_object(Bucket=bucket, Key=key)
+    except Exception:
+        return default
+
+    cached = _shard_cache.get(key)
+    if cached and cached[0] == head["ETag"]:
+        return cached[1]
+
+    data = get_gzip_json(s3_client, bucket, key) or default
+    _shard_cache[key] = (head["ETag"], data)
+    return data
+
+
+def load_shard(s3_client, bucket: str, quarter: str, shard: int) -> Dict[str, Any]:
+    """Load a term shard"""
+    return load_cached_object(s3_client, bucket, shard_key(quarter, shard), {"postings": {}})
+
+
+def load_quarter_postings(
+    s3_client, bucket: str, quarter: str, terms: Set[str]
+) -> Dict[str, Any]:
+    """
+    Postings and doc info for `terms` in one quarter.
+
+    Combines compacted shards with any doc files written since the last compaction.
+    """
+    docs: Dict[str, Any] = dict(load_cached_object(s3_client, bucket, docs_key(quarter), {}))
+    postings: Dict[str, Dict[str, Any]] = {term: {} for term in terms}
+
+    for shard_number in {term_shard(term) for term in terms}:
+        shard = load_shard(s3_client, bucket, quarter, shard_number)
+        for term in terms:
+            if term in shard["postings"]:
+                postings[term].update(shard["postings"][term])
+
+    compacted = load_manifest(s3_client, bucket, quarter)["docs"]
+    for key, etag in list_doc_keys(s3_client, bucket, quarter).items():
+        if compacted.get(key) == etag:
+            continue
+
+        document = get_gzip_json(s3_client, bucket, key)
+        if not document:
+            continue
+        doc_id = document["doc_id"]
+        docs[doc_id] = {
+            "symbol": document["symbol"],
+            "speakers": document["speakers"],
+            "titles": document["titles"],
+            "roles": document.get("roles", ""),
+            "qa_start": document.get("qa_start", 0),
+        }
+        for term in terms:
+            postings[term].pop(doc_id, None)
+            if term in document["postings"]:
+                postings[term][doc_id] = document["postings"][term]
+
+    return {"docs": docs, "postings": postings}
+
+
+def match_segments(
+    query_terms: List[str], postings: Dict[str, Dict[str, Any]], phrase: bool
+) -> Dict[str, List[int]]:
+    """Segments (per doc) containing all terms, or the exact phrase when requested"""
+    if not query_terms:
+        return {}
+
+    # term -> doc_id -> segment_index -> set(positions)
+    positions = {
+        term: {
+            doc_id: {hit[0]: set(hit[1:]) for hit in hits}
+            for doc_id, hits in postings.get(term, {}).items()
+        }
+        for term in set(query_terms)
+    }
+
+    candidate_docs = set.intersection(*(set(positions[term]) for term in query_terms))
+    matches: Dict[str, List[int]] = {}
+
+    for doc_id in candidate_docs:
+        segments = set.intersection(
+            *(set(positions[term][doc_id]) for term in query_terms)
+        )
+        for segment_index in sorted(segments):
+            if phrase and len(query_terms) > 1:
+                starts = positions[query_terms[0]][doc_id][segment_index]
+                if not any(
+                    all(
+                        start + offset in positions[term][doc_id][segment_index]
+                        for offset, term in enumerate(query_terms[1:], start=1)
+                    )
+                    for start in starts
+                ):
+                    continue
+            matches.setdefault(doc_id, []).append(segment_index)
+
+    return matches
+
+
+def search_transcripts(
+    s3_client,
+    bucket: str,
+    query: str,
+    quarters: List[str],
+    speaker: Optional[str] = None,
+    phrase: bool = True,
+    limit: int = 100,
+    role: Optional[str] = None,
+    phase: Optional[str] = None,
+) -> List[Dict[str, Any]]:
+    """
+    Search transcripts for a term or phrase, optionally filtered by speaker.
+
+    Args:
+        s3_client: boto3 S3 client
+        bucket: Earnings data bucket
+        query: Search text, e.g. "guidance cut"
+        quarters: Quarters to search in YYYYQX format
+        speaker: Case-insensitive match against segment speaker or title (e.g. "CEO")
+        phrase: Require terms to appear consecutively
+        limit: Maximum number of matching segments returned
+        role: Only segments by "executive", "analyst" or "operator" speakers
+        phase: Only "prepared" remarks or "qa" segments
+
+    Returns:
+        List of matching segments with symbol, quarter, segment_index, speaker and title
+    """
+    query_terms = tokenize(query)
+    speaker_filter = speaker.lower() if speaker else None
+    results = []
+
+    for quarter in quarters:
+        data = load_quarter_postings(s3_client, bucket, quarter, set(query_terms))
+        matches = match_segments(query_terms, data["postings"], phrase)
+
+        for doc_id in sorted(matches):
+            doc = data["docs"].get(doc_id, {})
+            tags = segment_roles(doc)
+            speakers = doc.get("speakers", [])
+            titles = doc.get("titles", [])
+            for segment_index in matches[doc_id]:
+                segment_speaker = (
+                    speakers[segment_index] if segment_index < len(speakers) else ""
+                )
+                segment_title = titles[segment_index] if segment_index < len(titles) else ""
+                tag = (
+                    tags[segment_index]
+                    if segment_index < len(tags)
+                    else {"role": "other", "phase": "prepared"}
+                )
+
+                if (role and tag["role"] != role) or (phase and tag["phase"] != phase):
+                    continue
+
+                if speaker_filter and not (
+                    speaker_filter in segment_speaker.lower()
+                    or speaker_filter in segment_title.lower()
+                ):
+                    continue
+
+                results.append(
+                    {
+                        "symbol": doc.get("symbol", doc_id.split("/")[0]),
+                        "quarter": quarter,
+                        "segment_index": segment_index,
+                        "speaker": segment_speaker,
+                        "title": segment_title,
+                        "role": tag["role"],
+                        "phase": tag["phase"],
+                    }
+                )
+                if len(results) >= limit:
+                    return results
+
+    return results
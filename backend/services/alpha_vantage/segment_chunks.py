@@ -0,0 +1,301 @@
+"""
+Chunked segment storage for transcripts in DynamoDB.
+Consecutive segments are packed into zlib-compressed chunk items of bounded
+size, with one small index item per transcript recording each segment's
+speaker, chunk, byte offsets and sentiment. A single segment is read by
+fetching and decompressing only the chunk that holds it.
+
+Items share the store_transcript_data key schema (transcript_id, segment_index):
+    segment_index = -1             -> index item
+    segment_index = first segment  -> chunk item holding segments [first, last]
+"""
+
+import zlib
+from decimal import Decimal, InvalidOperation
+from typing import Dict, List, Any, Tuple
+import boto3
+from boto3.dynamodb.types import Binary
+
+INDEX_SEGMENT = -1
+
+# Raw (uncompressed) bytes per chunk; keeps compressed items well under 400 KB
+DEFAULT_MAX_CHUNK_BYTES = 128 * 1024
+
+
+def sentiment_value(value: Any) -> Decimal:
+    """Segment sentiment as a finite Decimal; missing or non-numeric values are 0"""
+    try:
+        sentiment = Decimal(str(value))
+    except (InvalidOperation, ValueError, TypeError):
+        return Decimal("0")
+    return sentiment if sentiment.is_finite() else Decimal("0")
+
+
+def pack_segments(
+    segments: List[Dict[str, Any]], max_chunk_bytes: int = DEFAULT_MAX_CHUNK_BYTES
+) -> Tuple[List[Dict[str, Any]], Dict[str, Any]]:
+    """
+    Pack consecutive segments into compressed chunks.
+
+    A segment larger than max_chunk_bytes gets a chunk of its own.
+
+    Args:
+        segments: Transcript segments from Alpha Vantage
+        max_chunk_bytes: Upper bound on raw content bytes per chunk
+
+    Returns:
+        tuple: (chunks, index) where chunks carry first_segment, last_segment
+        and compressed payload, and index holds speakers plus one
+        [speaker_id, chunk_first_segment, offset, length, sentiment] row per segment
+    """
+    speakers: List[str] = []
+    speaker_ids: Dict[str, int] = {}
+    rows = []
+    chunks = []
+
+    buffer = bytearray()
+    chunk_first = 0
+
+    def flush(last_segment: int):
+        if last_segment < chunk_first:
+            return
+        chunks.append(
+            {
+                "first_segment": chunk_first,
+                "last_segment": last_segment,
+                "raw_bytes": len(buffer),
+                "payload": zlib.compress(bytes(buffer), 6),
+            }
+        )
+
+    for index, segment in enumerate(segments):
+        content = segment.get("content", "").encode("utf-8")
+
+        if buffer and len(buffer) + len(content) > max_chunk_bytes:
+            flush(index - 1)
+            buffer = bytearray()
+            chunk_first = index
+
+        speaker = segment.get("speaker", "")
+        if speaker not in speaker_ids:
+            speaker_ids[speaker] = len(speakers)
+            speakers.append(speaker)
+
+        rows.append(
+            [
+                speaker_ids[speaker],
+                chunk_first,
+                len(buffer),
+                len(content),
+                str(sentiment_value(segment.get("sentiment"))),
+            ]
+        )
+        buffer.extend(content)
+
+    flush(len(segments) - 1)
+
+    titles = [segment.get("title", "") for segment in segments]
+    return chunks, {"speakers": speakers, "titles": titles, "segments": rows}
+
+
+def unpack_segment(chunk_payload: bytes, offset: int, length: int) -> str:
+    """Decompress one chunk and slice out a single segment's content"""
+    raw = zlib.decompress(bytes(chunk_payload))
+    return raw[offset : offset + length].decode("utf-8")
+
+
+def store_transcript_chunked(
+    transcript_id: str,
+    symbol: str,
+    quarter: str,
+    transcript_segments: List[Dict[str, Any]],
+    table,
+    created_at: str,
+    ttl: int,
+    max_chunk_bytes: int = DEFAULT_MAX_CHUNK_BYTES,
+) -> Dict[str, Any]:
+    """
+    Write a transcript as one index item plus compressed chunk items.
+
+    Args:
+        transcript_id: Unique transcript ID
+        symbol: Stock symbol
+        quarter: Quarter in YYYYQX format
+        transcript_segments: Transcript segments from Alpha Vantage
+        table: DynamoDB Table resource
+        created_at: ISO timestamp
+        ttl: Expiry epoch seconds
+        max_chunk_bytes: Upper bound on raw content bytes per chunk
+
+    Returns:
+        dict: Counts of items and bytes written
+    """
+    chunks, index = pack_segments(transcript_segments, max_chunk_bytes)
+
+    index_item = {
+        "transcript_id": transcript_id,
+        "segment_index": INDEX_SEGMENT,
+        "item_type": "segment_index",
+        "symbol": symbol,
+        "quarter": quarter,
+        "segment_count": len(transcript_segments),
+        "chunk_count": len(chunks),
+        "speakers": index["speakers"],
+        "titles": index["titles"],
+        "segments": [
+            [speaker_id, first, offset, length, Decimal(sentiment)]
+            for speaker_id, first, offset, length, sentiment in index["segments"]
+        ],
+        "created_at": created_at,
+        "ttl": ttl,
+    }
+
+    with table.batch_writer() as batch:
+        batch.put_item(Item=index_item)
+        for chunk in chunks:
+            batch.put_item(
+                Item={
+                    "transcript_id": transcript_id,
+                    "segment_index": chunk["first_segment"],
+                    "item_type": "segment_chunk",
+                    "symbol": symbol,
+                    "quarter": quarter,
+                    "last_segment": chunk["last_segment"],
+                    "raw_bytes": chunk["raw_bytes"],
+                    "payload": Binary(chunk["payload"]),
+                    "created_at": created_at,
+                    "ttl": ttl,
+                }
+            )
+
+    compressed_bytes = sum(len(chunk["payload"]) for chunk in chunks)
+    raw_bytes = sum(chunk["raw_bytes"] for chunk in chunks)
+
+    print(
+        f"✅ Stored {len(transcript_segments)} segments for {symbol} {quarter} "
+        f"in {len(chunks)} chunks ({raw_bytes} -> {compressed_bytes} bytes)"
+    )
+
+    return {
+        "items_written": len(chunks) + 1,
+        "chunks": len(chunks),
+        "raw_bytes": raw_bytes,
+        "compressed_bytes": compressed_bytes,
+    }
+
+
+def get_segment_index(
+    transcript_id: str, table_name: str, region_name: str = "us-east-1"
+) -> Dict[str, Any]:
+    """Get the per-segment index item of a chunked transcript"""
+    dynamodb = boto3.resource("dynamodb", region_name=region_name)
+    table = dynamodb.Table(table_name)
+
+    try:
+        response = table.get_item(
+            Key={"transcript_id": transcript_id, "segment_index": INDEX_SEGMENT}
+        )
+        return response.get("Item", {})
+    except Exception as e:
+        print(f"Error reading segment index for {transcript_id}: {e}")
+        return {}
+
+
+def get_chunked_segment(
+    transcript_id: str,
+    segment_index: int,
+    table_name: str,
+    region_name: str = "us-east-1",
+    index_item: Dict[str, Any] = None,
+) -> Dict[str, Any]:
+    """
+    Random access to a single segment: one index read, one chunk read.
+
+    Pass a previously fetched index_item to skip the index read.
+    """
+    index_item = index_item or get_segment_index(transcript_id, table_name, region_name)
+    if not index_item or not 0 <= segment_index < len(index_item["segments"]):
+        return {}
+
+    speaker_id, chunk_first, offset, length, sentiment = index_item["segments"][
+        segment_index
+    ]
+
+    dynamodb = boto3.resource("dynamodb", region_name=region_name)
+    table = dynamodb.Table(table_name)
+
+    try:
+        response = table.get_item(
+            Key={"transcript_id": transcript_id, "segment_index": int(chunk_first)},
+            ProjectionExpression="payload",
+        )
+        chunk = response.get("Item")
+        if not chunk:
+            return {}
+
+        return {
+            "transcript_id": transcript_id,
+            "segment_index": segment_index,
+            "speaker": index_item["speakers"][int(speaker_id)],
+            "title": index_item["titles"][segment_index],
+            "sentiment": sentiment,
+            "content": unpack_segment(chunk["payload"].value, int(offset), int(length)),
+        }
+    except Exception as e:
+        print(f"Error reading segment {segment_index} of {transcript_id}: {e}")
+        return {}
+
+
+def get_chunked_transcript_segments(
+    transcript_id: str, table_name: str, region_name: str = "us-east-1"
+) -> List[Dict[str, Any]]:
+    """Rebuild every segment of a chunked transcript, in order"""
+    dynamodb = boto3.resource("dynamodb", region_name=region_name)
+    table = dynamodb.Table(table_name)
+
+    query_kwargs = {
+        "KeyConditionExpression": "transcript_id = :transcript_id",
+        "ExpressionAttributeValues": {":transcript_id": transcript_id},
+    }
+    items = {}
+
+    try:
+        while True:
+            response = table.query(**query_kwargs)
+            items.update((int(item["segment_index"]), item) for item in response["Items"])
+
+            if "LastEvaluatedKey" not in response:
+                break
+            query_kwargs["ExclusiveStartKey"] = response["LastEvaluatedKey"]
+    except Exception as e:
+        print(f"Error querying chunks for {transcript_id}: {e}")
+        return []
+
+    index_item = items.get(INDEX_SEGMENT)
+    if not index_item:
+        return []
+
+    decompressed = {}
+    segments = []
+    for position, row in enumerate(index_item["segments"]):
+        speaker_id, chunk_first, offset, length, sentiment = row
+        chunk_first = int(chunk_first)
+        if chunk_first not in decompressed:
+            decompressed[chunk_first] = zlib.decompress(
+                bytes(items[chunk_first]["payload"].value)
+            )
+
+        segments.append(
+            {
+                "segment_index": position,
+                "speaker": index_item["speakers"][int(speaker_id)],
+                "title": index_item["titles"][position],
+                "sentiment": sentiment,
+                "content": decompressed[chunk_first][
+                    int(offset) : int(offset) + int(length)
+                ].decode("utf-8"),
+            }
+        )
+
+    return segments
+
@@ -0,0 +1,289 @@
+"""
+Sentiment time series per (symbol, speaker role), maintained on ingest.
+
+Every stored transcript writes one quarter point per role and refreshes the
+downsampled rollups that include that quarter, so trend charts read
+precomputed points with one range query per symbol instead of re-averaging
+transcripts.
+
+Series items are keyed by (series_id, period):
+    series_id:  "{SYMBOL}#{role}", role in SERIES_ROLES
+    period:     "Q#2024Q3"   quarter point
+                "Y#2024"     fiscal-year rollup
+                "T4#2024Q3"  trailing four quarters ending 2024Q3
+Rollups average the quarter averages, so every call weighs the same;
+sentiment_sum and segment_count are kept for segment-weighted averages.
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from decimal import Decimal
+from typing import Dict, List, Any, Optional, Tuple
+
+from ..shared.quarters import FiscalQuarter
+from .speaker_roles import segment_roles
+
+SERIES_ROLES = ("all", "executive", "analyst")
+
+RESOLUTIONS = {"quarter": "Q", "year": "Y", "trailing_4q": "T4"}
+
+
+def series_id(symbol: str, role: str) -> str:
+    return f"{symbol.upper()}#{role}"
+
+
+def period_key(resolution: str, label: str) -> str:
+    return f"{RESOLUTIONS[resolution]}#{label}"
+
+
+def role_sentiments(
+    segments: List[Dict[str, Any]], role_index: Dict[str, Any]
+) -> Dict[str, Tuple[float, int]]:
+    """(sentiment sum, segment count) per series role, over segments that carry a sentiment"""
+    roles = segment_roles(role_index)
+    totals = {role: (0.0, 0) for role in SERIES_ROLES}
+
+    for index, segment in enumerate(segments):
+        if not segment.get("sentiment"):
+            continue
+        try:
+            sentiment = float(segment["sentiment"])
+        except (TypeError, ValueError):
+            continue
+        role = roles[index]["role"] if index < len(roles) else "other"
+        for name in ("all", role):
+            if name in totals:
+                total, count = totals[name]
+                totals[name] = (total + sentiment, count + 1)
+
+    return totals
+
+
+def to_decimal(value: float) -> Decimal:
+    return Decimal(str(round(value, 6)))
+
+
+def rollup_point(
+    symbol: str, role: str, resolution: str, label: str, points: List[Dict[str, Any]]
+) -> Dict[str, Any]:
+    """Rollup item over stored quarter points (oldest first)"""
+    averages = [float(point["avg_sentiment"]) for point in points]
+    return {
+        "series_id": series_id(symbol, role),
+        "period": period_key(resolution, label),
+        "symbol": symbol.upper(),
+        "role": role,
+        "resolution": resolution,
+        "label": label,
+        "avg_sentiment": to_decimal(sum(averages) / len(averages)),
+        "sentiment_sum": sum(Decimal(str(point["sentiment_sum"])) for point in points),
+        "segment_count": sum(int(point["segment_count"]) for point in points),
+        "quarters": len(points),
+        "first_quarter": points[0]["label"],
+        "last_quarter": points[-1]["label"],
+        "updated_at": datetime.now().isoformat(),
+    }
+
+
+def record_transcript_sentiment(
+    table,
+    symbol: str,
+    quarter: str,
+    segments: List[Dict[str, Any]],
+    role_index: Dict[str, Any],
+) -> Dict[str, Any]:
+    """
+    Write a transcript's quarter points and refresh the rollups that include it.
+
+    Re-ingesting a quarter replaces its points, and rollups are recomputed from
+    the stored quarter points rather than adjusted by deltas, so the series
+    stays consistent however often a quarter is rewritten.
+
+    Args:
+        table: Sentiment series DynamoDB table
+        symbol: Stock symbol
+        quarter: Quarter in YYYYQX format
+        segments: Transcript segments
+        role_index: build_role_index of the transcript
+
+    Returns:
+        dict: Items written and deleted
+    """
+    symbol = symbol.upper()
+    current = FiscalQuarter.parse(quarter)
+    totals = role_sentiments(segments, role_index)
+    updated_at = datetime.now().isoformat()
+    written = deleted = 0
+
+    with table.batch_writer(overwrite_by_pkeys=["series_id", "period"]) as batch:
+        for role in SERIES_ROLES:
+            total, count = totals[role]
+            key = {"series_id": series_id(symbol, role), "period": period_key("quarter", quarter)}
+            point = None
+            if count:
+                point = {
+                    **key,
+                    "symbol": symbol,
+                    "role": role,
+                    "resolution": "quarter",
+                    "label": quarter,
+                    "quarter_index": current.index,
+                    "avg_sentiment": to_decimal(total / count),
+                    "sentiment_sum": to_decimal(total),
+                    "segment_count": count,
+                    "updated_at": updated_at,
+                }
+                batch.put_item(Item=point)
+                written += 1
+            else:
+                batch.delete_item(Key=key)
+                deleted += 1
+
+            # Quarter points from q-3 to q+3 cover this quarter's fiscal year and
+            # every trailing window that contains it
+            response = table.query(
+                KeyConditionExpression="series_id = :id AND #period BETWEEN :start AND :end",
+                ExpressionAttributeNames={"#period": "period"},
+                ExpressionAttributeValues={
+                    ":id": key["series_id"],
+                    ":start": period_key("quarter", str(current - 3)),
+                    ":end": period_key("quarter", str(current + 3)),
+                },
+            )
+            points = {
+                FiscalQuarter.parse(item["label"]).index: item
+                for item in response["Items"]
+                if item["label"] != quarter
+            }
+            if point:
+                points[current.index] = point
+
+            year_points = [points[index] for index in sorted(points) if index // 4 == current.year]
+            year_key = {"series_id": key["series_id"], "period": period_key("year", str(current.year))}
+            if year_points:
+                batch.put_item(
+                    Item=rollup_point(symbol, role, "year", str(current.year), year_points)
+                )
+                written += 1
+            else:
+                batch.delete_item(Key=year_key)
+                deleted += 1
+
+            for end in range(current.index, current.index + 4):
+                label = str(FiscalQuarter(end))
+                if end in points:
+                    window = [points[index] for index in range(end - 3, end + 1) if index in points]
+                    batch.put_item(Item=rollup_point(symbol, role, "trailing_4q", label, window))
+                    written += 1
+                elif end == current.index:
+                    batch.delete_item(
+                        Key={"series_id": key["series_id"], "period": period_key("trailing_4q", label)}
+                    )
+                    deleted += 1
+
+    print(f"✅ Updated sentiment series for {symbol} {quarter} ({written} written, {deleted} deleted)")
+
+    return {"written": written, "deleted": deleted}
+
+
+def to_series_point(item: Dict[str, Any]) -> Dict[str, Any]:
+    """Chart point from a stored series item"""
+    return {
+        "period": item["label"],
+        "sentiment": float(item["avg_sentiment"]),
+        "segment_count": int(item.get("segment_count", 0)),
+        "quarters": int(item.get("quarters", 1)),
+    }
+
+
+def label_bounds(
+    resolution: str, start_quarter: Optional[str], end_quarter: Optional[str]
+) -> Tuple[str, str]:
+    """Sort-key bounds of a resolution's points between two quarters (inclusive)"""
+    if resolution == "year":
+        start = start_quarter[:4] if start_quarter else ""
+        end = end_quarter[:4] if end_quarter else "~"
+    else:
+        start = start_quarter or ""
+        end = end_quarter or "~"
+    return period_key(resolution, start), period_key(resolution, end)
+
+
+def get_sentiment_series(
+    table,
+    symbols: List[str],
+    role: str = "all",
+    resolution: str = "quarter",
+    start_quarter: Optional[str] = None,
+    end_quarter: Optional[str] = None,
+    workers: int = 16,
+) -> Dict[str, List[Dict[str, Any]]]:
+    """
+    Stored series of many symbols: one range query per symbol, run in parallel.
+
+    Args:
+        table: Sentiment series DynamoDB table
+        symbols: Stock symbols
+        role: One of SERIES_ROLES
+        resolution: "quarter", "year" or "trailing_4q"
+        start_quarter: First quarter (YYYYQX) to include (optional)
+        end_quarter: Last quarter (YYYYQX) to include (optional)
+        workers: Concurrent queries
+
+    Returns:
+        dict: {symbol: [{"period", "sentiment", "segment_count", "quarters"}]}, oldest first
+    """
+    if role not in SERIES_ROLES:
+        raise ValueError(f"Unknown series role: {role}")
+    if resolution not in RESOLUTIONS:
+        raise ValueError(f"Unknown series resolution: {resolution}")
+    start, end = label_bounds(resolution, start_quarter, end_quarter)
+
+    def query(symbol: str) -> Tuple[str, List[Dict[str, Any]]]:
+        try:
+            items = []
+            kwargs = {
+                "KeyConditionExpression": "series_id = :id AND #period BETWEEN :start AND :end",
+                "ExpressionAttributeNames": {"#period": "period"},
+                "ExpressionAttributeValues": {
+                    ":id": series_id(symbol, role),
+                    ":start": start,
+                    ":end": end,
+                },
+            }
+            while True:
+                response = table.query(**kwargs)
+                items.extend(response["Items"])
+                if "LastEvaluatedKey" not in response:
+                    break
+                kwargs["ExclusiveStartKey"] = response["LastEvaluatedKey"]
+            return symbol, [to_series_point(item) for item in items]
+        except Exception as e:
+            print(f"❌ Error reading sentiment series for {symbol}: {e}")
+            return symbol, []
+
+    unique_symbols = sorted(set(symbol.upper() for symbol in symbols))
+    with ThreadPoolExecutor(max_workers=max(1, min(workers, len(unique_symbols)))) as executor:
+        return dict(executor.map(query, unique_symbols))
+
+
+def get_period_series(
+    table, label: str, role: str = "all", resolution: str = "quarter"
+) -> List[Dict[str, Any]]:
+    """Every symbol's point for one period (one query on period-index)"""
+    items = []
+    kwargs = {
+        "IndexName": "period-index",
+        "KeyConditionExpression": "#period = :period",
+        "FilterExpression": "#role = :role",
+        "ExpressionAttributeNames": {"#period": "period", "#role": "role"},
+        "ExpressionAttributeValues": {":period": period_key(resolution, label), ":role": role},
+    }
+    while True:
+        response = table.query(**kwargs)
+        items.extend(response["Items"])
+        if "LastEvaluatedKey" not in response:
+            break
+        kwargs["ExclusiveStartKey"] = response["LastEvaluatedKey"]
+
+    return [{"symbol": item["symbol"], **to_series_point(item)} for item in items]
@@ -0,0 +1,125 @@
+"""
+Speaker-role classification for transcript segments.
+
+Each segment is tagged with a role (executive, analyst, operator, other) from
+its speaker and title, and a phase (prepared remarks or Q&A). Q&A starts at
+the first analyst turn, or at an operator turn that opens the question queue.
+
+Titles are checked in order: officer titles (CEO, Chief ... Officer,
+Treasurer, ...) are executives even when the company is a bank; then
+research titles and firm names mark analysts; then generic titles (VP,
+Director, Head) mark executives, since a "Managing Director, Goldman Sachs"
+is an analyst but a "VP, Finance" is not.
+
+The compact role index stored on the metadata item:
+    roles       one character per segment: e(xecutive) a(nalyst) o(perator) x (other)
+    qa_start    index of the first Q&A segment (len(segments) if there is none)
+    speakers    {speaker: {"role", "title", "segments", "words"}}
+    words       word counts per role and phase, e.g. "executive_prepared"
+"""
+
+import re
+from typing import Dict, List, Any
+
+ROLE_INDEX_VERSION = 2
+
+ROLE_CODES = {"executive": "e", "analyst": "a", "operator": "o", "other": "x"}
+CODE_ROLES = {code: role for role, code in ROLE_CODES.items()}
+
+EXECUTIVE_MARKERS = re.compile(
+    r"\bceo\b|\bcfo\b|\bcoo\b|\bcto\b|\bchief\b|\bpresident\b|\bchair(man|woman|person)?\b|"
+    r"\bofficer\b|\btreasurer\b|\bcontroller\b|\binvestor relations\b|\bir\b|\bfounder\b"
+)
+ANALYST_TITLE_MARKERS = re.compile(r"\banalyst\b|\bresearch\b")
+ANALYST_FIRM_MARKERS = re.compile(
+    r"\bsecurities\b|\bcapital\b|\bpartners\b|\bbank\b|"
+    r"& co\b|\bllc\b|\bequity\b|\bsachs\b|\bstanley\b|\bjpmorgan\b"
+)
+GENERIC_EXECUTIVE_MARKERS = re.compile(
+    r"\b[es]?vp\b|\bvice president\b|\bhead\b|\bdirector\b|\bexecutive\b"
+)
+QA_OPENING = re.compile(
+    r"question[- ]and[- ]answer|\bq&a\b|first question|open (up )?the (call|line)s? for questions"
+)
+
+
+def classify_role(segment: Dict[str, Any]) -> str:
+    """Role of a segment's speaker from its speaker name and title"""
+    speaker = segment.get("speaker", "").strip().lower()
+    title = segment.get("title", "").strip().lower()
+
+    if speaker == "operator" or title == "operator":
+        return "operator"
+    if EXECUTIVE_MARKERS.search(title):
+        return "executive"
+    if ANALYST_TITLE_MARKERS.search(title) or ANALYST_FIRM_MARKERS.search(title):
+        return "analyst"
+    if GENERIC_EXECUTIVE_MARKERS.search(title):
+        return "executive"
+    return "other"
+
+
+def classify_segments(segments: List[Dict[str, Any]]) -> List[str]:
+    """Role of every segment; speakers without a usable title inherit their known role"""
+    roles = [classify_role(segment) for segment in segments]
+
+    known = {}
+    for segment, role in zip(segments, roles):
+        if role != "other":
+            known.setdefault(segment.get("speaker", ""), role)
+    return [
+        known.get(segment.get("speaker", ""), role) if role == "other" else role
+        for segment, role in zip(segments, roles)
+    ]
+
+
+def qa_start_index(segments: List[Dict[str, Any]], roles: List[str]) -> int:
+    """Index of the first Q&A segment, or len(segments) for a call without Q&A"""
+    for index, (segment, role) in enumerate(zip(segments, roles)):
+        if role == "analyst":
+            return index
+        if role == "operator" and QA_OPENING.search(segment.get("content", "").lower()):
+            return index
+    return len(segments)
+
+
+def build_role_index(segments: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Compact role index of a transcript.
+
+    Returns:
+        dict: version, roles, qa_start, speakers and words (see module docstring)
+    """
+    roles = classify_segments(segments)
+    qa_start = qa_start_index(segments, roles)
+
+    speakers: Dict[str, Dict[str, Any]] = {}
+    words: Dict[str, int] = {}
+    for index, (segment, role) in enumerate(zip(segments, roles)):
+        word_count = len(segment.get("content", "").split())
+        phase = "qa" if index >= qa_start else "prepared"
+        words[f"{role}_{phase}"] = words.get(f"{role}_{phase}", 0) + word_count
+
+        name = segment.get("speaker") or "unknown"
+        entry = speakers.setdefault(
+            name, {"role": role, "title": segment.get("title", ""), "segments": 0, "words": 0}
+        )
+        entry["segments"] += 1
+        entry["words"] += word_count
+
+    return {
+        "version": ROLE_INDEX_VERSION,
+        "roles": "".join(ROLE_CODES[role] for role in roles),
+        "qa_start": qa_start,
+        "speakers": speakers,
+        "words": words,
+    }
+
+
+def segment_roles(role_index: Dict[str, Any]) -> List[Dict[str, str]]:
+    """Expand a stored role index into per-segment {"role", "phase"}"""
+    qa_start = int(role_index.get("qa_start", 0))
+    return [
+        {"role": CODE_ROLES.get(code, "other"), "phase": "qa" if index >= qa_start else "prepared"}
+        for index, code in enumerate(role_index.get("roles", ""))
+    ]
@@ -0,0 +1,247 @@
+"""
+Streaming, compressed S3 uploads for large exports.
+MultipartGzipWriter encodes incrementally into a gzip stream and uploads it as
+S3 multipart parts from a small thread pool. At most `max_in_flight` parts are
+held in memory at once, so memory stays bounded however large the export is,
+while parallel part uploads keep the connection saturated.
+"""
+
+import json
+import zlib
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Dict, List, Any, Iterable, Optional
+
+# S3 requires every part but the last to be at least 5 MB
+MIN_PART_SIZE = 5 * 1024 * 1024
+DEFAULT_PART_SIZE = 8 * 1024 * 1024
+
+
+class MultipartGzipWriter:
+    """
+    File-like writer that gzips and multipart-uploads to s3://bucket/key.
+
+    Usage:
+        with MultipartGzipWriter(s3_client, bucket, key) as writer:
+            for record in records:
+                writer.write_json_line(record)
+    """
+
+    def __init__(
+        self,
+        s3_client,
+        bucket: str,
+        key: str,
+        part_size: int = DEFAULT_PART_SIZE,
+        workers: int = 4,
+        max_in_flight: Optional[int] = None,
+        content_type: str = "application/x-ndjson",
+        compression_level: int = 6,
+    ):
+        self.s3_client = s3_client
+        self.bucket = bucket
+        self.key = key
+        self.part_size = max(part_size, MIN_PART_SIZE)
+        self.content_type = content_type
+
+        # wbits=31 -> gzip container
+        self._compressor = zlib.compressobj(compression_level, zlib.DEFLATED, 31)
+        self._buffer = bytearray()
+        self._executor = ThreadPoolExecutor(max_workers=workers)
+        self._slots = threading.BoundedSemaphore(max_in_flight or workers * 2)
+        self._futures = []
+        self._upload_id = None
+        self._part_number = 0
+        self._closed = False
+
+        self.raw_bytes = 0
+        self.compressed_bytes = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, traceback):
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+        return False
+
+    def write(self, data) -> int:
+        """Compress and buffer data, uploading full parts as they fill"""
+        if isinstance(data, str):
+            data = data.encode("utf-8")
+        self.raw_bytes += len(data)
+        self._buffer.extend(self._compressor.compress(data))
+
+        while len(self._buffer) >= self.part_size:
+            part = bytes(self._buffer[: self.part_size])
+            del self._buffer[: self.part_size]
+            self._submit_part(part)
+        return len(data)
+
+    def write_json_line(self, record: Any):
+        self.write(json.dumps(record, separators=(",", ":"), default=str))
+        self.write(b"\n")
+
+    def _submit_part(self, body: bytes):
+        if self._upload_id is None:
+            response = self.s3_client.create_multipart_upload(
+                Bucket=self.bucket,
+                Key=self.key,
+                ContentType=self.content_type,
+                ContentEncoding="gzip",
+            )
+            self._upload_id = response["UploadId"]
+
+        self._part_number += 1
+        self.compressed_bytes += len(body)
+
+        # Blocks while max_in_flight parts are still uploading
+        self._slots.acquire()
+        self._futures.append(
+            self._executor.submit(self._upload_part, self._part_number, body)
+        )
+
+    def _upload_part(self, part_number: int, body: bytes) -> Dict[str, Any]:
+        try:
+            response = self.s3_client.upload_part(
+                Bucket=self.bucket,
+                Key=self.key,
+                UploadId=self._upload_id,
+                PartNumber=part_number,
+                Body=body,
+            )
+            return {"PartNumber": part_number, "ETag": response["ETag"]}
+        finally:
+            self._slots.release()
+
+    def close(self) -> Dict[str, Any]:
+        """Flush the compressor, upload the last part and complete the upload"""
+        if self._closed:
+            return self.summary()
+        self._closed = True
+
+        self._buffer.extend(self._compressor.flush())
+        try:
+            if self._upload_id is None:
+                # Small payload: a single PUT is cheaper than a multipart upload
+                self.compressed_bytes = len(self._buffer)
+                self.s3_client.put_object(
+                    Bucket=self.bucket,
+                    Key=self.key,
+                    Body=bytes(self._buffer),
+                    ContentType=self.content_type,
+                    ContentEncoding="gzip",
+                )
+            else:
+                if self._buffer:
+                    self._submit_part(bytes(self._buffer))
+                parts = [future.result() for future in self._futures]
+                self.s3_client.complete_multipart_upload(
+                    Bucket=self.bucket,
+                    Key=self.key,
+                    UploadId=self._upload_id,
+                    MultipartUpload={"Parts": sorted(parts, key=lambda p: p["PartNumber"])},
+                )
+        except Exception:
+            self.abort()
+            raise
+        finally:
+            self._buffer = bytearray()
+            self._executor.shutdown(wait=True)
+
+        return self.summary()
+
+    def abort(self):
+        """Abandon the upload so no orphaned parts are billed"""
+        self._closed = True
+        for future in self._futures:
+            future.cancel()
+        self._executor.shutdown(wait=True)
+        if self._upload_id is not None:
+            try:
+                self.s3_client.abort_multipart_upload(
+                    Bucket=self.bucket, Key=self.key, UploadId=self._upload_id
+                )
+            except Exception as e:
+                print(f"❌ Error aborting multipart upload for {self.key}: {e}")
+
+    def summary(self) -> Dict[str, Any]:
+        return {
+            "bucket": self.bucket,
+            "key": self.key,
+            "parts": self._part_number or 1,
+            "raw_bytes": self.raw_bytes,
+            "compressed_bytes": self.compressed_bytes,
+        }
+
+
+def iter_symbol_transcripts(
+    s3_client, bucket: str, symbol: str, quarters: Optional[List[str]] = None
+) -> Iterable[Dict[str, Any]]:
+    """Yield a symbol's stored transcripts from S3 one at a time"""
+    if quarters is None:
+        paginator = s3_client.get_paginator("list_objects_v2")
+        keys = [
+            obj["Key"]
+            for page in paginator.paginate(Bucket=bucket, Prefix=f"transcripts/{symbol}/")
+            for obj in page.get("Contents", [])
+            if obj["Key"].endswith("/transcript.json")
+        ]
+    else:
+        keys = [f"transcripts/{symbol}/{quarter}/transcript.json" for quarter in quarters]
+
+    for key in sorted(keys):
+        try:
+            response = s3_client.get_object(Bucket=bucket, Key=key)
+            yield json.loads(response["Body"].read())
+        except s3_client.exceptions.NoSuchKey:
+            continue
+
+
+def export_symbol_history(
+    s3_client,
+    bucket: str,
+    symbol: str,
+    quarters: Optional[List[str]] = None,
+    export_key: Optional[str] = None,
+    part_size: int = DEFAULT_PART_SIZE,
+    workers: int = 4,
+) -> Dict[str, Any]:
+    """
+    Export every stored transcript of a symbol as one gzipped JSON Lines object.
+
+    Only one transcript plus the in-flight parts are in memory at any time.
+
+    Args:
+        s3_client: boto3 S3 client
+        bucket: Earnings data bucket
+        symbol: Stock symbol
+        quarters: Restrict to these quarters (default: everything stored)
+        export_key: Destination key (default exports/{symbol}/history-{timestamp}.jsonl.gz)
+        part_size: Multipart part size in bytes
+        workers: Parallel part uploads
+
+    Returns:
+        dict: Export summary
+    """
+    export_key = export_key or (
+        f"exports/{symbol}/history-{datetime.now().strftime('%Y%m%dT%H%M%S')}.jsonl.gz"
+    )
+
+    transcripts = 0
+    with MultipartGzipWriter(
+        s3_client, bucket, export_key, part_size=part_size, workers=workers
+    ) as writer:
+        for transcript in iter_symbol_transcripts(s3_client, bucket, symbol, quarters):
+            writer.write_json_line(transcript)
+            transcripts += 1
+    summary = writer.summary()
+
+    print(
+        f"✅ Exported {transcripts} transcripts for {symbol} to s3://{bucket}/{export_key} "
+        f"({summary['raw_bytes']} -> {summary['compressed_bytes']} bytes, {summary['parts']} parts)"
+    )
+    return {**summary, "symbol": symbol, "transcripts": transcripts}
@@ -0,0 +1,281 @@
+"""
+Week-bucketed earnings calendar snapshot and the calendar read API.
+The FMP Lambda writes one S3 object per ISO week after each fetch; the read
+handler serves date-range and symbol-filtered queries from those buckets with
+ETag/Cache-Control headers, so repeated page loads never touch DynamoDB.
+"""
+
+import os
+import json
+import time
+import hashlib
+from datetime import datetime, timedelta, date
+from typing import List, Dict, Any, Optional
+import boto3
+from botocore.exceptions import ClientError
+from ..shared import quarters
+
+# AWS Configuration - these can be defaults
+AWS_REGION = os.environ.get("AWS_REGION", "us-east-1")
+PROJECT_NAME = os.environ.get("PROJECT_NAME", "earnings-sentiment")
+ENVIRONMENT = os.environ.get("ENVIRONMENT", "dev")
+
+SNAPSHOT_PREFIX = "calendar/weeks"
+MAX_RANGE_DAYS = 180
+CACHE_SECONDS = 300
+
+# Per-container cache: week key -> (fetched_at, etag, events)
+_week_cache: Dict[str, Any] = {}
+_parameters: Dict[str, str] = {}
+
+
+def week_key(day: date) -> str:
+    """S3 key of the ISO week bucket containing `day`"""
+    iso_year, iso_week, _ = day.isocalendar()
+    return f"{SNAPSHOT_PREFIX}/{iso_year}-W{iso_week:02d}.json"
+
+
+def reported_quarter(symbol: str, earnings_date: str) -> str:
+    """Fiscal quarter a report covers, e.g. AAPL 2024-05-02 -> "Q2 2024" """
+    fiscal_quarter = quarters.reported_quarter(symbol, earnings_date)
+    return f"Q{fiscal_quarter.quarter} {fiscal_quarter.year}"
+
+
+def importance(revenue_estimated: float) -> str:
+    """Rough event importance from estimated revenue"""
+    if revenue_estimated >= 10_000_000_000:
+        return "high"
+    if revenue_estimated >= 1_000_000_000:
+        return "medium"
+    return "low"
+
+
+def to_snapshot_event(item: Dict[str, Any]) -> Dict[str, Any]:
+    """Compact calendar row stored in the weekly buckets"""
+    return {
+        "symbol": item.get("symbol", ""),
+        "date": item.get("date", ""),
+        "eps_actual": item.get("epsActual"),
+        "eps_estimated": item.get("epsEstimated"),
+        "revenue_actual": item.get("revenueActual"),
+        "revenue_estimated": item.get("revenueEstimated"),
+        "last_updated": item.get("lastUpdated", ""),
+        **item.get("derived", {}),
+    }
+
+
+def write_weekly_snapshot(
+    earnings_data: List[Dict[str, Any]], bucket: str, window_start: str
+) -> Dict[str, Any]:
+    """
+    Write the fetched calendar into per-week S3 buckets.
+
+    Events in a bucket dated before `window_start` (outside this fetch) are
+    kept; everything from window_start on is replaced by the fresh data.
+
+    Args:
+        earnings_data: Raw FMP earnings calendar rows
+        bucket: Earnings data bucket
+        window_start: First date (YYYY-MM-DD) covered by this fetch
+
+    Returns:
+        dict: Number of weeks and events written
+    """
+    s3_client = boto3.client("s3", region_name=AWS_REGION)
+
+    weeks: Dict[str, List[Dict[str, Any]]] = {}
+    for item in earnings_data:
+        if not item.get("date"):
+            continue
+        event = to_snapshot_event(item)
+        day = datetime.strptime(event["date"], "%Y-%m-%d").date()
+        weeks.setdefault(week_key(day), []).append(event)
+
+    # Rewrite empty weeks inside the window too, so moved events don't linger
+    if weeks:
+        day = datetime.strptime(window_start, "%Y-%m-%d").date()
+        last_day = max(event["date"] for events in weeks.values() for event in events)
+        while day.isoformat() <= last_day:
+            weeks.setdefault(week_key(day), [])
+            day += timedelta(days=7)
+
+    for key, events in weeks.items():
+        try:
+            existing = json.loads(
+                s3_client.get_object(Bucket=bucket, Key=key)["Body"].read()
+            )
+            events = [e for e in existing["events"] if e["date"] < window_start] + events
+        except s3_client.exceptions.NoSuchKey:
+            pass
+
+        events.sort(key=lambda e: (e["date"], e["symbol"]))
+        s3_client.put_object(
+            Bucket=bucket,
+            Key=key,
+            Body=json.dumps(
+                {"events": events, "updated_at": datetime.now().isoformat()},
+                separators=(",", ":"),
+            ),
+            ContentType="application/json",
+        )
+
+    total_events = sum(len(events) for events in weeks.values())
+    print(f"✅ Wrote {len(weeks)} weekly calendar buckets ({total_events} events)")
+    return {"weeks": len(weeks), "events": total_events}
+
+
+# Always use Parameter Store (local and AWS)
+def get_parameter(parameter_name: str) -> str:
+    """Get parameter from AWS Systems Manager Parameter Store (cached per container)"""
+    if parameter_name in _parameters:
+        return _parameters[parameter_name]
+
+    try:
+        ssm = boto3.client("ssm", region_name=AWS_REGION)
+        response = ssm.get_parameter(Name=parameter_name, WithDecryption=True)
+        _parameters[parameter_name] = response["Parameter"]["Value"]
+        return _parameters[parameter_name]
+    except Exception as e:
+        print(f"❌ Error getting parameter {parameter_name}: {e}")
+        raise e
+
+
+def load_week(s3_client, bucket: str, key: str) -> Dict[str, Any]:
+    """
+    Load one week bucket, reusing the container copy for CACHE_SECONDS and
+    revalidating with If-None-Match afterwards.
+    """
+    cached = _week_cache.get(key)
+    if cached and time.time() - cached[0] < CACHE_SECONDS:
+        return {"etag": cached[1], "events": cached[2]}
+
+    get_kwargs = {"Bucket": bucket, "Key": key}
+    if cached:
+        get_kwargs["IfNoneMatch"] = cached[1]
+
+    try:
+        response = s3_client.get_object(**get_kwargs)
+        events = json.loads(response["Body"].read())["events"]
+        etag = response["ETag"]
+    except s3_client.exceptions.NoSuchKey:
+        events, etag = [], '"empty"'
+    except ClientError as e:
+        # 304 Not Modified surfaces as a ClientError
+        status = e.response.get("ResponseMetadata", {}).get("HTTPStatusCode")
+        if cached and (status == 304 or e.response["Error"]["Code"] == "304"):
+            events, etag = cached[2], cached[1]
+        else:
+            raise
+
+    _week_cache[key] = (time.time(), etag, events)
+    return {"etag": etag, "events": events}
+
+
+def query_calendar(
+    bucket: str, start: date, end: date, symbols: Optional[set] = None
+) -> Dict[str, Any]:
+    """
+    Events between start and end (inclusive), grouped by date.
+
+    Returns:
+        dict with "data" ([{date, events}]) and a combined "etag"
+    """
+    s3_client = boto3.client("s3", region_name=AWS_REGION)
+
+    keys = []
+    day = start - timedelta(days=start.weekday())
+    while day <= end:
+        keys.append(week_key(day))
+        day += timedelta(days=7)
+
+    start_str, end_str = start.isoformat(), end.isoformat()
+    by_date: Dict[str, List[Dict[str, Any]]] = {}
+    etags = []
+
+    for key in keys:
+        week = load_week(s3_client, bucket, key)
+        etags.append(week["etag"])
+
+        for event in week["events"]:
+            if not start_str <= event["date"] <= end_str:
+                continue
+            if symbols and event["symbol"] not in symbols:
+                continue
+
+            by_date.setdefault(event["date"], []).append(
+                {
+                    "symbol": event["symbol"],
+                    "company": "",
+                    "date": event["date"],
+                    "time": "",
+                    "quarter": reported_quarter(event["symbol"], event["date"]),
+                    "importance": importance(float(event.get("revenue_estimated") or 0)),
+                    "epsEstimated": event.get("eps_estimated"),
+                    "epsActual": event.get("eps_actual"),
+                }
+            )
+
+    fingerprint = json.dumps([start_str, end_str, sorted(symbols or []), etags])
+    return {
+        "data": [{"date": d, "events": by_date[d]} for d in sorted(by_date)],
+        "etag": '"' + hashlib.sha1(fingerprint.encode("utf-8")).hexdigest() + '"',
+    }
+
+
+def api_response(status_code: int, body: Optional[Dict[str, Any]], headers: Dict[str, str] = None):
+    """API Gateway proxy response with CORS headers"""
+    return {
+        "statusCode": status_code,
+        "headers": {
+            "Content-Type": "application/json",
+            "Access-Control-Allow-Origin": "*",
+            **(headers or {}),
+        },
+        "body": json.dumps(body) if body is not None else "",
+    }
+
+
+def lambda_handler(event, context):
+    """
+    Serve GET /calendar?start_date=YYYY-MM-DD&end_date=YYYY-MM-DD&symbols=AAPL,MSFT
+    """
+    print(f"Request ID: {context.aws_request_id}")
+
+    try:
+        params = event.get("queryStringParameters") or {}
+        today = datetime.now().date()
+        start = datetime.strptime(params.get("start_date", today.isoformat()), "%Y-%m-%d").date()
+        end = datetime.strptime(
+            params.get("end_date", (start + timedelta(days=30)).isoformat()), "%Y-%m-%d"
+        ).date()
+
+        if end < start or (end - start).days > MAX_RANGE_DAYS:
+            return api_response(
+                400,
+                {"success": False, "error": f"Date range must be 0-{MAX_RANGE_DAYS} days"},
+            )
+
+        symbols = {
+            symbol.strip().upper()
+            for symbol in params.get("symbols", "").split(",")
+            if symbol.strip()
+        }
+
+        bucket = get_parameter(f"/{PROJECT_NAME}/{ENVIRONMENT}/earnings-data-bucket")
+        result = query_calendar(bucket, start, end, symbols or None)
+
+        cache_headers = {
+            "ETag": result["etag"],
+            "Cache-Control": f"public, max-age={CACHE_SECONDS}",
+        }
+        request_headers = {k.lower(): v for k, v in (event.get("headers") or {}).items()}
+        if request_headers.get("if-none-match") == result["etag"]:
+            return api_response(304, None, cache_headers)
+
+        return api_response(200, {"success": True, "data": result["data"]}, cache_headers)
+
+    except ValueError as e:
+        return api_response(400, {"success": False, "error": str(e)})
+    except Exception as e:
+        print(f"Error in lambda_handler: {e}")
+        return api_response(500, {"success": False, "error": str(e)})
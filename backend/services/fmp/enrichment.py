@@ -0,0 +1,223 @@
+"""
+Earnings calendar enrichment: surprise metrics, beat rates and estimate revisions.
+
+Computed once per calendar fetch for every row at once and stored as derived
+attributes on the calendar items (and in the weekly snapshot), so readers
+never recompute them:
+    eps_surprise, eps_surprise_pct, revenue_surprise, revenue_surprise_pct
+    eps_beat                         actual above estimate
+    beat_rate_4q, beat_rate_8q       share of beats over the last 4/8 reported quarters
+    reported_quarters                reported quarters behind the beat rates
+    eps_estimate_initial             first estimate seen for this report date
+    eps_estimate_revision            change since the previously stored estimate
+    eps_estimate_revision_pct        change since the first estimate seen
+    revenue_estimate_initial, revenue_estimate_revision_pct
+
+History comes from the symbol's reported rows already in the table; earlier
+stored values of the same row give the estimate revisions. Rows stored with
+item_version >= 2 hold NULL for values not reported yet; older rows stored 0.
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Dict, List, Any, Optional, Tuple
+
+HISTORY_QUARTERS = 8
+
+# Calendar rows must outlive the HISTORY_QUARTERS (two years) of reports the
+# beat rates look back over, with margin for late and infrequent reporters
+CALENDAR_TTL_DAYS = 3 * 365
+BATCH_GET_SIZE = 100
+
+# Version of the calendar items written by store_earnings_calendar; from 2 on
+# unreported values are stored as NULL instead of 0
+CALENDAR_ITEM_VERSION = 2
+
+
+def to_float(value: Any) -> Optional[float]:
+    """Float from an API or DynamoDB value; None when missing or not numeric"""
+    if value is None or value == "":
+        return None
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def surprise(actual: Optional[float], estimate: Optional[float]) -> Tuple[Optional[float], Optional[float]]:
+    """(absolute, percent of |estimate|) surprise; None where undefined"""
+    if actual is None or estimate is None:
+        return None, None
+    difference = actual - estimate
+    return difference, (difference / abs(estimate) * 100 if estimate else None)
+
+
+def stored_value(item: Dict[str, Any], field: str) -> Optional[float]:
+    """
+    Numeric attribute of a stored row; None when not reported.
+
+    Rows from before CALENDAR_ITEM_VERSION 2 stored 0 for missing values, so
+    there (and only there) 0 still means missing.
+    """
+    value = to_float(item.get(field))
+    if value == 0 and int(item.get("item_version", 1)) < CALENDAR_ITEM_VERSION:
+        return None
+    return value
+
+
+def first_value(*values: Optional[float]) -> Optional[float]:
+    """First value that is not None (0 is a value)"""
+    return next((value for value in values if value is not None), None)
+
+
+def load_existing_rows(
+    table, keys: List[Tuple[str, str]]
+) -> Dict[Tuple[str, str], Dict[str, Any]]:
+    """Currently stored calendar rows for (symbol, date) keys, via BatchGetItem"""
+    client = table.meta.client
+    existing = {}
+    unique_keys = sorted(set(keys))
+
+    for start in range(0, len(unique_keys), BATCH_GET_SIZE):
+        request = {
+            table.name: {
+                "Keys": [
+                    {"stock_symbol": symbol, "earnings_date": date}
+                    for symbol, date in unique_keys[start : start + BATCH_GET_SIZE]
+                ],
+                "ProjectionExpression": (
+                    "stock_symbol, earnings_date, eps_estimated, revenue_estimated, "
+                    "eps_estimate_initial, revenue_estimate_initial, item_version"
+                ),
+            }
+        }
+        while request:
+            response = client.batch_get_item(RequestItems=request)
+            for item in response["Responses"].get(table.name, []):
+                existing[(item["stock_symbol"], item["earnings_date"])] = item
+            request = response.get("UnprocessedKeys") or None
+
+    return existing
+
+
+def load_reported_history(
+    table, symbols: List[str], before_date: str, workers: int = 16
+) -> Dict[str, List[Dict[str, Any]]]:
+    """
+    Each symbol's last HISTORY_QUARTERS stored rows dated before before_date, oldest first.
+
+    Queries go through the table's client, which is thread-safe, rather than
+    the Table resource, which must not be shared across threads.
+    """
+    client = table.meta.client
+
+    def query(symbol: str) -> Tuple[str, List[Dict[str, Any]]]:
+        try:
+            response = client.query(
+                TableName=table.name,
+                KeyConditionExpression="stock_symbol = :symbol AND earnings_date < :before",
+                ExpressionAttributeValues={":symbol": symbol, ":before": before_date},
+                ProjectionExpression=(
+                    "earnings_date, eps_actual, eps_estimated, revenue_actual, "
+                    "revenue_estimated, item_version"
+                ),
+                ScanIndexForward=False,
+                Limit=HISTORY_QUARTERS,
+            )
+            return symbol, list(reversed(response["Items"]))
+        except Exception as e:
+            print(f"❌ Error loading calendar history for {symbol}: {e}")
+            return symbol, []
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        return dict(executor.map(query, sorted(set(symbols))))
+
+
+def beat_rate(beats: List[bool], window: int) -> Optional[float]:
+    recent = beats[-window:]
+    return sum(recent) / len(recent) if recent else None
+
+
+def enrich_calendar(
+    earnings_data: List[Dict[str, Any]], table, window_start: str
+) -> Dict[Tuple[str, str], Dict[str, Any]]:
+    """
+    Derived attributes for every fetched calendar row.
+
+    Args:
+        earnings_data: Raw FMP earnings calendar rows
+        table: Earnings calendar DynamoDB table
+        window_start: First date (YYYY-MM-DD) covered by this fetch
+
+    Returns:
+        dict: {(symbol, date): {attribute: float | bool | int}}, None values dropped
+    """
+    rows = sorted(
+        (row for row in earnings_data if row.get("symbol") and row.get("date")),
+        key=lambda row: (row["symbol"], row["date"]),
+    )
+    existing = load_existing_rows(table, [(row["symbol"], row["date"]) for row in rows])
+    history = load_reported_history(table, [row["symbol"] for row in rows], window_start)
+
+    # Beat/miss sequence per symbol from stored history, oldest first
+    beats: Dict[str, List[bool]] = {}
+    for symbol, items in history.items():
+        for item in items:
+            actual = stored_value(item, "eps_actual")
+            estimate = stored_value(item, "eps_estimated")
+            if actual is not None and estimate is not None:
+                beats.setdefault(symbol, []).append(actual > estimate)
+
+    derived = {}
+    for row in rows:
+        key = (row["symbol"], row["date"])
+        symbol_beats = beats.setdefault(row["symbol"], [])
+        previous = existing.get(key, {})
+
+        eps_actual = to_float(row.get("epsActual"))
+        eps_estimate = to_float(row.get("epsEstimated"))
+        revenue_actual = to_float(row.get("revenueActual"))
+        revenue_estimate = to_float(row.get("revenueEstimated"))
+
+        eps_surprise, eps_surprise_pct = surprise(eps_actual, eps_estimate)
+        revenue_surprise, revenue_surprise_pct = surprise(revenue_actual, revenue_estimate)
+        if eps_surprise is not None:
+            symbol_beats.append(eps_surprise > 0)
+
+        eps_initial = first_value(
+            stored_value(previous, "eps_estimate_initial"),
+            stored_value(previous, "eps_estimated"),
+            eps_estimate,
+        )
+        revenue_initial = first_value(
+            stored_value(previous, "revenue_estimate_initial"),
+            stored_value(previous, "revenue_estimated"),
+            revenue_estimate,
+        )
+        eps_previous = stored_value(previous, "eps_estimated")
+
+        attributes = {
+            "eps_surprise": eps_surprise,
+            "eps_surprise_pct": eps_surprise_pct,
+            "revenue_surprise": revenue_surprise,
+            "revenue_surprise_pct": revenue_surprise_pct,
+            "eps_beat": eps_surprise > 0 if eps_surprise is not None else None,
+            "beat_rate_4q": beat_rate(symbol_beats, 4),
+            "beat_rate_8q": beat_rate(symbol_beats, 8),
+            "reported_quarters": min(len(symbol_beats), HISTORY_QUARTERS),
+            "eps_estimate_initial": eps_initial,
+            "eps_estimate_revision": (
+                eps_estimate - eps_previous
+                if eps_estimate is not None and eps_previous is not None
+                else None
+            ),
+            "eps_estimate_revision_pct": surprise(eps_estimate, eps_initial)[1],
+            "revenue_estimate_initial": revenue_initial,
+            "revenue_estimate_revision_pct": surprise(revenue_estimate, revenue_initial)[1],
+        }
+        derived[key] = {name: value for name, value in attributes.items() if value is not None}
+        derived[key]["enriched_at"] = datetime.now().isoformat()
+
+    reported = sum(1 for values in derived.values() if "eps_surprise" in values)
+    print(f"✅ Enriched {len(derived)} calendar rows ({reported} reported)")
+    return derived
@@ -5,12 +5,17 @@ and stores it in DynamoDB. It uses AWS Systems Manager Parameter Store for confi
 
 import os
 import json
-from decimal import Decimal
-from typing import List, Dict, Any
+from decimal import Decimal, InvalidOperation
+from typing import List, Dict, Any, Optional
 from datetime import datetime, timedelta
-import requests
 import boto3
 
+from .calendar_snapshot import write_weekly_snapshot
+from .enrichment import CALENDAR_ITEM_VERSION, CALENDAR_TTL_DAYS, enrich_calendar
+from ..shared.profiling import profiled
+from ..shared.quarters import reported_quarter
+from ..shared.quota_ledger import QuotaExhaustedError, acquire_quota
+
 # AWS Configuration - these can be defaults
 AWS_REGION = os.environ.get("AWS_REGION", "us-east-1")
 PROJECT_NAME = os.environ.get("PROJECT_NAME", "earnings-sentiment")
@@ -30,8 +35,13 @@ def get_parameter(parameter_name: str) -> str:
         raise e
 
 
+@profiled("earnings-calendar")
 def lambda_handler(event, context):
-    """Main Lambda handler - fetch earnings calendar and store in DynamoDB"""
+    """
+    Main Lambda handler - fetch earnings calendar and store in DynamoDB.
+
+    {"profile": true} (or "cprofile") writes a flame-graph profile of the run.
+    """
     print(f"Starting earnings calendar data fetch in region: {AWS_REGION}")
     print(f"Request ID: {context.aws_request_id}")
     print(f"Event: {event}")
@@ -44,18 +54,37 @@ def lambda_handler(event, context):
             f"/{PROJECT_NAME}/{ENVIRONMENT}/earnings-calendar-table"
         )
 
+        quota_table = get_parameter(f"/{PROJECT_NAME}/{ENVIRONMENT}/api-quota-table")
+
         print(f"Using table: {table_name}")
 
         # Initialize DynamoDB after getting config
         dynamodb = boto3.resource("dynamodb", region_name=AWS_REGION)
 
         # Fetch earnings calendar data from FMP
-        earnings_data = get_earnings_calendar(fmp_api_key)
+        earnings_data = get_earnings_calendar(fmp_api_key, quota_table)
         print(f"Fetched {len(earnings_data)} earnings events")
+        window_start = (datetime.now() - timedelta(days=1)).strftime("%Y-%m-%d")
+
+        # Surprise metrics, beat rates and estimate revisions for every row
+        try:
+            derived = enrich_calendar(earnings_data, dynamodb.Table(table_name), window_start)
+        except Exception as e:
+            print(f"❌ Error enriching calendar: {e}")
+            derived = {}
+        for item in earnings_data:
+            item["derived"] = derived.get((item.get("symbol"), item.get("date")), {})
 
         # Store in DynamoDB
         store_earnings_calendar(earnings_data, table_name, dynamodb)
 
+        # Refresh the week-bucketed snapshot served by the calendar API
+        try:
+            bucket = get_parameter(f"/{PROJECT_NAME}/{ENVIRONMENT}/earnings-data-bucket")
+            write_weekly_snapshot(earnings_data, bucket, window_start)
+        except Exception as e:
+            print(f"❌ Error writing calendar snapshot: {e}")
+
         return {
             "statusCode": 200,
             "body": json.dumps(
@@ -66,13 +95,24 @@ def lambda_handler(event, context):
             ),
         }
 
+    except QuotaExhaustedError as e:
+        print(f"❌ {e}")
+        return {"statusCode": 429, "body": json.dumps({"error": str(e)})}
+
     except Exception as e:
         print(f"Error in lambda_handler: {e}")
         return {"statusCode": 500, "body": json.dumps({"error": str(e)})}
 
 
-def get_earnings_calendar(api_key: str) -> List[Dict[str, Any]]:
-    """Get earnings calendar data from Financial Modeling Prep API."""
+def get_earnings_calendar(api_key: str, quota_table: str = None) -> List[Dict[str, Any]]:
+    """
+    Get earnings calendar data from Financial Modeling Prep API.
+
+    With quota_table, the call is first charged to the key's shared quota
+    ledger and raises QuotaExhaustedError once the daily quota is used up.
+    """
+    # Imported here: only the fetch path needs it, so it stays out of module init
+    import requests
 
     # Get date range (yesterday to 90 days ahead)
     yesterday = datetime.now() - timedelta(days=1)
@@ -84,6 +124,9 @@ def get_earnings_calendar(api_key: str) -> List[Dict[str, Any]]:
     url = "https://financialmodelingprep.com/stable/earnings-calendar"
     params = {"from": yesterday_str, "to": ninety_days_ahead_str, "apikey": api_key}
 
+    if quota_table:
+        acquire_quota(quota_table, "fmp", api_key, region_name=AWS_REGION)
+
     try:
         response = requests.get(url, params=params, timeout=30)
         response.raise_for_status()
@@ -100,7 +143,7 @@ def get_earnings_calendar(api_key: str) -> List[Dict[str, Any]]:
 def store_earnings_calendar(
     earnings_data: List[Dict[str, Any]], table_name: str, dynamodb
 ):
-    """Store earnings calendar data in DynamoDB."""
+    """Store earnings calendar data, with any derived enrichment attributes, in DynamoDB."""
 
     table = dynamodb.Table(table_name)
 
@@ -111,15 +154,31 @@ def store_earnings_calendar(
             dynamo_item = {
                 "stock_symbol": item.get("symbol", ""),
                 "earnings_date": item.get("date", ""),
-                "eps_actual": convert_to_decimal(item.get("epsActual")),
-                "eps_estimated": convert_to_decimal(item.get("epsEstimated")),
-                "revenue_actual": convert_to_decimal(item.get("revenueActual")),
-                "revenue_estimated": convert_to_decimal(item.get("revenueEstimated")),
+                # Not reported yet -> NULL, so a real 0 is never mistaken for missing
+                "eps_actual": convert_to_nullable_decimal(item.get("epsActual")),
+                "eps_estimated": convert_to_nullable_decimal(item.get("epsEstimated")),
+                "revenue_actual": convert_to_nullable_decimal(item.get("revenueActual")),
+                "revenue_estimated": convert_to_nullable_decimal(item.get("revenueEstimated")),
+                "item_version": CALENDAR_ITEM_VERSION,
                 "last_updated": item.get("lastUpdated", ""),
                 "created_at": now.isoformat(),
-                "ttl": int((now + timedelta(days=365)).timestamp()),
+                "ttl": int((now + timedelta(days=CALENDAR_TTL_DAYS)).timestamp()),
             }
 
+            # Integer index of the fiscal quarter reported, for joins with transcripts
+            try:
+                dynamo_item["quarter_index"] = reported_quarter(
+                    dynamo_item["stock_symbol"], dynamo_item["earnings_date"]
+                ).index
+            except ValueError:
+                pass
+
+            # Derived enrichment attributes (see enrichment.py)
+            for name, value in item.get("derived", {}).items():
+                dynamo_item[name] = (
+                    convert_to_decimal(value) if isinstance(value, float) else value
+                )
+
             try:
                 batch.put_item(Item=dynamo_item)
             except Exception as e:
@@ -136,3 +195,13 @@ def convert_to_decimal(value) -> Decimal:
         return Decimal(str(value))
     except (ValueError, TypeError):
         return Decimal("0")
+
+
+def convert_to_nullable_decimal(value) -> Optional[Decimal]:
+    """Convert a numeric value to Decimal for DynamoDB; None (stored as NULL) when missing."""
+    if value is None or value == "":
+        return None
+    try:
+        return Decimal(str(value))
+    except (ValueError, TypeError, InvalidOperation):
+        return None
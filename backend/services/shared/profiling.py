@@ -0,0 +1,164 @@
+"""
+Opt-in profiling for Lambda handlers.
+
+Enable per invocation with an event flag, or for every invocation of a
+function with the PROFILE_HANDLER environment variable:
+    {"profile": true, ...}          sampling profiler (default)
+    {"profile": "cprofile", ...}    deterministic cProfile as well
+    PROFILE_HANDLER=1 | cprofile
+
+The sampler records the handler thread's stack every PROFILE_INTERVAL_MS
+(default 5) and writes collapsed stacks ("frame;frame;frame count"), which
+flamegraph.pl and speedscope render directly. Artifacts go to
+/tmp/profiles and, when PROFILE_BUCKET or EARNINGS_DATA_BUCKET is set, to
+s3://{bucket}/profiles/{service}/.
+"""
+
+import os
+import sys
+import time
+import functools
+import threading
+from collections import Counter
+from datetime import datetime
+from typing import Dict, List, Any, Callable, Optional, Tuple
+
+PROFILE_DIR = os.environ.get("PROFILE_DIR", "/tmp/profiles")
+
+
+class StackSampler:
+    """Samples one thread's Python stack on a background thread"""
+
+    def __init__(self, thread_id: int, interval: float = 0.005):
+        self.thread_id = thread_id
+        self.interval = interval
+        self.stacks: Counter = Counter()
+        self.samples = 0
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            if frame is None:
+                continue
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                stack.append(
+                    f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+                )
+                frame = frame.f_back
+            self.stacks[";".join(reversed(stack))] += 1
+            self.samples += 1
+
+    def collapsed(self) -> str:
+        """Collapsed-stack text, one "stack count" line per distinct stack"""
+        return "".join(f"{stack} {count}\n" for stack, count in sorted(self.stacks.items()))
+
+    def top_frames(self, limit: int = 10) -> List[Tuple[str, int]]:
+        """Leaf frames with the most samples (self time)"""
+        leaves: Counter = Counter()
+        for stack, count in self.stacks.items():
+            leaves[stack.rsplit(";", 1)[-1]] += count
+        return leaves.most_common(limit)
+
+
+def profile_mode(event: Any) -> Optional[str]:
+    """Profiling mode ("sample", "cprofile" or None) from the event flag or PROFILE_HANDLER"""
+    flag = event.get("profile") if isinstance(event, dict) else None
+    flag = flag or os.environ.get("PROFILE_HANDLER")
+    if not flag or str(flag).lower() in ("0", "false", "off"):
+        return None
+    return "cprofile" if str(flag).lower() == "cprofile" else "sample"
+
+
+def write_artifacts(service: str, request_id: str, artifacts: Dict[str, bytes]) -> List[str]:
+    """Write profile artifacts to /tmp and, if a bucket is configured, to S3"""
+    os.makedirs(PROFILE_DIR, exist_ok=True)
+    stamp = datetime.now().strftime("%Y%m%dT%H%M%S")
+    locations = []
+
+    for suffix, body in artifacts.items():
+        path = os.path.join(PROFILE_DIR, f"{service}-{stamp}-{request_id}.{suffix}")
+        with open(path, "wb") as f:
+            f.write(body)
+        locations.append(path)
+
+    bucket = os.environ.get("PROFILE_BUCKET") or os.environ.get("EARNINGS_DATA_BUCKET")
+    if bucket:
+        import boto3
+
+        s3_client = boto3.client("s3", region_name=os.environ.get("AWS_REGION", "us-east-1"))
+        for suffix, body in artifacts.items():
+            key = f"profiles/{service}/{stamp}-{request_id}.{suffix}"
+            s3_client.put_object(Bucket=bucket, Key=key, Body=body)
+            locations.append(f"s3://{bucket}/{key}")
+
+    return locations
+
+
+def profiled(service: str) -> Callable:
+    """Decorate a Lambda handler so flagged invocations are profiled"""
+
+    def decorator(handler: Callable) -> Callable:
+        @functools.wraps(handler)
+        def wrapper(event, context):
+            mode = profile_mode(event)
+            if mode is None:
+                return handler(event, context)
+
+            sampler = StackSampler(
+                threading.get_ident(),
+                float(os.environ.get("PROFILE_INTERVAL_MS", 5)) / 1000,
+            )
+            profiler = None
+            if mode == "cprofile":
+                import cProfile
+
+                profiler = cProfile.Profile()
+
+            started = time.perf_counter()
+            sampler.start()
+            if profiler:
+                profiler.enable()
+            try:
+                return handler(event, context)
+            finally:
+                if profiler:
+                    profiler.disable()
+                sampler.stop()
+                elapsed = time.perf_counter() - started
+
+                try:
+                    artifacts = {"collapsed": sampler.collapsed().encode("utf-8")}
+                    if profiler:
+                        import io
+                        import pstats
+
+                        stream = io.StringIO()
+                        stats = pstats.Stats(profiler, stream=stream)
+                        stats.sort_stats("cumulative").print_stats(40)
+                        artifacts["pstats.txt"] = stream.getvalue().encode("utf-8")
+
+                    request_id = getattr(context, "aws_request_id", "local")
+                    locations = write_artifacts(service, request_id, artifacts)
+                    print(
+                        f"✅ Profiled {service} for {elapsed:.2f}s "
+                        f"({sampler.samples} samples): {', '.join(locations)}"
+                    )
+                    for frame, count in sampler.top_frames():
+                        print(f"   {count:>6}  {frame}")
+                except Exception as e:
+                    print(f"❌ Error writing profile for {service}: {e}")
+
+        return wrapper
+
+    return decorator
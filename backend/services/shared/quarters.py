@@ -0,0 +1,154 @@
+"""
+Fiscal-quarter arithmetic on a single ordinal integer.
+A quarter is stored as year * 4 + (quarter - 1), so ranges, offsets and
+comparisons are plain integer operations and joins can key on ints.
+"""
+
+from datetime import date, datetime
+from functools import total_ordering
+from typing import Dict, Iterable, List, Optional, Union
+
+# Month in which each company's fiscal year starts (1 = calendar year).
+# Fiscal years are named after the calendar year in which they end,
+# e.g. AAPL FY2024Q1 covers Oct-Dec 2023.
+FISCAL_YEAR_START_MONTH: Dict[str, int] = {
+    "AAPL": 10,
+    "MSFT": 7,
+    "NVDA": 2,
+    "ORCL": 6,
+    "CSCO": 8,
+    "WMT": 2,
+    "HD": 2,
+    "COST": 9,
+    "NKE": 6,
+    "ADBE": 12,
+}
+
+
+@total_ordering
+class FiscalQuarter:
+    """A fiscal quarter stored as one ordinal integer."""
+
+    __slots__ = ("index",)
+
+    def __init__(self, index: int):
+        self.index = int(index)
+
+    @classmethod
+    def from_parts(cls, year: int, quarter: int) -> "FiscalQuarter":
+        """Build from a fiscal year and quarter number (1-4)."""
+        if not 1 <= quarter <= 4:
+            raise ValueError(f"Quarter must be 1-4, got: {quarter}")
+        return cls(year * 4 + quarter - 1)
+
+    @classmethod
+    def parse(cls, quarter_str: str) -> "FiscalQuarter":
+        """
+        Parse a YYYYQX string (e.g. "2024Q1").
+
+        Raises:
+            ValueError: If the string is not in YYYYQX format
+        """
+        if not quarter_str or "Q" not in quarter_str:
+            raise ValueError(
+                f"Invalid quarter format: {quarter_str}. Expected YYYYQX format."
+            )
+
+        year_str, quarter_num_str = quarter_str.split("Q")
+        return cls.from_parts(int(year_str), int(quarter_num_str))
+
+    @classmethod
+    def from_date(
+        cls, value: Union[date, datetime, str], fiscal_start_month: int = 1
+    ) -> "FiscalQuarter":
+        """
+        Map a date to the fiscal quarter containing it.
+
+        Args:
+            value: date, datetime or YYYY-MM-DD string
+            fiscal_start_month: Month in which the fiscal year starts (1-12)
+        """
+        if isinstance(value, str):
+            value = datetime.strptime(value[:10], "%Y-%m-%d")
+
+        # Months elapsed since the start of fiscal year 0
+        months = value.year * 12 + value.month - fiscal_start_month
+        if fiscal_start_month > 1:
+            months += 12
+        return cls(months // 3)
+
+    @classmethod
+    def for_symbol_date(
+        cls, symbol: str, value: Union[date, datetime, str]
+    ) -> "FiscalQuarter":
+        """Map a date to a symbol's fiscal quarter using FISCAL_YEAR_START_MONTH."""
+        return cls.from_date(value, fiscal_start_month(symbol))
+
+    @property
+    def year(self) -> int:
+        return self.index // 4
+
+    @property
+    def quarter(self) -> int:
+        return self.index % 4 + 1
+
+    def __add__(self, offset: int) -> "FiscalQuarter":
+        return FiscalQuarter(self.index + offset)
+
+    def __sub__(self, other):
+        if isinstance(other, FiscalQuarter):
+            return self.index - other.index
+        return FiscalQuarter(self.index - other)
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, FiscalQuarter):
+            return self.index == other.index
+        return NotImplemented
+
+    def __lt__(self, other) -> bool:
+        if isinstance(other, FiscalQuarter):
+            return self.index < other.index
+        return NotImplemented
+
+    def __hash__(self) -> int:
+        return hash(self.index)
+
+    def __int__(self) -> int:
+        return self.index
+
+    def __str__(self) -> str:
+        return f"{self.year}Q{self.quarter}"
+
+    def __repr__(self) -> str:
+        return f"FiscalQuarter({str(self)!r})"
+
+
+def fiscal_start_month(symbol: str) -> int:
+    """Get the month a symbol's fiscal year starts in (defaults to January)."""
+    return FISCAL_YEAR_START_MONTH.get(symbol.upper(), 1)
+
+
+def reported_quarter(
+    symbol: str, report_date: Union[date, datetime, str]
+) -> FiscalQuarter:
+    """Fiscal quarter an earnings report covers: the one before the quarter it is dated in."""
+    return FiscalQuarter.for_symbol_date(symbol, report_date) - 1
+
+
+def quarter_range(
+    start: FiscalQuarter, end: FiscalQuarter
+) -> List[FiscalQuarter]:
+    """Inclusive list of quarters from start to end (empty if end < start)."""
+    return [FiscalQuarter(i) for i in range(start.index, end.index + 1)]
+
+
+def current_quarter(
+    today: Optional[date] = None, fiscal_start: int = 1
+) -> FiscalQuarter:
+    """Quarter containing `today` (defaults to now)."""
+    return FiscalQuarter.from_date(today or datetime.now(), fiscal_start)
+
+
+def to_quarter_indices(quarter_strs: Iterable[str]) -> List[int]:
+    """Convert YYYYQX strings to ordinal ints for integer-keyed joins."""
+    return [FiscalQuarter.parse(q).index for q in quarter_strs]
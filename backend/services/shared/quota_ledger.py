@@ -0,0 +1,147 @@
+"""
+Cross-invocation API quota ledger in DynamoDB.
+
+Every call to a third-party API first takes one unit from two atomic counters
+for the API key, one per minute and one per day. Both increments run in a
+single transaction, each conditional on its counter staying under the limit,
+so any number of concurrent invocations together never exceed the provider's
+quota. A full minute window waits for the next minute; a full day raises
+QuotaExhaustedError so the caller can stop and resume later.
+
+Counter items (keyed by counter_key, expired by DynamoDB TTL on expires_at):
+    {provider}#{key_hash}#minute#{YYYYMMDDHHMM}   calls
+    {provider}#{key_hash}#day#{YYYYMMDD}          calls
+
+Limits default to the providers' free tiers and can be raised per environment
+with {PROVIDER}_CALLS_PER_MINUTE / {PROVIDER}_CALLS_PER_DAY, e.g.
+ALPHA_VANTAGE_CALLS_PER_MINUTE=75.
+"""
+
+import os
+import time
+import hashlib
+from datetime import datetime, timezone
+from typing import Dict, Any
+import boto3
+from botocore.exceptions import ClientError
+
+DEFAULT_LIMITS = {
+    "alpha_vantage": {"minute": 5, "day": 25},
+    "fmp": {"minute": 300, "day": 250},
+}
+
+# Counters outlive their window by a day so usage can be inspected afterwards
+COUNTER_RETENTION_SECONDS = 2 * 24 * 3600
+
+# DynamoDB clients reused across warm invocations
+_clients: Dict[str, Any] = {}
+
+
+class QuotaExhaustedError(Exception):
+    """The API key's daily quota is used up"""
+
+
+def quota_limits(provider: str) -> Dict[str, int]:
+    """Per-minute and per-day call limits for a provider, with env overrides"""
+    defaults = DEFAULT_LIMITS.get(provider, {"minute": 5, "day": 25})
+    prefix = provider.upper()
+    return {
+        "minute": int(os.environ.get(f"{prefix}_CALLS_PER_MINUTE", defaults["minute"])),
+        "day": int(os.environ.get(f"{prefix}_CALLS_PER_DAY", defaults["day"])),
+    }
+
+
+def key_fingerprint(api_key: str) -> str:
+    """Short hash identifying an API key without storing the key itself"""
+    return hashlib.sha256(api_key.encode("utf-8")).hexdigest()[:12]
+
+
+def counter_keys(provider: str, api_key: str, now: datetime) -> Dict[str, str]:
+    prefix = f"{provider}#{key_fingerprint(api_key)}"
+    return {
+        "minute": f"{prefix}#minute#{now.strftime('%Y%m%d%H%M')}",
+        "day": f"{prefix}#day#{now.strftime('%Y%m%d')}",
+    }
+
+
+def acquire_quota(
+    table_name: str,
+    provider: str,
+    api_key: str,
+    max_wait_seconds: float = 90,
+    region_name: str = "us-east-1",
+) -> Dict[str, Any]:
+    """
+    Take one call from the key's minute and day budgets, waiting for a free minute slot.
+
+    Args:
+        table_name: Quota ledger DynamoDB table
+        provider: "alpha_vantage" or "fmp"
+        api_key: API key the call will use
+        max_wait_seconds: Longest total wait for minute windows to roll over
+        region_name: AWS region
+
+    Returns:
+        dict: Counter keys charged and seconds spent waiting
+
+    Raises:
+        QuotaExhaustedError: When the daily quota is used up, or no minute
+            slot frees up within max_wait_seconds
+    """
+    if region_name not in _clients:
+        _clients[region_name] = boto3.client("dynamodb", region_name=region_name)
+    client = _clients[region_name]
+    limits = quota_limits(provider)
+    waited = 0.0
+
+    while True:
+        now = datetime.now(timezone.utc)
+        keys = counter_keys(provider, api_key, now)
+        expires_at = str(int(time.time()) + COUNTER_RETENTION_SECONDS)
+
+        try:
+            client.transact_write_items(
+                TransactItems=[
+                    {
+                        "Update": {
+                            "TableName": table_name,
+                            "Key": {"counter_key": {"S": keys[window]}},
+                            "UpdateExpression": "ADD calls :one SET expires_at = :expires",
+                            "ConditionExpression": "attribute_not_exists(calls) OR calls < :limit",
+                            "ExpressionAttributeValues": {
+                                ":one": {"N": "1"},
+                                ":limit": {"N": str(limits[window])},
+                                ":expires": {"N": expires_at},
+                            },
+                        }
+                    }
+                    for window in ("minute", "day")
+                ]
+            )
+            return {"counters": keys, "waited_seconds": round(waited, 2)}
+        except ClientError as e:
+            if e.response["Error"]["Code"] != "TransactionCanceledException":
+                raise
+            reasons = [
+                reason.get("Code") for reason in e.response.get("CancellationReasons", [])
+            ]
+
+        if len(reasons) > 1 and reasons[1] == "ConditionalCheckFailed":
+            raise QuotaExhaustedError(
+                f"{provider} daily quota of {limits['day']} calls is used up"
+            )
+
+        if reasons and reasons[0] == "ConditionalCheckFailed":
+            # Minute window full: sleep until the next one starts
+            delay = 60 - now.second - now.microsecond / 1_000_000 + 0.05
+            if waited + delay > max_wait_seconds:
+                raise QuotaExhaustedError(
+                    f"{provider} minute quota of {limits['minute']} calls stayed full "
+                    f"for {max_wait_seconds}s"
+                )
+        else:
+            # Transaction conflict with a concurrent caller; retry shortly
+            delay = 0.1
+
+        time.sleep(delay)
+        waited += delay
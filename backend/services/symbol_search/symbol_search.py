@@ -0,0 +1,294 @@
+"""
+Lambda function that serves typeahead symbol search for the frontend.
+Symbols come from the earnings calendar and transcripts tables, company names
+and exchanges from the FMP stock list, and are packed into a compact
+sorted-array artifact in S3, loaded once per warm container.
+"""
+
+import os
+import json
+import gzip
+from bisect import bisect_left
+from datetime import datetime
+from typing import List, Dict, Any, Optional
+import boto3
+from ..shared.quota_ledger import acquire_quota
+
+# AWS Configuration - these can be defaults
+AWS_REGION = os.environ.get("AWS_REGION", "us-east-1")
+PROJECT_NAME = os.environ.get("PROJECT_NAME", "earnings-sentiment")
+ENVIRONMENT = os.environ.get("ENVIRONMENT", "dev")
+
+SYMBOL_INDEX_KEY = "search/symbols.json.gz"
+STOCK_LIST_URL = "https://financialmodelingprep.com/stable/stock-list"
+
+DEFAULT_LIMIT = 10
+MAX_LIMIT = 50
+
+# Loaded once per warm container
+_symbol_index: Optional[Dict[str, Any]] = None
+_parameters: Dict[str, str] = {}
+
+
+# Always use Parameter Store (local and AWS)
+def get_parameter(parameter_name: str) -> str:
+    """Get parameter from AWS Systems Manager Parameter Store (cached per container)"""
+    if parameter_name in _parameters:
+        return _parameters[parameter_name]
+
+    try:
+        ssm = boto3.client("ssm", region_name=AWS_REGION)
+        response = ssm.get_parameter(Name=parameter_name, WithDecryption=True)
+        print(f"✅ Retrieved {parameter_name} from Parameter Store")
+        _parameters[parameter_name] = response["Parameter"]["Value"]
+        return _parameters[parameter_name]
+    except Exception as e:
+        print(f"❌ Error getting parameter {parameter_name}: {e}")
+        raise e
+
+
+def scan_symbols(table_name: str, symbol_attribute: str) -> set:
+    """Collect distinct symbols from a table, projecting only the key attribute"""
+    dynamodb = boto3.resource("dynamodb", region_name=AWS_REGION)
+    table = dynamodb.Table(table_name)
+
+    scan_kwargs = {
+        "ProjectionExpression": "#symbol",
+        "ExpressionAttributeNames": {"#symbol": symbol_attribute},
+    }
+    symbols = set()
+
+    while True:
+        response = table.scan(**scan_kwargs)
+        symbols.update(
+            item[symbol_attribute].upper()
+            for item in response["Items"]
+            if item.get(symbol_attribute)
+        )
+
+        if "LastEvaluatedKey" not in response:
+            break
+        scan_kwargs["ExclusiveStartKey"] = response["LastEvaluatedKey"]
+
+    return symbols
+
+
+def fetch_company_names(api_key: str, quota_table: str = None) -> Dict[str, Dict[str, str]]:
+    """
+    Company name and exchange per symbol from the FMP stock list (one API call).
+
+    Returns:
+        dict: {symbol: {"name": ..., "exchange": ...}}
+    """
+    # Imported here: only the rebuild path needs it, so it stays out of search cold starts
+    import requests
+
+    if quota_table:
+        acquire_quota(quota_table, "fmp", api_key, region_name=AWS_REGION)
+
+    response = requests.get(STOCK_LIST_URL, params={"apikey": api_key}, timeout=30)
+    response.raise_for_status()
+
+    companies = {}
+    for row in response.json():
+        symbol = (row.get("symbol") or "").upper()
+        name = row.get("companyName") or row.get("name") or ""
+        if symbol and name:
+            companies[symbol] = {
+                "name": name,
+                "exchange": row.get("exchangeShortName") or row.get("exchange") or "",
+            }
+
+    print(f"✅ Fetched {len(companies)} company names from FMP")
+    return companies
+
+
+def build_symbol_index(
+    symbols: set, companies: Dict[str, Dict[str, str]] = None
+) -> Dict[str, Any]:
+    """
+    Build the sorted-array index.
+
+    symbols is sorted for prefix search by bisect; name_keys holds
+    (lowercased name, symbol position) pairs sorted for name-prefix search.
+    """
+    companies = companies or {}
+    sorted_symbols = sorted(symbols)
+    symbol_names = [companies.get(symbol, {}).get("name", "") for symbol in sorted_symbols]
+    name_keys = sorted(
+        [name.lower(), position]
+        for position, name in enumerate(symbol_names)
+        if name
+    )
+
+    return {
+        "symbols": sorted_symbols,
+        "names": symbol_names,
+        "exchanges": [
+            companies.get(symbol, {}).get("exchange", "") for symbol in sorted_symbols
+        ],
+        "name_keys": name_keys,
+        "built_at": datetime.now().isoformat(),
+    }
+
+
+def publish_symbol_index(
+    bucket: str,
+    calendar_table: str,
+    transcripts_table: str,
+    fmp_api_key: str,
+    quota_table: str = None,
+) -> Dict[str, Any]:
+    """Rebuild the symbol index from DynamoDB and the FMP stock list and upload it to S3"""
+    s3_client = boto3.client("s3", region_name=AWS_REGION)
+
+    symbols = scan_symbols(calendar_table, "stock_symbol")
+    symbols |= scan_symbols(transcripts_table, "symbol")
+
+    try:
+        companies = fetch_company_names(fmp_api_key, quota_table)
+    except Exception as e:
+        # Keep the names from the previous artifact rather than publishing blanks
+        print(f"❌ Error fetching company names, reusing previous index names: {e}")
+        companies = {}
+        previous = load_symbol_index(bucket, force=True)
+        if previous:
+            exchanges = previous.get("exchanges") or [""] * len(previous["symbols"])
+            companies = {
+                symbol: {"name": name, "exchange": exchange}
+                for symbol, name, exchange in zip(previous["symbols"], previous["names"], exchanges)
+                if name
+            }
+
+    index = build_symbol_index(symbols, companies)
+    s3_client.put_object(
+        Bucket=bucket,
+        Key=SYMBOL_INDEX_KEY,
+        Body=gzip.compress(json.dumps(index, separators=(",", ":")).encode("utf-8")),
+        ContentType="application/json",
+        ContentEncoding="gzip",
+    )
+
+    print(f"✅ Published symbol index with {len(index['symbols'])} symbols")
+    return {"symbols": len(index["symbols"]), "key": SYMBOL_INDEX_KEY}
+
+
+def load_symbol_index(bucket: str, force: bool = False) -> Optional[Dict[str, Any]]:
+    """Load the symbol index artifact, once per container unless forced"""
+    global _symbol_index
+
+    if _symbol_index is not None and not force:
+        return _symbol_index
+
+    s3_client = boto3.client("s3", region_name=AWS_REGION)
+    try:
+        response = s3_client.get_object(Bucket=bucket, Key=SYMBOL_INDEX_KEY)
+        _symbol_index = json.loads(gzip.decompress(response["Body"].read()))
+        print(f"Loaded symbol index with {len(_symbol_index['symbols'])} symbols")
+    except Exception as e:
+        print(f"Error loading symbol index: {e}")
+        return None
+
+    return _symbol_index
+
+
+def search_symbols(index: Dict[str, Any], query: str, limit: int = 10) -> List[Dict[str, str]]:
+    """
+    Prefix search on symbols, then on company names.
+
+    Both are binary searches over sorted arrays: O(log n + limit).
+    """
+    query = query.strip()
+    if not query:
+        return []
+
+    symbols = index["symbols"]
+    names = index["names"]
+    exchanges = index.get("exchanges") or [""] * len(symbols)
+    results = []
+    seen = set()
+
+    symbol_prefix = query.upper()
+    position = bisect_left(symbols, symbol_prefix)
+    while (
+        position < len(symbols)
+        and len(results) < limit
+        and symbols[position].startswith(symbol_prefix)
+    ):
+        results.append(position)
+        seen.add(position)
+        position += 1
+
+    name_keys = index["name_keys"]
+    name_prefix = query.lower()
+    position = bisect_left(name_keys, [name_prefix, -1])
+    while (
+        position < len(name_keys)
+        and len(results) < limit
+        and name_keys[position][0].startswith(name_prefix)
+    ):
+        symbol_position = name_keys[position][1]
+        if symbol_position not in seen:
+            results.append(symbol_position)
+            seen.add(symbol_position)
+        position += 1
+
+    return [
+        {"symbol": symbols[position], "name": names[position], "exchange": exchanges[position]}
+        for position in results
+    ]
+
+
+def api_response(status_code: int, body: Dict[str, Any]) -> Dict[str, Any]:
+    """API Gateway proxy response with CORS headers"""
+    return {
+        "statusCode": status_code,
+        "headers": {
+            "Content-Type": "application/json",
+            "Access-Control-Allow-Origin": "*",
+            "Cache-Control": "public, max-age=300",
+        },
+        "body": json.dumps(body),
+    }
+
+
+def lambda_handler(event, context):
+    """
+    Serve GET /search?q=AA, or rebuild the index with {"mode": "build"}.
+    """
+    print(f"Request ID: {context.aws_request_id}")
+
+    try:
+        bucket = get_parameter(f"/{PROJECT_NAME}/{ENVIRONMENT}/earnings-data-bucket")
+
+        if event.get("mode") == "build":
+            result = publish_symbol_index(
+                bucket,
+                get_parameter(f"/{PROJECT_NAME}/{ENVIRONMENT}/earnings-calendar-table"),
+                get_parameter(f"/{PROJECT_NAME}/{ENVIRONMENT}/earnings-transcripts-table"),
+                get_parameter(f"/{PROJECT_NAME}/{ENVIRONMENT}/fmp-api-key"),
+                get_parameter(f"/{PROJECT_NAME}/{ENVIRONMENT}/api-quota-table"),
+            )
+            load_symbol_index(bucket, force=True)
+            return {"statusCode": 200, "body": json.dumps(result)}
+
+        params = event.get("queryStringParameters") or {}
+        query = params.get("q", "")
+        try:
+            limit = max(1, min(int(params.get("limit") or DEFAULT_LIMIT), MAX_LIMIT))
+        except (TypeError, ValueError):
+            return api_response(
+                400, {"success": False, "error": "limit must be an integer"}
+            )
+
+        index = load_symbol_index(bucket)
+        if index is None:
+            return api_response(503, {"success": False, "error": "Symbol index unavailable"})
+
+        return api_response(
+            200, {"success": True, "data": search_symbols(index, query, limit)}
+        )
+
+    except Exception as e:
+        print(f"Error in lambda_handler: {e}")
+        return api_response(500, {"success": False, "error": str(e)})
@@ -0,0 +1,312 @@
+"""
+Walk-forward backtest of sentiment-to-return signals.
+Joins per-(symbol, quarter) sentiment features from the DuckDB snapshot with
+forward returns, fits the signal on a rolling window of past quarters, and
+simulates a quantile portfolio on each following quarter. The panel is held as
+dense quarter x symbol arrays so every step is vectorized across symbols, and
+parameter grids run in a process pool.
+
+The returns file (CSV or Parquet) needs columns symbol, quarter (YYYYQX) and
+forward_return: the return from that quarter's earnings call to the next one.
+
+Usage:
+    python -m src.analytics.backtest --db analytics.duckdb --returns returns.csv \
+        --signals level change zscore --train-quarters 4 8 --quantiles 0.2 0.3 \
+        --out backtest_results.csv
+"""
+
+import csv
+import math
+import argparse
+import itertools
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Any, Optional
+import duckdb
+import numpy as np
+
+from services.shared.quarters import FiscalQuarter
+
+SIGNALS = ["level", "change", "zscore"]
+QUARTERS_PER_YEAR = 4
+
+# Panel shared with pool workers, set once per process by the initializer
+_worker_panel: Optional[Dict[str, Any]] = None
+
+
+def load_panel(db_path: str, returns_path: str) -> Dict[str, Any]:
+    """
+    Build dense quarter x symbol arrays of sentiment and forward return.
+
+    Args:
+        db_path: DuckDB snapshot file (see src.analytics.snapshot)
+        returns_path: CSV or Parquet file of forward returns
+
+    Returns:
+        dict with symbols, quarters (integer indices), sentiment and
+        forward_return arrays of shape (quarters, symbols), NaN where missing
+    """
+    reader = "read_parquet" if returns_path.endswith(".parquet") else "read_csv_auto"
+    con = duckdb.connect(db_path, read_only=True)
+    try:
+        features = con.execute(
+            """
+            SELECT symbol, CAST(quarter_index AS INTEGER), avg_sentiment
+            FROM earnings_transcripts
+            WHERE quarter_index IS NOT NULL
+            """
+        ).fetchall()
+        returns_rows = con.execute(
+            f"SELECT upper(symbol), quarter, forward_return FROM {reader}(?)",
+            [returns_path],
+        ).fetchall()
+    finally:
+        con.close()
+
+    # Join on the integer quarter_index stored with each transcript
+    returns = {
+        (symbol, FiscalQuarter.parse(quarter).index): forward_return
+        for symbol, quarter, forward_return in returns_rows
+    }
+    rows = [
+        (symbol, quarter_index, avg_sentiment, returns.get((symbol, quarter_index)))
+        for symbol, quarter_index, avg_sentiment in features
+    ]
+
+    if not rows:
+        raise ValueError("No transcript features in snapshot")
+
+    symbols = sorted({row[0] for row in rows})
+    first_quarter = min(row[1] for row in rows)
+    last_quarter = max(row[1] for row in rows)
+    symbol_position = {symbol: position for position, symbol in enumerate(symbols)}
+
+    shape = (last_quarter - first_quarter + 1, len(symbols))
+    sentiment = np.full(shape, np.nan)
+    forward_return = np.full(shape, np.nan)
+
+    for symbol, quarter_index, avg_sentiment, fwd in rows:
+        cell = (quarter_index - first_quarter, symbol_position[symbol])
+        sentiment[cell] = avg_sentiment if avg_sentiment is not None else np.nan
+        forward_return[cell] = fwd if fwd is not None else np.nan
+
+    print(f"✅ Loaded panel: {shape[0]} quarters x {shape[1]} symbols")
+
+    return {
+        "symbols": symbols,
+        "quarters": list(range(first_quarter, last_quarter + 1)),
+        "sentiment": sentiment,
+        "forward_return": forward_return,
+    }
+
+
+def build_signal(sentiment: np.ndarray, signal: str) -> np.ndarray:
+    """Signal matrix of the same shape as sentiment"""
+    if signal == "level":
+        return sentiment
+    if signal == "change":
+        change = np.full_like(sentiment, np.nan)
+        change[1:] = sentiment[1:] - sentiment[:-1]
+        return change
+    if signal == "zscore":
+        with np.errstate(invalid="ignore", divide="ignore"):
+            mean = np.nanmean(sentiment, axis=1, keepdims=True)
+            std = np.nanstd(sentiment, axis=1, keepdims=True)
+            return np.where(std > 0, (sentiment - mean) / std, np.nan)
+    raise ValueError(f"Unknown signal: {signal}")
+
+
+def rank(values: np.ndarray) -> np.ndarray:
+    """Ordinal ranks of a 1-D array"""
+    ranks = np.empty(len(values))
+    ranks[np.argsort(values, kind="stable")] = np.arange(len(values))
+    return ranks
+
+
+def walk_forward(
+    panel: Dict[str, Any],
+    signal: str = "level",
+    train_quarters: int = 8,
+    quantile: float = 0.2,
+    long_short: bool = True,
+    cost_bps: float = 10.0,
+    min_observations: int = 20,
+) -> Dict[str, Any]:
+    """
+    Rolling fit on the previous `train_quarters` quarters, trade the next one.
+
+    Each test quarter fits forward_return = alpha + beta * signal on the
+    training window, ranks symbols by predicted return, and holds the top
+    quantile long (and bottom quantile short) for one quarter.
+
+    Returns:
+        dict with per-quarter rows and summary metrics
+    """
+    x_all = build_signal(panel["sentiment"], signal)
+    y_all = panel["forward_return"]
+    weights_prev = np.zeros(x_all.shape[1])
+    periods = []
+
+    for t in range(train_quarters, x_all.shape[0]):
+        x_train = x_all[t - train_quarters : t].ravel()
+        y_train = y_all[t - train_quarters : t].ravel()
+        train_mask = np.isfinite(x_train) & np.isfinite(y_train)
+        if train_mask.sum() < min_observations:
+            continue
+
+        x_train, y_train = x_train[train_mask], y_train[train_mask]
+        x_centered = x_train - x_train.mean()
+        variance = (x_centered**2).sum()
+        if variance == 0:
+            continue
+        beta = (x_centered * (y_train - y_train.mean())).sum() / variance
+        alpha = y_train.mean() - beta * x_train.mean()
+
+        prediction = alpha + beta * x_all[t]
+        valid = np.isfinite(prediction) & np.isfinite(y_all[t])
+        count = int(valid.sum())
+        if count < 2:
+            continue
+
+        positions = np.flatnonzero(valid)
+        ordered = positions[np.argsort(prediction[valid], kind="stable")]
+        bucket = max(1, int(count * quantile))
+
+        weights = np.zeros_like(weights_prev)
+        if long_short:
+            weights[ordered[-bucket:]] = 0.5 / bucket
+            weights[ordered[:bucket]] = -0.5 / bucket
+        else:
+            weights[ordered[-bucket:]] = 1.0 / bucket
+
+        realized = np.nan_to_num(y_all[t])
+        gross = float(weights @ realized)
+        turnover = float(np.abs(weights - weights_prev).sum())
+        net = gross - turnover * cost_bps / 10_000
+
+        ic = float(np.corrcoef(rank(prediction[valid]), rank(y_all[t][valid]))[0, 1])
+
+        periods.append(
+            {
+                "quarter": str(FiscalQuarter(panel["quarters"][t])),
+                "beta": float(beta),
+                "symbols": count,
+                "gross_return": gross,
+                "net_return": net,
+                "turnover": turnover,
+                "ic": ic if math.isfinite(ic) else 0.0,
+            }
+        )
+        weights_prev = weights
+
+    return {"periods": periods, "summary": summarize(periods)}
+
+
+def summarize(periods: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Annualized performance metrics from per-quarter net returns"""
+    if not periods:
+        return {"periods": 0}
+
+    returns = np.array([period["net_return"] for period in periods])
+    equity = np.cumprod(1 + returns)
+    drawdown = equity / np.maximum.accumulate(equity) - 1
+    volatility = float(returns.std(ddof=1)) if len(returns) > 1 else 0.0
+
+    return {
+        "periods": len(returns),
+        "total_return": float(equity[-1] - 1),
+        "mean_return": float(returns.mean()),
+        "volatility": volatility,
+        "sharpe": (
+            float(returns.mean() / volatility * math.sqrt(QUARTERS_PER_YEAR))
+            if volatility > 0
+            else 0.0
+        ),
+        "hit_rate": float((returns > 0).mean()),
+        "max_drawdown": float(drawdown.min()),
+        "mean_ic": float(np.mean([period["ic"] for period in periods])),
+        "mean_turnover": float(np.mean([period["turnover"] for period in periods])),
+    }
+
+
+def parameter_grid(grid: Dict[str, List[Any]]) -> List[Dict[str, Any]]:
+    """Cartesian product of a {parameter: [values]} grid"""
+    names = list(grid)
+    return [dict(zip(names, values)) for values in itertools.product(*grid.values())]
+
+
+def _init_worker(panel: Dict[str, Any]):
+    global _worker_panel
+    _worker_panel = panel
+
+
+def _run_params(params: Dict[str, Any]) -> Dict[str, Any]:
+    return {**params, **walk_forward(_worker_panel, **params)["summary"]}
+
+
+def run_grid(
+    panel: Dict[str, Any], grid: Dict[str, List[Any]], workers: Optional[int] = None
+) -> List[Dict[str, Any]]:
+    """
+    Run walk_forward for every parameter combination in a process pool.
+
+    The panel is sent to each worker once, not once per combination.
+
+    Returns:
+        One summary row per combination, best Sharpe first
+    """
+    combinations = parameter_grid(grid)
+    with ProcessPoolExecutor(
+        max_workers=workers, initializer=_init_worker, initargs=(panel,)
+    ) as executor:
+        results = list(
+            executor.map(_run_params, combinations, chunksize=max(1, len(combinations) // 64))
+        )
+
+    print(f"✅ Ran {len(results)} backtests")
+    return sorted(results, key=lambda row: row.get("sharpe", 0.0), reverse=True)
+
+
+def write_results(results: List[Dict[str, Any]], path: str):
+    """Write grid results to CSV"""
+    columns = list(dict.fromkeys(column for row in results for column in row))
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.DictWriter(f, fieldnames=columns)
+        writer.writeheader()
+        writer.writerows(results)
+
+
+def main():
+    """Command line entry point for grid backtests"""
+    parser = argparse.ArgumentParser(description="Walk-forward sentiment backtest")
+    parser.add_argument("--db", default="analytics.duckdb")
+    parser.add_argument("--returns", required=True, help="CSV/Parquet of forward returns")
+    parser.add_argument("--signals", nargs="+", default=SIGNALS, choices=SIGNALS)
+    parser.add_argument("--train-quarters", nargs="+", type=int, default=[4, 8, 12])
+    parser.add_argument("--quantiles", nargs="+", type=float, default=[0.1, 0.2, 0.3])
+    parser.add_argument("--costs-bps", nargs="+", type=float, default=[10.0])
+    parser.add_argument("--long-only", action="store_true")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--out", default="backtest_results.csv")
+    args = parser.parse_args()
+
+    panel = load_panel(args.db, args.returns)
+    results = run_grid(
+        panel,
+        {
+            "signal": args.signals,
+            "train_quarters": args.train_quarters,
+            "quantile": args.quantiles,
+            "long_short": [not args.long_only],
+            "cost_bps": args.costs_bps,
+        },
+        args.workers,
+    )
+    write_results(results, args.out)
+
+    for row in results[:5]:
+        print(row)
+    print(f"Wrote {args.out}")
+
+
+if __name__ == "__main__":
+    main()
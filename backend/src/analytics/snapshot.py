@@ -0,0 +1,459 @@
+"""
+Local analytical snapshot of the DynamoDB tables.
+Pulls earnings_transcripts, earnings_cache and sentiment_results into a DuckDB
+file with parallel segmented Scans, refreshes incrementally on created_at,
+and serves analytics aggregations from the snapshot instead of DynamoDB.
+
+Usage:
+    python -m src.analytics.snapshot refresh --db analytics.duckdb
+    python -m src.analytics.snapshot export --db analytics.duckdb --parquet-dir snapshot/
+"""
+
+import os
+import json
+import argparse
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from decimal import Decimal
+from typing import Dict, List, Any, Optional
+import boto3
+import duckdb
+
+from services.shared.quarters import FiscalQuarter
+
+PROJECT_NAME = os.environ.get("PROJECT_NAME", "earnings-sentiment")
+ENVIRONMENT = os.environ.get("ENVIRONMENT", "dev")
+AWS_REGION = os.environ.get("AWS_REGION", "us-east-1")
+
+# Snapshot table -> DynamoDB table suffix, primary key, incremental watermark
+# column and declared column types. Attributes not declared here get their
+# inferred type, with every number widened to DOUBLE (see column_type).
+SNAPSHOT_TABLES = {
+    "earnings_transcripts": {
+        "dynamodb_suffix": "earnings-transcripts",
+        "keys": ["symbol", "quarter"],
+        "watermark": "created_at",
+        "columns": {
+            "symbol": "VARCHAR",
+            "quarter": "VARCHAR",
+            "quarter_index": "BIGINT",
+            "transcript_id": "VARCHAR",
+            "sector": "VARCHAR",
+            "s3_key": "VARCHAR",
+            "total_segments": "BIGINT",
+            "total_words": "BIGINT",
+            "avg_sentiment": "DOUBLE",
+            "speaker_count": "BIGINT",
+            "processed_for_training": "BOOLEAN",
+            "created_at": "VARCHAR",
+        },
+    },
+    "earnings_cache": {
+        "dynamodb_suffix": "earnings-cache",
+        "keys": ["stock_symbol", "earnings_date"],
+        "watermark": "created_at",
+        "columns": {
+            "stock_symbol": "VARCHAR",
+            "earnings_date": "VARCHAR",
+            "quarter_index": "BIGINT",
+            "eps_actual": "DOUBLE",
+            "eps_estimated": "DOUBLE",
+            "revenue_actual": "DOUBLE",
+            "revenue_estimated": "DOUBLE",
+            "item_version": "BIGINT",
+            "created_at": "VARCHAR",
+        },
+    },
+    "sentiment_results": {
+        "dynamodb_suffix": "sentiment-results",
+        "keys": ["result_id", "timestamp"],
+        "watermark": "timestamp",
+        "columns": {
+            "result_id": "VARCHAR",
+            "timestamp": "VARCHAR",
+        },
+    },
+}
+
+INTEGER_TYPES = {
+    "TINYINT", "SMALLINT", "INTEGER", "BIGINT", "HUGEINT",
+    "UTINYINT", "USMALLINT", "UINTEGER", "UBIGINT", "UHUGEINT",
+}
+
+
+def dynamodb_table_name(snapshot_table: str) -> str:
+    """Resolve the deployed DynamoDB table name for a snapshot table"""
+    suffix = SNAPSHOT_TABLES[snapshot_table]["dynamodb_suffix"]
+    return f"{PROJECT_NAME}-{suffix}-{ENVIRONMENT}"
+
+
+def to_plain(value):
+    """Convert DynamoDB values (Decimal, sets, lists, maps) to snapshot-friendly types."""
+    if isinstance(value, Decimal):
+        return float(value)
+    if isinstance(value, (list, set, dict)):
+        return json.dumps(value, default=str)
+    return value
+
+
+def scan_segment(
+    table_name: str,
+    segment: int,
+    total_segments: int,
+    watermark: Optional[str] = None,
+    since: Optional[str] = None,
+    region_name: str = AWS_REGION,
+) -> List[Dict[str, Any]]:
+    """
+    Scan one segment of a DynamoDB table.
+
+    Each worker uses its own boto3 session, since resources are not thread-safe.
+    """
+    session = boto3.session.Session()
+    table = session.resource("dynamodb", region_name=region_name).Table(table_name)
+
+    scan_kwargs = {"Segment": segment, "TotalSegments": total_segments}
+    if watermark and since:
+        scan_kwargs["FilterExpression"] = "#wm > :since"
+        scan_kwargs["ExpressionAttributeNames"] = {"#wm": watermark}
+        scan_kwargs["ExpressionAttributeValues"] = {":since": since}
+
+    items = []
+    while True:
+        response = table.scan(**scan_kwargs)
+        items.extend(
+            {key: to_plain(value) for key, value in item.items()}
+            for item in response["Items"]
+        )
+
+        if "LastEvaluatedKey" not in response:
+            break
+        scan_kwargs["ExclusiveStartKey"] = response["LastEvaluatedKey"]
+
+    return items
+
+
+def parallel_scan(
+    table_name: str,
+    total_segments: int = 8,
+    watermark: Optional[str] = None,
+    since: Optional[str] = None,
+    region_name: str = AWS_REGION,
+) -> List[Dict[str, Any]]:
+    """
+    Scan a whole table with `total_segments` parallel segment workers.
+
+    Args:
+        table_name: DynamoDB table name
+        total_segments: Number of parallel Scan segments
+        watermark: Attribute used for incremental filtering
+        since: Only return items whose watermark is greater than this value
+        region_name: AWS region
+
+    Returns:
+        List of items with plain Python values
+    """
+    with ThreadPoolExecutor(max_workers=total_segments) as executor:
+        futures = [
+            executor.submit(
+                scan_segment,
+                table_name,
+                segment,
+                total_segments,
+                watermark,
+                since,
+                region_name,
+            )
+            for segment in range(total_segments)
+        ]
+        items = []
+        for future in futures:
+            items.extend(future.result())
+
+    return items
+
+
+def connect(db_path: str):
+    """Open the snapshot database and make sure the state table exists"""
+    con = duckdb.connect(db_path)
+    con.execute(
+        """
+        CREATE TABLE IF NOT EXISTS _snapshot_state (
+            table_name VARCHAR PRIMARY KEY,
+            watermark VARCHAR,
+            refreshed_at VARCHAR,
+            row_count BIGINT
+        )
+        """
+    )
+    return con
+
+
+def get_watermark(con, snapshot_table: str) -> Optional[str]:
+    """Get the highest watermark value already loaded for a table"""
+    row = con.execute(
+        "SELECT watermark FROM _snapshot_state WHERE table_name = ?",
+        [snapshot_table],
+    ).fetchone()
+    return row[0] if row else None
+
+
+def column_type(inferred: str) -> str:
+    """
+    Snapshot type of an undeclared attribute from its inferred type.
+
+    Numbers are widened to DOUBLE, so a first batch that happens to hold only
+    whole numbers cannot make a column integer and truncate later fractions.
+    Date-like strings stay VARCHAR, exactly as stored in DynamoDB.
+    """
+    if inferred in INTEGER_TYPES or inferred in ("FLOAT", "DOUBLE") or inferred.startswith("DECIMAL"):
+        return "DOUBLE"
+    if inferred.startswith(("DATE", "TIME")):
+        return "VARCHAR"
+    return inferred
+
+
+def upsert_items(con, snapshot_table: str, items: List[Dict[str, Any]]) -> int:
+    """
+    Upsert scanned items into the snapshot table by primary key.
+
+    Items are staged as newline-delimited JSON and read back with explicit
+    column types: declared columns keep their declared type, and any other
+    attribute gets its inferred type via column_type.
+    """
+    if not items:
+        return 0
+
+    config = SNAPSHOT_TABLES[snapshot_table]
+    key_list = ", ".join(f'"{key}"' for key in config["keys"])
+
+    with tempfile.NamedTemporaryFile(
+        "w", suffix=".ndjson", delete=False, encoding="utf-8"
+    ) as staging:
+        for item in items:
+            staging.write(json.dumps(item, default=str) + "\n")
+        staging_path = staging.name
+
+    try:
+        inferred = con.execute(
+            f"DESCRIBE SELECT * FROM read_json_auto('{staging_path}', format='newline_delimited')"
+        ).fetchall()
+        columns = dict(config["columns"])
+        for column, inferred_type, *_ in inferred:
+            columns.setdefault(column, column_type(inferred_type))
+
+        con.execute(
+            f"CREATE TABLE IF NOT EXISTS {snapshot_table} ("
+            + ", ".join(f'"{column}" {type_}' for column, type_ in config["columns"].items())
+            + ")"
+        )
+
+        # Add attributes that appeared since the table was created. Columns an
+        # older snapshot created with another type move to the declared type
+        # (or from integer to DOUBLE); otherwise the batch is read as the table
+        # column's type.
+        existing = {
+            row[0]: row[1] for row in con.execute(f"DESCRIBE {snapshot_table}").fetchall()
+        }
+        for column, type_ in columns.items():
+            if column not in existing:
+                con.execute(f'ALTER TABLE {snapshot_table} ADD COLUMN "{column}" {type_}')
+            elif existing[column] == type_:
+                continue
+            elif column in config["columns"] or (
+                existing[column] in INTEGER_TYPES and type_ == "DOUBLE"
+            ):
+                con.execute(f'ALTER TABLE {snapshot_table} ALTER COLUMN "{column}" TYPE {type_}')
+            else:
+                columns[column] = existing[column]
+
+        typed_columns = ", ".join(f"'{column}': '{type_}'" for column, type_ in columns.items())
+        source = (
+            f"read_json('{staging_path}', format='newline_delimited', "
+            f"columns={{{typed_columns}}})"
+        )
+
+        con.execute(
+            f"DELETE FROM {snapshot_table} WHERE ({key_list}) IN (SELECT {key_list} FROM {source})"
+        )
+        con.execute(f"INSERT INTO {snapshot_table} BY NAME SELECT * FROM {source}")
+    finally:
+        os.remove(staging_path)
+
+    return len(items)
+
+
+def add_quarter_index(items: List[Dict[str, Any]]):
+    """Fill quarter_index on transcript items stored before it was recorded at ingest"""
+    for item in items:
+        if item.get("quarter_index") is None and item.get("quarter"):
+            try:
+                item["quarter_index"] = FiscalQuarter.parse(item["quarter"]).index
+            except ValueError:
+                pass
+
+
+def refresh_table(
+    con, snapshot_table: str, total_segments: int = 8, full: bool = False
+) -> Dict[str, Any]:
+    """
+    Refresh one snapshot table, incrementally unless `full` is set.
+
+    Returns:
+        dict: Refresh summary
+    """
+    config = SNAPSHOT_TABLES[snapshot_table]
+    table_name = dynamodb_table_name(snapshot_table)
+    since = None if full else get_watermark(con, snapshot_table)
+
+    print(f"Scanning {table_name} ({total_segments} segments, since={since})...")
+    items = parallel_scan(table_name, total_segments, config["watermark"], since)
+    if snapshot_table == "earnings_transcripts":
+        add_quarter_index(items)
+    loaded = upsert_items(con, snapshot_table, items)
+
+    watermarks = [item[config["watermark"]] for item in items if item.get(config["watermark"])]
+    new_watermark = max(watermarks + ([since] if since else []), default=None)
+    tables = {row[0] for row in con.execute("SHOW TABLES").fetchall()}
+    row_count = (
+        con.execute(f"SELECT count(*) FROM {snapshot_table}").fetchone()[0]
+        if snapshot_table in tables
+        else 0
+    )
+
+    con.execute(
+        "INSERT OR REPLACE INTO _snapshot_state VALUES (?, ?, ?, ?)",
+        [snapshot_table, new_watermark, datetime.now().isoformat(), row_count],
+    )
+
+    print(f"✅ Loaded {loaded} items into {snapshot_table} ({row_count} rows total)")
+
+    return {
+        "table": snapshot_table,
+        "items_loaded": loaded,
+        "row_count": row_count,
+        "watermark": new_watermark,
+    }
+
+
+def refresh_snapshot(
+    db_path: str, total_segments: int = 8, full: bool = False
+) -> List[Dict[str, Any]]:
+    """Refresh every snapshot table"""
+    con = connect(db_path)
+    try:
+        return [
+            refresh_table(con, snapshot_table, total_segments, full)
+            for snapshot_table in SNAPSHOT_TABLES
+        ]
+    finally:
+        con.close()
+
+
+def export_parquet(db_path: str, parquet_dir: str) -> List[str]:
+    """Write each snapshot table to a Parquet file"""
+    os.makedirs(parquet_dir, exist_ok=True)
+    con = connect(db_path)
+    written = []
+
+    try:
+        tables = {row[0] for row in con.execute("SHOW TABLES").fetchall()}
+        for snapshot_table in SNAPSHOT_TABLES:
+            if snapshot_table not in tables:
+                continue
+            path = os.path.join(parquet_dir, f"{snapshot_table}.parquet")
+            con.execute(f"COPY {snapshot_table} TO '{path}' (FORMAT PARQUET)")
+            written.append(path)
+    finally:
+        con.close()
+
+    return written
+
+
+# Query helpers for the analytics page
+def query(db_path: str, sql: str, params: Optional[list] = None) -> List[Dict[str, Any]]:
+    """Run a read-only query against the snapshot and return rows as dicts"""
+    con = duckdb.connect(db_path, read_only=True)
+    try:
+        cursor = con.execute(sql, params or [])
+        columns = [column[0] for column in cursor.description]
+        return [dict(zip(columns, row)) for row in cursor.fetchall()]
+    finally:
+        con.close()
+
+
+def sentiment_trends(db_path: str, symbols: Optional[List[str]] = None) -> List[Dict[str, Any]]:
+    """Average transcript sentiment per quarter, optionally for a set of symbols"""
+    sql = """
+        SELECT quarter,
+               avg(avg_sentiment) AS avg_sentiment,
+               count(DISTINCT symbol) AS stock_count,
+               sum(total_words) AS total_words
+        FROM earnings_transcripts
+    """
+    params = []
+    if symbols:
+        sql += f" WHERE symbol IN ({', '.join('?' for _ in symbols)})"
+        params = list(symbols)
+    sql += " GROUP BY quarter ORDER BY quarter"
+    return query(db_path, sql, params)
+
+
+def symbol_sentiment_summary(db_path: str) -> List[Dict[str, Any]]:
+    """Per-symbol sentiment summary across all stored quarters"""
+    return query(
+        db_path,
+        """
+        SELECT symbol,
+               count(*) AS quarters,
+               avg(avg_sentiment) AS avg_sentiment,
+               min(quarter) AS first_quarter,
+               max(quarter) AS last_quarter
+        FROM earnings_transcripts
+        GROUP BY symbol
+        ORDER BY symbol
+        """,
+    )
+
+
+def earnings_surprise_summary(db_path: str) -> List[Dict[str, Any]]:
+    """EPS beat rate and average surprise per symbol from the calendar table"""
+    return query(
+        db_path,
+        """
+        SELECT stock_symbol,
+               count(*) AS reports,
+               avg(CASE WHEN eps_actual > eps_estimated THEN 1 ELSE 0 END) AS beat_rate,
+               avg(eps_actual - eps_estimated) AS avg_eps_surprise
+        FROM earnings_cache
+        WHERE eps_actual IS NOT NULL
+          AND eps_estimated IS NOT NULL
+          -- item_version < 2 rows stored 0 for values not reported yet
+          AND (coalesce(item_version, 1) >= 2 OR (eps_actual <> 0 AND eps_estimated <> 0))
+        GROUP BY stock_symbol
+        ORDER BY stock_symbol
+        """,
+    )
+
+
+def main():
+    """Command line entry point for refreshing and exporting the snapshot"""
+    parser = argparse.ArgumentParser(description="DynamoDB analytical snapshot")
+    parser.add_argument("command", choices=["refresh", "export"])
+    parser.add_argument("--db", default="analytics.duckdb")
+    parser.add_argument("--segments", type=int, default=8)
+    parser.add_argument("--full", action="store_true", help="Ignore watermarks")
+    parser.add_argument("--parquet-dir", default="snapshot")
+    args = parser.parse_args()
+
+    if args.command == "refresh":
+        for summary in refresh_snapshot(args.db, args.segments, args.full):
+            print(summary)
+    else:
+        for path in export_parquet(args.db, args.parquet_dir):
+            print(f"Wrote {path}")
+
+
+if __name__ == "__main__":
+    main()
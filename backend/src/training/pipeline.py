@@ -0,0 +1,320 @@
+"""
+Incremental training data pipeline.
+Selects transcripts whose metadata still has processed_for_training = false,
+streams them from S3 through feature extraction, appends the rows as gzipped
+JSON Lines shards partitioned by quarter, and only then flips the flag with
+conditional transactional updates. Each run touches only new or re-ingested
+transcripts (re-ingesting resets the flag) instead of the whole corpus.
+
+Dataset layout in the earnings data bucket:
+    training/features/quarter={YYYYQX}/part-{run_id}-{NNNN}.jsonl.gz
+
+Usage:
+    python -m src.training.pipeline --shard-rows 500
+    python -m src.training.pipeline --quarters 2024Q3 2024Q4
+"""
+
+import os
+import gzip
+import json
+import argparse
+from datetime import datetime
+from statistics import mean, pstdev
+from typing import Dict, List, Any, Iterator, Optional
+import boto3
+from botocore.exceptions import ClientError
+
+from services.alpha_vantage.speaker_roles import build_role_index, segment_roles
+
+PROJECT_NAME = os.environ.get("PROJECT_NAME", "earnings-sentiment")
+ENVIRONMENT = os.environ.get("ENVIRONMENT", "dev")
+AWS_REGION = os.environ.get("AWS_REGION", "us-east-1")
+
+DATASET_PREFIX = "training/features"
+FEATURE_VERSION = 2
+
+# DynamoDB transactions accept up to 100 actions; stay well below
+TRANSACTION_SIZE = 25
+
+
+def get_parameter(parameter_name: str) -> str:
+    """Get parameter from AWS Systems Manager Parameter Store"""
+    ssm = boto3.client("ssm", region_name=AWS_REGION)
+    response = ssm.get_parameter(Name=parameter_name, WithDecryption=True)
+    return response["Parameter"]["Value"]
+
+
+def iter_pending_transcripts(
+    table, quarters: Optional[List[str]] = None
+) -> Iterator[Dict[str, Any]]:
+    """
+    Yield metadata items not yet processed for training.
+
+    With quarters, reads them through quarter-index instead of scanning the table.
+    """
+    projection = {
+        "ProjectionExpression": (
+            "#symbol, #quarter, transcript_id, s3_bucket, s3_key, created_at, role_index"
+        ),
+        "FilterExpression": "processed_for_training = :false",
+        "ExpressionAttributeNames": {"#symbol": "symbol", "#quarter": "quarter"},
+        "ExpressionAttributeValues": {":false": False},
+    }
+
+    requests = (
+        [
+            {
+                "IndexName": "quarter-index",
+                "KeyConditionExpression": "#quarter = :quarter",
+                **projection,
+                "ExpressionAttributeValues": {":false": False, ":quarter": quarter},
+            }
+            for quarter in quarters
+        ]
+        if quarters
+        else [projection]
+    )
+
+    for request in requests:
+        operation = table.query if "KeyConditionExpression" in request else table.scan
+        while True:
+            response = operation(**request)
+            yield from response["Items"]
+
+            if "LastEvaluatedKey" not in response:
+                break
+            request["ExclusiveStartKey"] = response["LastEvaluatedKey"]
+
+
+def extract_features(item: Dict[str, Any], transcript: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    One training row per transcript.
+
+    Args:
+        item: Transcript metadata item
+        transcript: Full Alpha Vantage transcript stored in S3
+
+    Returns:
+        dict: Feature row keyed by symbol and quarter
+    """
+    segments = transcript.get("transcript", [])
+    sentiments = [float(segment.get("sentiment") or 0) for segment in segments]
+    words = [len(segment.get("content", "").split()) for segment in segments]
+
+    # Roles come from the index stored at ingest; older items are classified here
+    role_index = item.get("role_index")
+    if not role_index or len(role_index.get("roles", "")) != len(segments):
+        role_index = build_role_index(segments)
+
+    by_group: Dict[str, List[float]] = {}
+    for tag, sentiment in zip(segment_roles(role_index), sentiments):
+        by_group.setdefault(tag["role"], []).append(sentiment)
+        by_group.setdefault(f"{tag['role']}_{tag['phase']}", []).append(sentiment)
+
+    def group_mean(group: str) -> float:
+        return mean(by_group[group]) if by_group.get(group) else 0.0
+
+    total_words = sum(words)
+    weighted_sentiment = (
+        sum(s * w for s, w in zip(sentiments, words)) / total_words if total_words else 0.0
+    )
+
+    return {
+        "transcript_id": item.get("transcript_id", ""),
+        "symbol": item["symbol"],
+        "quarter": item["quarter"],
+        "feature_version": FEATURE_VERSION,
+        "segments": len(segments),
+        "total_words": total_words,
+        "speaker_count": len({segment.get("speaker", "") for segment in segments}),
+        "avg_sentiment": mean(sentiments) if sentiments else 0.0,
+        "word_weighted_sentiment": weighted_sentiment,
+        "sentiment_std": pstdev(sentiments) if len(sentiments) > 1 else 0.0,
+        "min_sentiment": min(sentiments, default=0.0),
+        "max_sentiment": max(sentiments, default=0.0),
+        "positive_share": (
+            sum(1 for s in sentiments if s > 0.1) / len(sentiments) if sentiments else 0.0
+        ),
+        "negative_share": (
+            sum(1 for s in sentiments if s < -0.1) / len(sentiments) if sentiments else 0.0
+        ),
+        "executive_sentiment": group_mean("executive"),
+        "analyst_sentiment": group_mean("analyst"),
+        "executive_prepared_sentiment": group_mean("executive_prepared"),
+        "executive_qa_sentiment": group_mean("executive_qa"),
+        "analyst_qa_sentiment": group_mean("analyst_qa"),
+        "qa_share": (
+            1 - int(role_index["qa_start"]) / len(segments) if segments else 0.0
+        ),
+        "source_created_at": item.get("created_at", ""),
+    }
+
+
+def write_shard(
+    s3_client, bucket: str, quarter: str, run_id: str, part: int, rows: List[Dict[str, Any]]
+) -> str:
+    """Write one gzipped JSON Lines shard and return its key"""
+    key = f"{DATASET_PREFIX}/quarter={quarter}/part-{run_id}-{part:04d}.jsonl.gz"
+    body = "\n".join(json.dumps(row, default=str) for row in rows) + "\n"
+    s3_client.put_object(
+        Bucket=bucket,
+        Key=key,
+        Body=gzip.compress(body.encode("utf-8")),
+        ContentType="application/x-ndjson",
+        ContentEncoding="gzip",
+        Metadata={"rows": str(len(rows)), "feature_version": str(FEATURE_VERSION)},
+    )
+    return key
+
+
+def mark_processed(table, items: List[Dict[str, Any]], shard_key: str) -> int:
+    """
+    Flip processed_for_training on items whose rows are in shard_key.
+
+    Updates are conditional on the flag still being false and on the item
+    still holding the transcript_id that was processed, so a concurrent run,
+    an item deleted meanwhile or a transcript re-ingested since it was read is
+    never marked. A cancelled transaction falls back to per-item conditional
+    updates.
+
+    Returns:
+        int: Number of items marked
+    """
+    client = table.meta.client
+    processed_at = datetime.now().isoformat()
+    marked = 0
+
+    def update(item):
+        values = {
+            ":true": True,
+            ":false": False,
+            ":shard": shard_key,
+            ":processed_at": processed_at,
+        }
+        if item.get("transcript_id"):
+            condition = "processed_for_training = :false AND transcript_id = :tid"
+            values[":tid"] = item["transcript_id"]
+        else:
+            condition = "processed_for_training = :false AND attribute_not_exists(transcript_id)"
+
+        return {
+            "TableName": table.name,
+            "Key": {"symbol": item["symbol"], "quarter": item["quarter"]},
+            "UpdateExpression": (
+                "SET processed_for_training = :true, training_shard = :shard, "
+                "training_processed_at = :processed_at"
+            ),
+            "ConditionExpression": condition,
+            "ExpressionAttributeValues": values,
+        }
+
+    for start in range(0, len(items), TRANSACTION_SIZE):
+        batch = items[start : start + TRANSACTION_SIZE]
+        try:
+            client.transact_write_items(
+                TransactItems=[{"Update": update(item)} for item in batch]
+            )
+            marked += len(batch)
+        except ClientError as e:
+            if e.response["Error"]["Code"] != "TransactionCanceledException":
+                raise
+            for item in batch:
+                try:
+                    client.update_item(**update(item))
+                    marked += 1
+                except ClientError as item_error:
+                    if item_error.response["Error"]["Code"] != "ConditionalCheckFailedException":
+                        raise
+
+    return marked
+
+
+def run_pipeline(
+    table_name: str,
+    bucket: str,
+    quarters: Optional[List[str]] = None,
+    shard_rows: int = 500,
+    dry_run: bool = False,
+) -> Dict[str, Any]:
+    """
+    Process every pending transcript into the sharded training dataset.
+
+    Rows are buffered per quarter; a full buffer is written as a shard and
+    its source items are marked right after, so an interrupted run resumes
+    where it stopped.
+
+    Args:
+        table_name: Earnings transcripts table
+        bucket: Earnings data bucket holding transcripts and the dataset
+        quarters: Restrict to these quarters (YYYYQX)
+        shard_rows: Rows per shard
+        dry_run: Extract features without writing shards or flags
+
+    Returns:
+        dict: Run summary
+    """
+    dynamodb = boto3.resource("dynamodb", region_name=AWS_REGION)
+    table = dynamodb.Table(table_name)
+    s3_client = boto3.client("s3", region_name=AWS_REGION)
+
+    run_id = datetime.now().strftime("%Y%m%dT%H%M%S")
+    buffers: Dict[str, List[Any]] = {}
+    parts: Dict[str, int] = {}
+    summary = {"run_id": run_id, "processed": 0, "marked": 0, "failed": 0, "shards": []}
+
+    def flush(quarter: str):
+        pending = buffers.pop(quarter, [])
+        if not pending or dry_run:
+            return
+        rows = [row for row, _ in pending]
+        part = parts.get(quarter, 0)
+        parts[quarter] = part + 1
+
+        key = write_shard(s3_client, bucket, quarter, run_id, part, rows)
+        summary["marked"] += mark_processed(table, [item for _, item in pending], key)
+        summary["shards"].append(key)
+        print(f"✅ Wrote {len(rows)} rows to s3://{bucket}/{key}")
+
+    for item in iter_pending_transcripts(table, quarters):
+        try:
+            response = s3_client.get_object(
+                Bucket=item.get("s3_bucket", bucket), Key=item["s3_key"]
+            )
+            row = extract_features(item, json.loads(response["Body"].read()))
+        except Exception as e:
+            print(f"❌ Error extracting features for {item['symbol']} {item['quarter']}: {e}")
+            summary["failed"] += 1
+            continue
+
+        buffers.setdefault(item["quarter"], []).append((row, item))
+        summary["processed"] += 1
+        if len(buffers[item["quarter"]]) >= shard_rows:
+            flush(item["quarter"])
+
+    for quarter in list(buffers):
+        flush(quarter)
+
+    print(
+        f"✅ Training pipeline {run_id}: {summary['processed']} processed, "
+        f"{summary['marked']} marked, {summary['failed']} failed"
+    )
+    return summary
+
+
+def main():
+    """Command line entry point for the incremental training pipeline"""
+    parser = argparse.ArgumentParser(description="Incremental training data pipeline")
+    parser.add_argument("--table", default=f"{PROJECT_NAME}-earnings-transcripts-{ENVIRONMENT}")
+    parser.add_argument("--bucket", default=None, help="Defaults to the earnings-data-bucket parameter")
+    parser.add_argument("--quarters", nargs="+", default=None)
+    parser.add_argument("--shard-rows", type=int, default=500)
+    parser.add_argument("--dry-run", action="store_true")
+    args = parser.parse_args()
+
+    bucket = args.bucket or get_parameter(f"/{PROJECT_NAME}/{ENVIRONMENT}/earnings-data-bucket")
+    summary = run_pipeline(args.table, bucket, args.quarters, args.shard_rows, args.dry_run)
+    print(json.dumps(summary, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""Tests for backfill checkpoint done/retry rules."""
+
+import pytest
+from botocore.exceptions import ClientError
+
+from services.alpha_vantage import backfill_checkpoints as checkpoints
+from services.alpha_vantage.backfill_checkpoints import DONE, FAILED, RATE_LIMITED
+
+
+def test_stored_quarter_is_done():
+    assert checkpoints.quarter_outcome(True, None, {"success": True}) == DONE
+
+
+def test_duplicate_skip_is_done():
+    assert checkpoints.quarter_outcome(True, None, {"success": True, "skipped": True}) == DONE
+
+
+def test_empty_transcript_is_done():
+    storage_result = {"success": False, "no_transcript": True, "message": "No transcript segments found"}
+    assert checkpoints.quarter_outcome(True, None, storage_result) == DONE
+
+
+def test_response_without_transcript_is_done():
+    assert checkpoints.quarter_outcome(False, None, None) == DONE
+
+
+def test_storage_failure_is_retried():
+    assert checkpoints.quarter_outcome(True, None, {"success": False, "error": "S3 down"}) == FAILED
+
+
+def test_failed_request_is_retried():
+    assert checkpoints.quarter_outcome(False, "request failed", None) == FAILED
+
+
+def test_rate_limit_notice_stops_the_run():
+    outcome = checkpoints.quarter_outcome(
+        False, "Thank you for using Alpha Vantage! ...", None, rate_limited=True
+    )
+    assert outcome == RATE_LIMITED
+
+
+def test_pending_quarters_skips_completed_and_exhausted():
+    checkpoint = {
+        "completed": {"2024Q1"},
+        "failed": {
+            "2024Q2": {"attempts": checkpoints.MAX_ATTEMPTS - 1},
+            "2024Q3": {"attempts": checkpoints.MAX_ATTEMPTS},
+        },
+    }
+    quarters = ["2024Q1", "2024Q2", "2024Q3", "2024Q4"]
+    assert checkpoints.pending_quarters(checkpoint, quarters) == ["2024Q2", "2024Q4"]
+
+
+class FakeTable:
+    """update_item stub enforcing the lease_owner condition."""
+
+    def __init__(self, lease_owner):
+        self.lease_owner = lease_owner
+        self.updates = []
+
+    def update_item(self, **kwargs):
+        if kwargs["ExpressionAttributeValues"][":owner"] != self.lease_owner:
+            raise ClientError(
+                {"Error": {"Code": "ConditionalCheckFailedException", "Message": ""}},
+                "UpdateItem",
+            )
+        self.updates.append(kwargs)
+        return {"Attributes": {"job_id": kwargs["Key"]["job_id"], "failed": {}}}
+
+    def delete_item(self, **kwargs):
+        raise AssertionError("restart must not delete the checkpoint")
+
+
+def test_reset_requires_the_lease():
+    table = FakeTable(lease_owner="other-invocation")
+    with pytest.raises(checkpoints.CheckpointLeaseError):
+        checkpoints.reset_checkpoint(table, "IBM#2024Q1#current", "this-invocation")
+
+
+def test_reset_clears_progress_under_the_lease():
+    table = FakeTable(lease_owner="this-invocation")
+    checkpoint = checkpoints.reset_checkpoint(table, "IBM#2024Q1#current", "this-invocation")
+
+    update = table.updates[0]
+    assert update["ConditionExpression"] == "lease_owner = :owner"
+    assert "REMOVE completed" in update["UpdateExpression"]
+    assert checkpoint["failed"] == {}
@@ -0,0 +1,73 @@
+"""Tests for the weekly calendar snapshot reader."""
+
+import io
+import json
+
+import pytest
+from botocore.exceptions import ClientError
+
+from services.fmp import calendar_snapshot
+
+
+class FakeS3:
+    """get_object stub that answers a conditional GET with 304 Not Modified."""
+
+    class exceptions:
+        class NoSuchKey(Exception):
+            pass
+
+    def __init__(self, error_code="304", status=304):
+        self.error_code = error_code
+        self.status = status
+        self.calls = []
+
+    def get_object(self, **kwargs):
+        self.calls.append(kwargs)
+        if "IfNoneMatch" in kwargs:
+            raise ClientError(
+                {
+                    "Error": {"Code": self.error_code, "Message": "Not Modified"},
+                    "ResponseMetadata": {"HTTPStatusCode": self.status},
+                },
+                "GetObject",
+            )
+        body = json.dumps({"events": [{"symbol": "IBM", "date": "2024-04-24"}]})
+        return {"Body": io.BytesIO(body.encode("utf-8")), "ETag": '"v1"'}
+
+
+@pytest.fixture(autouse=True)
+def empty_cache(monkeypatch):
+    monkeypatch.setattr(calendar_snapshot, "_week_cache", {})
+
+
+def expire(key):
+    fetched_at, etag, events = calendar_snapshot._week_cache[key]
+    calendar_snapshot._week_cache[key] = (fetched_at - calendar_snapshot.CACHE_SECONDS, etag, events)
+
+
+def test_not_modified_reuses_cached_events():
+    s3 = FakeS3()
+    first = calendar_snapshot.load_week(s3, "bucket", "calendar/weeks/2024-W17.json")
+    expire("calendar/weeks/2024-W17.json")
+
+    second = calendar_snapshot.load_week(s3, "bucket", "calendar/weeks/2024-W17.json")
+
+    assert s3.calls[-1]["IfNoneMatch"] == '"v1"'
+    assert second == first
+
+
+def test_other_client_errors_are_raised():
+    s3 = FakeS3(error_code="AccessDenied", status=403)
+    calendar_snapshot.load_week(s3, "bucket", "calendar/weeks/2024-W17.json")
+    expire("calendar/weeks/2024-W17.json")
+
+    with pytest.raises(ClientError):
+        calendar_snapshot.load_week(s3, "bucket", "calendar/weeks/2024-W17.json")
+
+
+def test_reported_quarter_uses_fiscal_years():
+    assert calendar_snapshot.reported_quarter("IBM", "2024-04-24") == "Q1 2024"
+    assert calendar_snapshot.reported_quarter("IBM", "2024-01-24") == "Q4 2023"
+    # AAPL's fiscal year starts in October
+    assert calendar_snapshot.reported_quarter("AAPL", "2024-05-02") == "Q2 2024"
+    assert calendar_snapshot.reported_quarter("AAPL", "2024-10-31") == "Q4 2024"
@@ -0,0 +1,102 @@
+"""Tests for the sharded corpus export."""
+
+import gzip
+import io
+import json
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+from services.alpha_vantage import corpus_export
+from services.alpha_vantage.corpus_export import compact_corpus_quarter, corpus_manifest_key
+
+
+class NoSuchKey(Exception):
+    pass
+
+
+class FakeS3:
+    exceptions = SimpleNamespace(NoSuchKey=NoSuchKey)
+
+    def __init__(self):
+        self.objects = {}
+
+    def put_object(self, Bucket, Key, Body, **kwargs):
+        self.objects[Key] = Body.encode("utf-8") if isinstance(Body, str) else Body
+
+    def get_object(self, Bucket, Key):
+        if Key not in self.objects:
+            raise NoSuchKey(Key)
+        return {"Body": io.BytesIO(self.objects[Key])}
+
+    def delete_objects(self, Bucket, Delete):
+        for obj in Delete["Objects"]:
+            self.objects.pop(obj["Key"], None)
+
+    def manifest(self, quarter):
+        return json.loads(self.objects[corpus_manifest_key(quarter)])
+
+
+class FakeTable:
+    def __init__(self, items):
+        self.items = items
+
+    def query(self, **kwargs):
+        return {"Items": self.items}
+
+
+class Clock:
+    """Stand-in for datetime giving every rebuild its own run id."""
+
+    current = datetime(2024, 10, 1)
+
+    @classmethod
+    def now(cls):
+        cls.current += timedelta(seconds=1)
+        return cls.current
+
+
+def store(s3, symbol, sentiment):
+    key = f"transcripts/{symbol}/2024Q3/transcript.json"
+    transcript = {"transcript": [{"speaker": "Jane", "content": "Remarks.", "sentiment": sentiment}]}
+    s3.put_object(Bucket="bucket", Key=key, Body=json.dumps(transcript))
+    return {"symbol": symbol, "quarter": "2024Q3", "transcript_id": f"{symbol}_{sentiment}", "s3_key": key}
+
+
+def rebuild(s3, monkeypatch, sentiment):
+    monkeypatch.setattr(corpus_export, "datetime", Clock)
+    table = FakeTable([store(s3, "IBM", sentiment), store(s3, "MSFT", sentiment)])
+    compact_corpus_quarter(s3, table, "bucket", "2024Q3")
+    return s3.manifest("2024Q3")
+
+
+def read_rows(s3, manifest):
+    return [
+        json.loads(line)
+        for shard in manifest["shards"]
+        for line in gzip.decompress(s3.objects[shard["key"]]).splitlines()
+    ]
+
+
+def test_rebuild_keeps_the_replaced_shards_for_one_generation(monkeypatch):
+    s3 = FakeS3()
+
+    first = rebuild(s3, monkeypatch, "0.1")
+    assert [row["symbol"] for row in read_rows(s3, first)] == ["IBM", "MSFT"]
+
+    second = rebuild(s3, monkeypatch, "0.2")
+    # A reader that fetched the first manifest can still read its shards
+    assert [row["sentiment"] for row in read_rows(s3, first)] == [0.1, 0.1]
+    assert second["previous_shards"] == [shard["key"] for shard in first["shards"]]
+
+    third = rebuild(s3, monkeypatch, "0.3")
+    assert all(shard["key"] not in s3.objects for shard in first["shards"])
+    assert [row["sentiment"] for row in read_rows(s3, second)] == [0.2, 0.2]
+    assert [row["sentiment"] for row in read_rows(s3, third)] == [0.3, 0.3]
+
+
+def test_unchanged_quarter_is_skipped(monkeypatch):
+    s3 = FakeS3()
+    rebuild(s3, monkeypatch, "0.1")
+
+    table = FakeTable([store(s3, "IBM", "0.1"), store(s3, "MSFT", "0.1")])
+    assert compact_corpus_quarter(s3, table, "bucket", "2024Q3")["skipped"] is True
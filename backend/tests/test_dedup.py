@@ -0,0 +1,104 @@
+"""Tests for duplicate and re-issued transcript detection."""
+
+import random
+
+import pytest
+
+from services.alpha_vantage.dedup import content_hash, find_duplicate
+from services.alpha_vantage.fingerprints import build_fingerprints
+
+WORDS = (
+    "revenue margin growth guidance cloud demand pricing inventory supply chain "
+    "customers backlog software services hardware consulting operating cash flow "
+    "capital returns dividend buyback europe asia americas currency headwinds"
+).split()
+
+
+def make_segments(seed: int, words: int = 600):
+    rng = random.Random(seed)
+    content = " ".join(rng.choice(WORDS) for _ in range(words))
+    return [
+        {"speaker": "Jane Doe", "title": "Chief Financial Officer", "content": content},
+    ]
+
+
+def edited(segments, changed_words: int):
+    """Copy of segments with the last few words replaced (a small re-issue edit)"""
+    words = segments[0]["content"].split()
+    words[-changed_words:] = ["restated"] * changed_words
+    return [{**segments[0], "content": " ".join(words)}]
+
+
+class FakeTable:
+    def __init__(self, items):
+        self.items = items
+
+    def get_item(self, Key, **kwargs):
+        item = self.items.get((Key["symbol"], Key["quarter"]))
+        return {"Item": item} if item else {}
+
+
+def stored(segments, quarter):
+    return {
+        "quarter": quarter,
+        "transcript_id": f"IBM_{quarter}_stored",
+        "s3_key": f"transcripts/IBM/{quarter}.json",
+        "content_hash": content_hash(segments),
+        "fingerprints": build_fingerprints(segments),
+    }
+
+
+@pytest.fixture
+def call():
+    return make_segments(seed=7)
+
+
+def check(table, segments, quarter="2024Q2"):
+    return find_duplicate(
+        table, "IBM", quarter, content_hash(segments), build_fingerprints(segments)
+    )
+
+
+def test_identical_same_quarter_is_skipped(call):
+    table = FakeTable({("IBM", "2024Q2"): stored(call, "2024Q2")})
+    duplicate = check(table, call)
+    assert duplicate["match"] == "identical"
+    assert duplicate["quarter"] == "2024Q2"
+
+
+def test_whitespace_and_case_changes_are_identical(call):
+    table = FakeTable({("IBM", "2024Q2"): stored(call, "2024Q2")})
+    reformatted = [{**call[0], "content": "  " + call[0]["content"].upper() + "\n"}]
+    assert check(table, reformatted)["match"] == "identical"
+
+
+def test_near_duplicate_same_quarter_overwrites(call):
+    table = FakeTable({("IBM", "2024Q2"): stored(call, "2024Q2")})
+    assert check(table, edited(call, 5)) is None
+
+
+def test_near_duplicate_adjacent_quarter_is_skipped(call):
+    table = FakeTable({("IBM", "2024Q1"): stored(call, "2024Q1")})
+    duplicate = check(table, edited(call, 5))
+    assert duplicate["match"] == "near_duplicate"
+    assert duplicate["quarter"] == "2024Q1"
+    assert duplicate["similarity"] >= 0.9
+
+
+def test_different_call_in_adjacent_quarter_is_not_a_duplicate(call):
+    table = FakeTable({("IBM", "2024Q3"): stored(make_segments(seed=8), "2024Q3")})
+    assert check(table, call) is None
+
+
+def test_threshold_bounds_near_duplicates(call):
+    table = FakeTable({("IBM", "2024Q1"): stored(call, "2024Q1")})
+    heavily_edited = edited(call, 300)
+    assert check(table, heavily_edited) is None
+    assert find_duplicate(
+        table,
+        "IBM",
+        "2024Q2",
+        content_hash(heavily_edited),
+        build_fingerprints(heavily_edited),
+        threshold=0.0,
+    )["match"] == "near_duplicate"
@@ -0,0 +1,148 @@
+"""Tests for earnings surprise, beat-rate and estimate-revision enrichment."""
+
+from decimal import Decimal
+from types import SimpleNamespace
+
+import pytest
+
+from services.fmp import enrichment
+from services.fmp.fmp import convert_to_nullable_decimal
+
+
+class FakeClient:
+    """Low-level client stub serving stored calendar rows by (symbol, date)."""
+
+    def __init__(self, rows):
+        self.rows = rows
+        self.queries = []
+
+    def query(self, TableName, ExpressionAttributeValues, Limit, **kwargs):
+        self.queries.append(ExpressionAttributeValues[":symbol"])
+        symbol = ExpressionAttributeValues[":symbol"]
+        before = ExpressionAttributeValues[":before"]
+        items = sorted(
+            (row for (row_symbol, date), row in self.rows.items() if row_symbol == symbol and date < before),
+            key=lambda row: row["earnings_date"],
+            reverse=True,
+        )
+        return {"Items": items[:Limit]}
+
+    def batch_get_item(self, RequestItems):
+        table_name, request = next(iter(RequestItems.items()))
+        found = [
+            self.rows[(key["stock_symbol"], key["earnings_date"])]
+            for key in request["Keys"]
+            if (key["stock_symbol"], key["earnings_date"]) in self.rows
+        ]
+        return {"Responses": {table_name: found}}
+
+
+def fake_table(rows):
+    stored = {
+        (row["stock_symbol"], row["earnings_date"]): {"item_version": 2, **row} for row in rows
+    }
+    client = FakeClient(stored)
+    table = SimpleNamespace(name="earnings-cache", meta=SimpleNamespace(client=client))
+
+    def shared_resource_query(**kwargs):
+        raise AssertionError("history must be queried through the thread-safe client")
+
+    table.query = shared_resource_query
+    return table
+
+
+def reported(symbol, date, actual, estimate):
+    return {
+        "stock_symbol": symbol,
+        "earnings_date": date,
+        "eps_actual": Decimal(str(actual)),
+        "eps_estimated": Decimal(str(estimate)),
+    }
+
+
+def test_surprise_absolute_and_percent_of_abs_estimate():
+    assert enrichment.surprise(1.2, 1.0) == pytest.approx((0.2, 20.0))
+    assert enrichment.surprise(-0.5, -1.0) == pytest.approx((0.5, 50.0))
+    assert enrichment.surprise(0.1, 0.0) == (0.1, None)
+    assert enrichment.surprise(None, 1.0) == (None, None)
+
+
+def test_beat_rate_windows():
+    beats = [True, False, True, True, False, True, True, True, False]
+    assert enrichment.beat_rate(beats, 4) == 0.75
+    assert enrichment.beat_rate(beats, 8) == 5 / 8
+    assert enrichment.beat_rate([], 4) is None
+
+
+def test_stored_zero_is_a_value_on_current_rows():
+    assert enrichment.stored_value({"eps_actual": Decimal("0"), "item_version": 2}, "eps_actual") == 0.0
+    assert enrichment.stored_value({"eps_actual": None, "item_version": 2}, "eps_actual") is None
+
+
+def test_stored_zero_is_missing_on_legacy_rows():
+    assert enrichment.stored_value({"eps_actual": Decimal("0")}, "eps_actual") is None
+    assert enrichment.stored_value({"eps_actual": Decimal("0.5")}, "eps_actual") == 0.5
+
+
+def test_unreported_values_are_stored_as_null():
+    assert convert_to_nullable_decimal(None) is None
+    assert convert_to_nullable_decimal("") is None
+    assert convert_to_nullable_decimal("n/a") is None
+    assert convert_to_nullable_decimal(0) == Decimal("0")
+    assert convert_to_nullable_decimal(1.25) == Decimal("1.25")
+
+
+def test_enrich_calendar_beat_rates_from_history():
+    history = [
+        reported("IBM", "2023-01-25", 1.0, 0.9),   # beat
+        reported("IBM", "2023-04-19", 0.8, 0.9),   # miss
+        reported("IBM", "2023-07-19", 0.0, -0.1),  # beat with a real 0 actual
+        reported("IBM", "2023-10-25", 1.1, 1.0),   # beat
+        reported("IBM", "2024-01-24", 1.0, 1.0),   # in line: not a beat
+    ]
+    table = fake_table(history)
+    fetched = [
+        {"symbol": "IBM", "date": "2024-04-24", "epsActual": 1.68, "epsEstimated": 1.6},
+        {"symbol": "IBM", "date": "2024-07-24", "epsActual": None, "epsEstimated": 2.2},
+    ]
+
+    derived = enrichment.enrich_calendar(fetched, table, window_start="2024-04-01")
+
+    latest = derived[("IBM", "2024-04-24")]
+    assert latest["eps_surprise"] == pytest.approx(0.08)
+    assert latest["eps_surprise_pct"] == pytest.approx(5.0)
+    assert latest["eps_beat"] is True
+    # Last 4: beat (0.0 vs -0.1), beat, in line, this quarter's beat
+    assert latest["beat_rate_4q"] == 0.75
+    # All 6 reported: beat, miss, beat, beat, in line, beat
+    assert latest["beat_rate_8q"] == pytest.approx(4 / 6)
+    assert latest["reported_quarters"] == 6
+
+    upcoming = derived[("IBM", "2024-07-24")]
+    assert "eps_surprise" not in upcoming
+    assert upcoming["beat_rate_4q"] == 0.75
+    assert table.meta.client.queries == ["IBM"]
+
+
+def test_estimate_revision_keeps_a_zero_initial_estimate():
+    table = fake_table(
+        [
+            {
+                "stock_symbol": "XYZ",
+                "earnings_date": "2024-05-01",
+                "eps_estimated": Decimal("0"),
+                "eps_estimate_initial": Decimal("0"),
+            }
+        ]
+    )
+    fetched = [{"symbol": "XYZ", "date": "2024-05-01", "epsActual": None, "epsEstimated": 0.05}]
+
+    derived = enrichment.enrich_calendar(fetched, table, window_start="2024-04-01")[("XYZ", "2024-05-01")]
+
+    assert derived["eps_estimate_initial"] == 0.0
+    assert derived["eps_estimate_revision"] == pytest.approx(0.05)
+
+
+def test_calendar_rows_outlive_the_beat_rate_history():
+    # beat_rate_8q needs HISTORY_QUARTERS reported quarters still stored
+    assert enrichment.CALENDAR_TTL_DAYS >= enrichment.HISTORY_QUARTERS * 92
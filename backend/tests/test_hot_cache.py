@@ -0,0 +1,46 @@
+"""Tests for prewarming the hot transcript cache."""
+
+import io
+import json
+import threading
+
+from services.alpha_vantage import alpha_vantage
+from services.alpha_vantage.hot_cache import hot_cache
+from services.shared.quarters import FiscalQuarter
+
+
+class FakeS3:
+    def __init__(self):
+        self.keys = []
+        self._lock = threading.Lock()
+
+    def get_object(self, Bucket, Key):
+        with self._lock:
+            self.keys.append(Key)
+        body = json.dumps({"transcript": [{"content": "Remarks."}]})
+        return {"Body": io.BytesIO(body.encode("utf-8"))}
+
+
+def test_prewarm_shares_one_client_and_starts_at_the_reported_quarter(monkeypatch):
+    s3 = FakeS3()
+    created = []
+
+    def get_s3_client(region_name="us-east-1"):
+        created.append(threading.current_thread().name)
+        return s3
+
+    monkeypatch.setattr(alpha_vantage, "get_s3_client", get_s3_client)
+    monkeypatch.setattr(alpha_vantage, "current_quarter", lambda: FiscalQuarter.parse("2024Q3"))
+    hot_cache.clear()
+
+    loaded = alpha_vantage.prewarm_hot_symbols("bucket", ["AAPL", "MSFT"], quarters_back=2)
+
+    assert loaded == 4
+    assert created == [threading.current_thread().name]
+    assert sorted(s3.keys) == [
+        "transcripts/AAPL/2024Q1/transcript.json",
+        "transcripts/AAPL/2024Q2/transcript.json",
+        "transcripts/MSFT/2024Q1/transcript.json",
+        "transcripts/MSFT/2024Q2/transcript.json",
+    ]
+    assert hot_cache.get(("s3", "bucket", "AAPL", "2024Q2")) is not None
@@ -0,0 +1,81 @@
+"""Tests for fiscal-quarter arithmetic."""
+
+from datetime import date
+
+import pytest
+
+from services.shared.quarters import (
+    FiscalQuarter,
+    current_quarter,
+    quarter_range,
+    reported_quarter,
+    to_quarter_indices,
+)
+
+
+def test_parse_round_trips_and_rejects_bad_input():
+    quarter = FiscalQuarter.parse("2024Q3")
+    assert (quarter.year, quarter.quarter, quarter.index) == (2024, 3, 2024 * 4 + 2)
+    assert str(quarter) == "2024Q3"
+
+    for bad in ("", "2024", "2024Q5", "2024Q0"):
+        with pytest.raises(ValueError):
+            FiscalQuarter.parse(bad)
+
+
+def test_offsets_cross_year_boundaries():
+    quarter = FiscalQuarter.parse("2024Q1")
+    assert str(quarter - 1) == "2023Q4"
+    assert str(quarter + 4) == "2025Q1"
+    assert str(quarter - 5) == "2022Q4"
+    assert FiscalQuarter.parse("2025Q2") - quarter == 5
+    assert FiscalQuarter.parse("2023Q4") < quarter
+
+
+def test_range_and_indices():
+    start, end = FiscalQuarter.parse("2023Q3"), FiscalQuarter.parse("2024Q2")
+    assert [str(q) for q in quarter_range(start, end)] == ["2023Q3", "2023Q4", "2024Q1", "2024Q2"]
+    assert quarter_range(end, start) == []
+    assert to_quarter_indices(["2023Q4", "2024Q1"]) == [start.index + 1, start.index + 2]
+
+
+def test_calendar_year_quarters():
+    assert str(current_quarter(date(2024, 1, 1))) == "2024Q1"
+    assert str(current_quarter(date(2024, 12, 31))) == "2024Q4"
+    assert str(FiscalQuarter.for_symbol_date("IBM", "2024-04-24")) == "2024Q2"
+
+
+@pytest.mark.parametrize(
+    "symbol, value, expected",
+    [
+        # Apple: fiscal year starts in October
+        ("AAPL", "2023-10-01", "2024Q1"),
+        ("AAPL", "2023-12-31", "2024Q1"),
+        ("AAPL", "2024-01-01", "2024Q2"),
+        ("AAPL", "2024-09-30", "2024Q4"),
+        # Microsoft: fiscal year starts in July
+        ("MSFT", "2023-07-01", "2024Q1"),
+        ("MSFT", "2024-04-25", "2024Q4"),
+        ("MSFT", "2024-06-30", "2024Q4"),
+        # Nvidia: fiscal year starts in February
+        ("NVDA", "2024-01-31", "2024Q4"),
+        ("NVDA", "2024-02-01", "2025Q1"),
+        ("NVDA", "2024-08-28", "2025Q3"),
+    ],
+)
+def test_for_symbol_date_uses_fiscal_year_start(symbol, value, expected):
+    assert str(FiscalQuarter.for_symbol_date(symbol, value)) == expected
+    assert str(FiscalQuarter.for_symbol_date(symbol.lower(), value)) == expected
+
+
+@pytest.mark.parametrize(
+    "symbol, report_date, expected",
+    [
+        ("AAPL", "2024-02-01", "2024Q1"),
+        ("MSFT", "2024-04-25", "2024Q3"),
+        ("NVDA", "2024-05-22", "2025Q1"),
+        ("IBM", "2024-01-24", "2023Q4"),
+    ],
+)
+def test_reported_quarter_is_the_one_before_the_report(symbol, report_date, expected):
+    assert str(reported_quarter(symbol, report_date)) == expected
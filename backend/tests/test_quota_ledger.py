@@ -0,0 +1,92 @@
+"""Tests for the cross-invocation API quota ledger."""
+
+import pytest
+from botocore.exceptions import ClientError
+
+from services.shared import quota_ledger
+from services.shared.quota_ledger import QuotaExhaustedError, acquire_quota
+
+
+def cancelled(minute_reason, day_reason):
+    error = ClientError(
+        {"Error": {"Code": "TransactionCanceledException", "Message": ""}},
+        "TransactWriteItems",
+    )
+    error.response["CancellationReasons"] = [{"Code": minute_reason}, {"Code": day_reason}]
+    return error
+
+
+class FakeClient:
+    """transact_write_items stub failing with the queued errors, then succeeding."""
+
+    def __init__(self, errors):
+        self.errors = list(errors)
+        self.calls = 0
+
+    def transact_write_items(self, TransactItems):
+        self.calls += 1
+        if self.errors:
+            raise self.errors.pop(0)
+        return {}
+
+
+@pytest.fixture
+def ledger(monkeypatch):
+    sleeps = []
+    monkeypatch.setattr(quota_ledger.time, "sleep", sleeps.append)
+
+    def use(errors):
+        client = FakeClient(errors)
+        monkeypatch.setitem(quota_ledger._clients, "us-east-1", client)
+        return client, sleeps
+
+    return use
+
+
+def test_full_minute_waits_for_the_next_window(ledger):
+    client, sleeps = ledger([cancelled("ConditionalCheckFailed", "None")])
+
+    result = acquire_quota("ledger", "alpha_vantage", "key")
+
+    assert client.calls == 2
+    assert len(sleeps) == 1 and 0 < sleeps[0] <= 60.05
+    assert result["waited_seconds"] == pytest.approx(sleeps[0], abs=0.01)
+
+
+def test_full_minute_gives_up_after_max_wait(ledger):
+    client, sleeps = ledger([cancelled("ConditionalCheckFailed", "None")] * 3)
+
+    with pytest.raises(QuotaExhaustedError, match="minute"):
+        acquire_quota("ledger", "alpha_vantage", "key", max_wait_seconds=0)
+    assert sleeps == []
+
+
+def test_full_day_raises_without_waiting(ledger):
+    client, sleeps = ledger([cancelled("None", "ConditionalCheckFailed")])
+
+    with pytest.raises(QuotaExhaustedError, match="daily"):
+        acquire_quota("ledger", "alpha_vantage", "key")
+    assert client.calls == 1
+    assert sleeps == []
+
+
+def test_transaction_conflict_retries_shortly(ledger):
+    client, sleeps = ledger(
+        [cancelled("TransactionConflict", "None"), cancelled("None", "TransactionConflict")]
+    )
+
+    acquire_quota("ledger", "fmp", "key")
+
+    assert client.calls == 3
+    assert sleeps == [0.1, 0.1]
+
+
+def test_other_errors_are_raised(ledger):
+    error = ClientError(
+        {"Error": {"Code": "ProvisionedThroughputExceededException", "Message": ""}},
+        "TransactWriteItems",
+    )
+    ledger([error])
+
+    with pytest.raises(ClientError):
+        acquire_quota("ledger", "fmp", "key")
@@ -0,0 +1,164 @@
+"""Tests for the versioned model artifact registry."""
+
+import hashlib
+import io
+import shutil
+
+import pytest
+from botocore.exceptions import ClientError
+
+from models import registry
+
+
+def client_error(code, operation):
+    return ClientError({"Error": {"Code": code, "Message": ""}}, operation)
+
+
+class FakeS3:
+    """In-memory bucket honouring If-Match / If-None-Match on put_object."""
+
+    def __init__(self):
+        self.objects = {}
+        self.uploads = []
+        self.downloads = []
+        self.before_put = None
+
+    def etag(self, key):
+        return '"%s"' % hashlib.md5(self.objects[key]).hexdigest()
+
+    def head_object(self, Bucket, Key):
+        if Key not in self.objects:
+            raise client_error("404", "HeadObject")
+        return {"ContentLength": len(self.objects[Key])}
+
+    def upload_file(self, path, Bucket, Key):
+        with open(path, "rb") as f:
+            self.objects[Key] = f.read()
+        self.uploads.append(Key)
+
+    def download_file(self, Bucket, Key, path):
+        self.downloads.append(Key)
+        with open(path, "wb") as f:
+            f.write(self.objects[Key])
+
+    def get_object(self, Bucket, Key):
+        if Key not in self.objects:
+            raise client_error("NoSuchKey", "GetObject")
+        return {"Body": io.BytesIO(self.objects[Key]), "ETag": self.etag(Key)}
+
+    def put_object(self, Bucket, Key, Body, IfMatch=None, IfNoneMatch=None, **kwargs):
+        if self.before_put:
+            before_put, self.before_put = self.before_put, None
+            before_put()
+        if IfNoneMatch == "*" and Key in self.objects:
+            raise client_error("PreconditionFailed", "PutObject")
+        if IfMatch is not None and (Key not in self.objects or self.etag(Key) != IfMatch):
+            raise client_error("PreconditionFailed", "PutObject")
+        self.objects[Key] = Body.encode("utf-8") if isinstance(Body, str) else Body
+        return {"ETag": self.etag(Key)}
+
+
+@pytest.fixture
+def s3(monkeypatch, tmp_path):
+    fake = FakeS3()
+    monkeypatch.setattr(registry.boto3, "client", lambda *args, **kwargs: fake)
+    monkeypatch.setattr(registry, "CACHE_DIR", str(tmp_path / "cache"))
+    monkeypatch.setattr(registry, "_manifests", {})
+    monkeypatch.setattr(registry, "_loaded", {})
+    return fake
+
+
+def artifact(tmp_path, name, content):
+    path = tmp_path / name
+    path.write_bytes(content)
+    return str(path)
+
+
+def test_publish_uploads_each_blob_once(s3, tmp_path):
+    weights = artifact(tmp_path, "weights.bin", b"weights-v1")
+    vocab = artifact(tmp_path, "vocab.json", b'{"a": 1}')
+
+    first = registry.publish_model("bucket", "head", {"weights": weights, "vocab": vocab})
+    second = registry.publish_model("bucket", "head", {"weights": weights, "vocab": vocab})
+
+    assert first["version"] == second["version"]
+    assert len(s3.uploads) == 2
+    manifest = registry.get_manifest("bucket", "head", refresh=True)
+    assert manifest["latest"] == first["version"]
+
+
+def test_publish_sets_latest_before_pruning(s3, tmp_path, monkeypatch):
+    monkeypatch.setattr(registry, "MAX_MANIFEST_VERSIONS", 2)
+    versions = [
+        registry.publish_model("bucket", "head", {"weights": artifact(tmp_path, f"w{i}", b"w%d" % i)})["version"]
+        for i in range(4)
+    ]
+
+    manifest = registry.get_manifest("bucket", "head", refresh=True)
+    assert manifest["latest"] == versions[-1]
+    assert set(manifest["versions"]) == set(versions[-2:])
+
+
+def test_concurrent_publish_retries_instead_of_overwriting(s3, tmp_path):
+    registry.publish_model("bucket", "head", {"weights": artifact(tmp_path, "w1", b"w1")})
+    other = {}
+
+    def publish_elsewhere():
+        other["entry"] = registry.publish_model(
+            "bucket", "head", {"weights": artifact(tmp_path, "w2", b"w2")}, set_latest=False
+        )
+
+    s3.before_put = publish_elsewhere
+    mine = registry.publish_model("bucket", "head", {"weights": artifact(tmp_path, "w3", b"w3")})
+
+    manifest = registry.get_manifest("bucket", "head", refresh=True)
+    assert other["entry"]["version"] in manifest["versions"]
+    assert manifest["latest"] == mine["version"]
+    assert len(manifest["versions"]) == 3
+
+
+def test_head_errors_other_than_not_found_are_raised(s3, tmp_path):
+    def forbidden(Bucket, Key):
+        raise client_error("403", "HeadObject")
+
+    s3.head_object = forbidden
+    with pytest.raises(ClientError):
+        registry.publish_model("bucket", "head", {"weights": artifact(tmp_path, "w", b"w")})
+    assert s3.uploads == []
+
+
+def test_resolve_latest_and_explicit_versions(s3, tmp_path):
+    v1 = registry.publish_model("bucket", "head", {"weights": artifact(tmp_path, "w1", b"w1")})
+    v2 = registry.publish_model("bucket", "head", {"weights": artifact(tmp_path, "w2", b"w2")})
+
+    assert registry.resolve_version("bucket", "head")["version"] == v2["version"]
+    assert registry.resolve_version("bucket", "head", v1["version"]) == v1
+    with pytest.raises(ValueError):
+        registry.resolve_version("bucket", "head", "missing")
+
+    registry.promote_version("bucket", "head", v1["version"])
+    assert registry.resolve_version("bucket", "head")["version"] == v1["version"]
+
+
+def test_load_model_downloads_once_per_hash(s3, tmp_path):
+    registry.publish_model("bucket", "head", {"weights": artifact(tmp_path, "w", b"weights")})
+    calls = []
+
+    def loader(path):
+        calls.append(path)
+        with open(path, "rb") as f:
+            return f.read()
+
+    assert registry.load_model("head", "weights", loader, bucket="bucket") == b"weights"
+    assert registry.load_model("head", "weights", loader, bucket="bucket") == b"weights"
+    assert len(calls) == 1
+
+    # A cold container with the blob still in /tmp does not download again
+    registry._loaded.clear()
+    registry.load_model("head", "weights", loader, bucket="bucket")
+    assert len(s3.downloads) == 1
+
+    shutil.rmtree(registry.CACHE_DIR)
+    registry._loaded.clear()
+    registry.load_model("head", "weights", loader, bucket="bucket")
+    assert len(s3.downloads) == 2
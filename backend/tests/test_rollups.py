@@ -0,0 +1,96 @@
+"""Tests for the sector/period sentiment rollups."""
+
+from decimal import Decimal
+
+import pytest
+
+from services.alpha_vantage import rollups
+
+
+class FakeRollupsTable:
+    """update_item stub recording the symbol-set action per rollup item."""
+
+    def __init__(self):
+        self.updates = {}
+
+    def update_item(self, Key, UpdateExpression, ExpressionAttributeValues):
+        action = "DELETE" if "DELETE symbols" in UpdateExpression else "ADD"
+        self.updates[(Key["rollup_id"], Key["period"])] = (
+            action,
+            ExpressionAttributeValues[":delta"],
+            ExpressionAttributeValues[":count"],
+        )
+
+
+class FakeTranscriptsTable:
+    def __init__(self, items):
+        self.items = items
+
+    def query(self, **kwargs):
+        return {"Items": self.items}
+
+
+class FakeDynamoDB:
+    def __init__(self, tables):
+        self.tables = tables
+
+    def Table(self, name):
+        return self.tables[name]
+
+
+def move_sector(monkeypatch, stored_quarters):
+    table = FakeRollupsTable()
+    dynamodb = FakeDynamoDB(
+        {"rollups": table, "transcripts": FakeTranscriptsTable(stored_quarters)}
+    )
+    monkeypatch.setattr(rollups.boto3, "resource", lambda *args, **kwargs: dynamodb)
+    rollups.update_sentiment_rollups(
+        "rollups",
+        "IBM",
+        "2024Q2",
+        0.4,
+        previous_sentiment=0.2,
+        sector="Consulting",
+        previous_sector="Technology",
+        transcripts_table_name="transcripts",
+    )
+    return table.updates
+
+
+def test_sector_move_keeps_symbol_while_other_quarters_remain(monkeypatch):
+    updates = move_sector(
+        monkeypatch,
+        [
+            {"quarter": "2024Q1", "sector": "Technology"},
+            {"quarter": "2024Q2", "sector": "Consulting"},
+        ],
+    )
+
+    assert updates[("SECTOR#Technology", "ALL")] == ("ADD", Decimal("-0.2"), -1)
+    assert updates[("SECTOR#Technology", "2024Q2")][0] == "DELETE"
+    assert updates[("SECTOR#Consulting", "ALL")] == ("ADD", Decimal("0.4"), 1)
+    assert updates[("ALL", "ALL")] == ("ADD", Decimal("0.2"), 0)
+
+
+def test_sector_move_of_last_quarter_leaves_old_sector(monkeypatch):
+    updates = move_sector(monkeypatch, [{"quarter": "2024Q2", "sector": "Consulting"}])
+
+    assert updates[("SECTOR#Technology", "ALL")][0] == "DELETE"
+    assert updates[("SECTOR#Technology", "2024Q2")][0] == "DELETE"
+
+
+def test_summarize_rollup_averages_per_transcript():
+    summary = rollups.summarize_rollup(
+        {
+            "rollup_id": "SECTOR#Technology",
+            "period": "ALL",
+            "sentiment_sum": Decimal("1.5"),
+            "transcript_count": 5,
+            "symbols": {"IBM", "MSFT"},
+        }
+    )
+
+    assert summary["sector"] == "Technology"
+    assert summary["stock_count"] == 2
+    assert summary["transcript_count"] == 5
+    assert summary["avg_sentiment"] == pytest.approx(0.3)
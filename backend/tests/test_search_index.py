@@ -0,0 +1,153 @@
+"""Tests for the full-text and speaker search index."""
+
+import hashlib
+import io
+from types import SimpleNamespace
+
+import pytest
+
+from services.alpha_vantage import search_index
+from services.alpha_vantage.search_index import (
+    SHARD_COUNT,
+    build_document,
+    compact_quarter,
+    doc_key,
+    index_transcript,
+    match_segments,
+    search_transcripts,
+    term_shard,
+    tokenize,
+)
+
+
+class NoSuchKey(Exception):
+    pass
+
+
+class FakeS3:
+    """In-memory bucket with the calls the search index makes."""
+
+    exceptions = SimpleNamespace(NoSuchKey=NoSuchKey)
+
+    def __init__(self):
+        self.objects = {}
+        self.puts = []
+
+    def etag(self, key):
+        return '"%s"' % hashlib.md5(self.objects[key]).hexdigest()
+
+    def put_object(self, Bucket, Key, Body, **kwargs):
+        self.objects[Key] = Body.encode("utf-8") if isinstance(Body, str) else Body
+        self.puts.append(Key)
+
+    def get_object(self, Bucket, Key):
+        if Key not in self.objects:
+            raise NoSuchKey(Key)
+        return {"Body": io.BytesIO(self.objects[Key])}
+
+    def head_object(self, Bucket, Key):
+        if Key not in self.objects:
+            raise NoSuchKey(Key)
+        return {"ETag": self.etag(Key)}
+
+    def get_paginator(self, name):
+        s3 = self
+
+        class Paginator:
+            def paginate(self, Bucket, Prefix):
+                contents = [
+                    {"Key": key, "ETag": s3.etag(key)}
+                    for key in sorted(s3.objects)
+                    if key.startswith(Prefix)
+                ]
+                return [{"Contents": contents}]
+
+        return Paginator()
+
+
+SEGMENTS = [
+    {"speaker": "Operator", "title": "", "content": "Welcome to the call."},
+    {"speaker": "Jane", "title": "Chief Executive Officer", "content": "We raised full-year guidance today."},
+    {"speaker": "Pat", "title": "Analyst, Morgan Stanley", "content": "Was the guidance cut in cloud a surprise?"},
+    {"speaker": "Jane", "title": "Chief Executive Officer", "content": "There was no guidance cut; demand held."},
+]
+
+
+@pytest.fixture
+def s3():
+    search_index._shard_cache.clear()
+    fake = FakeS3()
+    index_transcript(fake, "bucket", "IBM", "2024Q3", SEGMENTS)
+    return fake
+
+
+def test_tokenize_lowercases_and_keeps_contractions():
+    assert tokenize("Full-Year GUIDANCE isn't cut, 2024!") == [
+        "full", "year", "guidance", "isn't", "cut", "2024",
+    ]
+
+
+def test_term_shard_is_stable_and_in_range():
+    assert term_shard("guidance") == term_shard("guidance")
+    assert all(0 <= term_shard(term) < SHARD_COUNT for term in tokenize(SEGMENTS[2]["content"]))
+
+
+def test_document_postings_hold_segment_and_positions():
+    document = build_document("IBM", "2024Q3", SEGMENTS)
+    assert document["postings"]["guidance"] == [[1, 4], [2, 2], [3, 3]]
+    assert document["roles"] == "oeae"
+
+
+def test_phrase_match_requires_consecutive_terms():
+    postings = build_document("IBM", "2024Q3", SEGMENTS)["postings"]
+    terms = tokenize("guidance cut")
+    wrapped = {term: {"IBM/2024Q3": postings[term]} for term in terms}
+
+    assert match_segments(terms, wrapped, phrase=True) == {"IBM/2024Q3": [2, 3]}
+    assert match_segments(tokenize("cut guidance"), wrapped, phrase=True) == {}
+    assert match_segments(tokenize("cut guidance"), wrapped, phrase=False) == {"IBM/2024Q3": [2, 3]}
+
+
+def test_search_reads_uncompacted_doc_files(s3):
+    matches = search_transcripts(s3, "bucket", "guidance cut", ["2024Q3"])
+    assert [(m["segment_index"], m["speaker"]) for m in matches] == [(2, "Pat"), (3, "Jane")]
+
+    executive = search_transcripts(s3, "bucket", "guidance cut", ["2024Q3"], role="executive")
+    assert [m["segment_index"] for m in executive] == [3]
+    assert search_transcripts(s3, "bucket", "guidance", ["2024Q3"], speaker="chief")[0]["title"] == (
+        "Chief Executive Officer"
+    )
+
+
+def test_compaction_preserves_results_and_skips_when_unchanged(s3):
+    before = search_transcripts(s3, "bucket", "guidance cut", ["2024Q3"])
+
+    result = compact_quarter(s3, "bucket", "2024Q3")
+    assert result["documents"] == 1
+    assert search_transcripts(s3, "bucket", "guidance cut", ["2024Q3"]) == before
+
+    puts = len(s3.puts)
+    assert compact_quarter(s3, "bucket", "2024Q3")["skipped"] is True
+    assert len(s3.puts) == puts
+    assert compact_quarter(s3, "bucket", "2024Q3", force=True)["documents"] == 1
+
+
+def test_reingested_doc_overrides_compacted_postings(s3):
+    compact_quarter(s3, "bucket", "2024Q3")
+    index_transcript(s3, "bucket", "IBM", "2024Q3", SEGMENTS[:2])
+
+    assert search_transcripts(s3, "bucket", "guidance cut", ["2024Q3"]) == []
+    assert [m["segment_index"] for m in search_transcripts(s3, "bucket", "guidance", ["2024Q3"])] == [1]
+
+
+def test_doc_info_shorter_than_postings_does_not_raise(s3):
+    document = build_document("IBM", "2024Q3", SEGMENTS)
+    document["speakers"] = document["speakers"][:2]
+    document["titles"] = []
+    search_index.put_gzip_json(s3, "bucket", doc_key("IBM", "2024Q3"), document)
+
+    matches = search_transcripts(s3, "bucket", "guidance cut", ["2024Q3"])
+    assert [(m["segment_index"], m["speaker"], m["title"]) for m in matches] == [
+        (2, "", ""),
+        (3, "", ""),
+    ]
@@ -0,0 +1,103 @@
+"""Tests for chunked segment storage."""
+
+import random
+from decimal import Decimal
+
+import pytest
+
+from services.alpha_vantage.segment_chunks import (
+    INDEX_SEGMENT,
+    pack_segments,
+    store_transcript_chunked,
+    unpack_segment,
+)
+
+
+def make_segments(count=60, seed=3):
+    rng = random.Random(seed)
+    words = "revenue margin guidance cloud demand 成长 café backlog".split()
+    return [
+        {
+            "speaker": rng.choice(["Jane", "Pat", "Operator"]),
+            "title": rng.choice(["Chief Executive Officer", "Analyst", ""]),
+            "content": " ".join(rng.choice(words) for _ in range(rng.randint(0, 400))),
+            "sentiment": str(round(rng.uniform(-1, 1), 2)),
+        }
+        for _ in range(count)
+    ]
+
+
+def unpack(chunks, index, segment_index):
+    speaker_id, chunk_first, offset, length, sentiment = index["segments"][segment_index]
+    chunk = next(chunk for chunk in chunks if chunk["first_segment"] == chunk_first)
+    assert chunk["first_segment"] <= segment_index <= chunk["last_segment"]
+    return {
+        "speaker": index["speakers"][speaker_id],
+        "title": index["titles"][segment_index],
+        "sentiment": sentiment,
+        "content": unpack_segment(chunk["payload"], offset, length),
+    }
+
+
+@pytest.mark.parametrize("max_chunk_bytes", [64, 4096, 1024 * 1024])
+def test_random_access_returns_the_source_segment(max_chunk_bytes):
+    segments = make_segments()
+    chunks, index = pack_segments(segments, max_chunk_bytes)
+
+    for segment_index in random.Random(max_chunk_bytes).sample(range(len(segments)), 20):
+        source = segments[segment_index]
+        assert unpack(chunks, index, segment_index) == {
+            "speaker": source["speaker"],
+            "title": source["title"],
+            "sentiment": source["sentiment"],
+            "content": source["content"],
+        }
+
+
+def test_chunks_respect_the_size_bound():
+    segments = make_segments()
+    chunks, _ = pack_segments(segments, 4096)
+
+    assert chunks[0]["first_segment"] == 0
+    assert chunks[-1]["last_segment"] == len(segments) - 1
+    for chunk in chunks:
+        assert chunk["raw_bytes"] <= 4096 or chunk["first_segment"] == chunk["last_segment"]
+
+
+@pytest.mark.parametrize("value", [None, "", "n/a", "NaN", "Infinity", {"score": 1}])
+def test_non_numeric_sentiment_is_stored_as_zero(value):
+    _, index = pack_segments([{"speaker": "Jane", "content": "Remarks.", "sentiment": value}])
+    assert index["segments"][0][4] == "0"
+
+
+class FakeTable:
+    def __init__(self):
+        self.items = []
+
+    def batch_writer(self):
+        table = self
+
+        class Writer:
+            def __enter__(self):
+                return self
+
+            def __exit__(self, *exc):
+                return False
+
+            def put_item(self, Item):
+                table.items.append(Item)
+
+        return Writer()
+
+
+def test_store_accepts_malformed_sentiment():
+    segments = make_segments(count=3)
+    segments[1]["sentiment"] = "positive"
+    table = FakeTable()
+
+    result = store_transcript_chunked("IBM_2024Q3_x", "IBM", "2024Q3", segments, table, "now", 0)
+
+    index_item = next(item for item in table.items if item["segment_index"] == INDEX_SEGMENT)
+    assert index_item["segments"][1][4] == Decimal("0")
+    assert index_item["segments"][0][4] == Decimal(segments[0]["sentiment"])
+    assert result["items_written"] == len(table.items)
@@ -0,0 +1,183 @@
+"""Tests for the per-role sentiment series and its rollups."""
+
+import io
+import json
+from decimal import Decimal
+
+import pytest
+
+from services.alpha_vantage import alpha_vantage
+from services.alpha_vantage.hot_cache import hot_cache
+from services.alpha_vantage.sentiment_series import (
+    get_sentiment_series,
+    record_transcript_sentiment,
+)
+from services.alpha_vantage.speaker_roles import build_role_index
+
+
+class FakeSeriesTable:
+    """In-memory table keyed by (series_id, period) with the calls the series uses."""
+
+    def __init__(self):
+        self.items = {}
+
+    def batch_writer(self, overwrite_by_pkeys=None):
+        table = self
+
+        class Writer:
+            def __enter__(self):
+                return self
+
+            def __exit__(self, *exc):
+                return False
+
+            def put_item(self, Item):
+                table.items[(Item["series_id"], Item["period"])] = Item
+
+            def delete_item(self, Key):
+                table.items.pop((Key["series_id"], Key["period"]), None)
+
+        return Writer()
+
+    def query(self, ExpressionAttributeValues, **kwargs):
+        values = ExpressionAttributeValues
+        items = [
+            item
+            for (series, period), item in sorted(self.items.items())
+            if series == values[":id"] and values[":start"] <= period <= values[":end"]
+        ]
+        return {"Items": items}
+
+    def get(self, series_id, period):
+        return self.items.get((series_id, period))
+
+
+def call(sentiment, analyst_sentiment=None):
+    segments = [
+        {"speaker": "Jane", "title": "Chief Executive Officer", "content": "Remarks.", "sentiment": str(sentiment)},
+    ]
+    if analyst_sentiment is not None:
+        segments.append(
+            {"speaker": "Pat", "title": "Analyst, Morgan Stanley", "content": "Question.", "sentiment": str(analyst_sentiment)}
+        )
+    return segments
+
+
+def record(table, quarter, sentiment, analyst_sentiment=None, symbol="IBM"):
+    segments = call(sentiment, analyst_sentiment)
+    return record_transcript_sentiment(table, symbol, quarter, segments, build_role_index(segments))
+
+
+@pytest.fixture
+def table():
+    return FakeSeriesTable()
+
+
+def test_quarter_points_per_role(table):
+    record(table, "2024Q1", 0.2, analyst_sentiment=-0.4)
+
+    assert float(table.get("IBM#all", "Q#2024Q1")["avg_sentiment"]) == pytest.approx(-0.1)
+    assert float(table.get("IBM#executive", "Q#2024Q1")["avg_sentiment"]) == pytest.approx(0.2)
+    assert float(table.get("IBM#analyst", "Q#2024Q1")["avg_sentiment"]) == pytest.approx(-0.4)
+
+
+def test_year_rollup_averages_quarter_averages(table):
+    record(table, "2023Q4", 0.9)
+    for quarter, sentiment in [("2024Q1", 0.1), ("2024Q2", 0.2), ("2024Q3", 0.6)]:
+        record(table, quarter, sentiment)
+
+    year = table.get("IBM#all", "Y#2024")
+    assert float(year["avg_sentiment"]) == pytest.approx(0.3)
+    assert year["quarters"] == 3
+    assert (year["first_quarter"], year["last_quarter"]) == ("2024Q1", "2024Q3")
+    assert float(table.get("IBM#all", "Y#2023")["avg_sentiment"]) == pytest.approx(0.9)
+
+
+def test_trailing_4q_windows(table):
+    sentiments = {"2023Q3": 0.1, "2023Q4": 0.2, "2024Q1": 0.3, "2024Q2": 0.4, "2024Q3": 0.5}
+    for quarter, sentiment in sentiments.items():
+        record(table, quarter, sentiment)
+
+    window = table.get("IBM#all", "T4#2024Q2")
+    assert float(window["avg_sentiment"]) == pytest.approx(0.25)
+    assert (window["first_quarter"], window["last_quarter"]) == ("2023Q3", "2024Q2")
+    assert window["quarters"] == 4
+
+    latest = table.get("IBM#all", "T4#2024Q3")
+    assert float(latest["avg_sentiment"]) == pytest.approx(0.35)
+    assert latest["quarters"] == 4
+
+
+def test_trailing_4q_is_refreshed_by_an_earlier_quarter(table):
+    record(table, "2024Q2", 0.4)
+    record(table, "2024Q1", 0.2)  # ingested late: later windows must include it
+
+    window = table.get("IBM#all", "T4#2024Q2")
+    assert float(window["avg_sentiment"]) == pytest.approx(0.3)
+    assert window["quarters"] == 2
+
+
+def test_reingesting_a_quarter_replaces_its_point(table):
+    record(table, "2024Q1", 0.2)
+    record(table, "2024Q2", 0.4)
+    record(table, "2024Q1", 0.6)
+
+    assert float(table.get("IBM#all", "Y#2024")["avg_sentiment"]) == pytest.approx(0.5)
+    assert float(table.get("IBM#all", "T4#2024Q2")["avg_sentiment"]) == pytest.approx(0.5)
+
+
+def test_read_series_by_resolution(table):
+    for quarter, sentiment in [("2024Q1", 0.1), ("2024Q2", 0.3)]:
+        record(table, quarter, sentiment)
+
+    # Trailing windows end on reported quarters only
+    series = get_sentiment_series(table, ["ibm"], resolution="trailing_4q", workers=1)
+    assert [point["period"] for point in series["IBM"]] == ["2024Q1", "2024Q2"]
+    assert series["IBM"][1]["sentiment"] == pytest.approx(0.2)
+    assert series["IBM"][1]["quarters"] == 2
+
+
+class FakeTranscriptsTable:
+    def __init__(self, quarters):
+        self.quarters = quarters
+
+    def query(self, **kwargs):
+        return {"Items": [{"quarter": quarter} for quarter in self.quarters]}
+
+
+class FakeDynamoDB:
+    def __init__(self, tables):
+        self.tables = tables
+
+    def Table(self, name):
+        return self.tables[name]
+
+
+class FakeS3:
+    def __init__(self):
+        self.reads = 0
+
+    def get_object(self, Bucket, Key):
+        self.reads += 1
+        body = json.dumps({"transcript": call(Decimal("0.25"))}, default=str)
+        return {"Body": io.BytesIO(body.encode("utf-8"))}
+
+
+def test_rebuild_reads_s3_directly_and_skips_the_hot_cache(monkeypatch):
+    series_table = FakeSeriesTable()
+    s3 = FakeS3()
+    dynamodb = FakeDynamoDB(
+        {"transcripts": FakeTranscriptsTable(["2024Q1", "2024Q2"]), "series": series_table}
+    )
+    monkeypatch.setattr(alpha_vantage, "get_dynamodb_client", lambda region_name="us-east-1": dynamodb)
+    monkeypatch.setattr(alpha_vantage, "get_s3_client", lambda region_name="us-east-1": s3)
+    hot_cache.clear()
+    stats_before = dict(hot_cache.stats)
+
+    recorded = alpha_vantage.rebuild_sentiment_series("IBM", "transcripts", "series", "bucket")
+
+    assert recorded == 2
+    assert s3.reads == 2
+    assert hot_cache.stats == stats_before
+    assert hot_cache.get(("s3", "bucket", "IBM", "2024Q1")) is None
+    assert float(series_table.get("IBM#all", "Y#2024")["avg_sentiment"]) == pytest.approx(0.25)
@@ -0,0 +1,100 @@
+"""Tests for the DuckDB snapshot upsert schema."""
+
+from decimal import Decimal
+
+import pytest
+
+from src.analytics import snapshot
+
+
+@pytest.fixture
+def con(tmp_path):
+    connection = snapshot.connect(str(tmp_path / "analytics.duckdb"))
+    yield connection
+    connection.close()
+
+
+def plain(item):
+    return {key: snapshot.to_plain(value) for key, value in item.items()}
+
+
+def test_to_plain_keeps_integral_decimals_numeric_as_float():
+    assert snapshot.to_plain(Decimal("0")) == 0.0
+    assert isinstance(snapshot.to_plain(Decimal("0")), float)
+    assert snapshot.to_plain(Decimal("0.37")) == 0.37
+
+
+def test_whole_number_first_batch_does_not_truncate_later_fractions(con):
+    snapshot.upsert_items(
+        con,
+        "earnings_transcripts",
+        [plain({"symbol": "IBM", "quarter": "2024Q1", "avg_sentiment": Decimal("0"), "score": Decimal("1")})],
+    )
+    snapshot.upsert_items(
+        con,
+        "earnings_transcripts",
+        [plain({"symbol": "AAPL", "quarter": "2024Q1", "avg_sentiment": Decimal("0.37"), "score": Decimal("1.5")})],
+    )
+
+    rows = dict(
+        con.execute(
+            "SELECT symbol, avg_sentiment FROM earnings_transcripts ORDER BY symbol"
+        ).fetchall()
+    )
+    assert rows == {"AAPL": 0.37, "IBM": 0.0}
+    scores = con.execute("SELECT score FROM earnings_transcripts ORDER BY symbol").fetchall()
+    assert scores == [(1.5,), (1.0,)]
+
+
+def test_timestamps_stay_verbatim_strings(con):
+    snapshot.upsert_items(
+        con,
+        "earnings_transcripts",
+        [{"symbol": "IBM", "quarter": "2024Q1", "created_at": "2024-01-02T03:04:05.123", "updated_at": "2024-01-02T03:04:05"}],
+    )
+    assert con.execute("SELECT created_at, updated_at FROM earnings_transcripts").fetchone() == (
+        "2024-01-02T03:04:05.123",
+        "2024-01-02T03:04:05",
+    )
+
+
+def test_upsert_replaces_rows_by_key(con):
+    item = {"symbol": "IBM", "quarter": "2024Q1", "avg_sentiment": 0.1}
+    snapshot.upsert_items(con, "earnings_transcripts", [item])
+    snapshot.upsert_items(con, "earnings_transcripts", [{**item, "avg_sentiment": 0.2}])
+
+    assert con.execute("SELECT avg_sentiment FROM earnings_transcripts").fetchall() == [(0.2,)]
+
+
+def test_older_integer_columns_are_widened(con):
+    con.execute(
+        "CREATE TABLE earnings_transcripts (symbol VARCHAR, quarter VARCHAR, avg_sentiment BIGINT, score BIGINT)"
+    )
+    snapshot.upsert_items(
+        con,
+        "earnings_transcripts",
+        [{"symbol": "IBM", "quarter": "2024Q1", "avg_sentiment": 0.37, "score": 2.5}],
+    )
+
+    assert con.execute("SELECT avg_sentiment, score FROM earnings_transcripts").fetchone() == (0.37, 2.5)
+
+
+def test_surprise_summary_skips_unreported_rows(tmp_path):
+    db_path = str(tmp_path / "analytics.duckdb")
+    connection = snapshot.connect(db_path)
+    snapshot.upsert_items(
+        connection,
+        "earnings_cache",
+        [
+            # Current rows: NULL is unreported, 0 is a reported value
+            {"stock_symbol": "IBM", "earnings_date": "2024-04-24", "eps_actual": 0.0, "eps_estimated": -0.1, "item_version": 2},
+            {"stock_symbol": "IBM", "earnings_date": "2024-07-24", "eps_actual": None, "eps_estimated": 2.2, "item_version": 2},
+            # Legacy row: 0 stood for "not reported yet"
+            {"stock_symbol": "IBM", "earnings_date": "2024-10-23", "eps_actual": 0.0, "eps_estimated": 2.3},
+        ],
+    )
+    connection.close()
+
+    assert snapshot.earnings_surprise_summary(db_path) == [
+        {"stock_symbol": "IBM", "reports": 1, "beat_rate": 1.0, "avg_eps_surprise": pytest.approx(0.1)}
+    ]
@@ -0,0 +1,63 @@
+"""Tests for speaker-role classification."""
+
+import pytest
+
+from services.alpha_vantage.speaker_roles import build_role_index, classify_role
+
+
+def role(title, speaker="Jane Doe"):
+    return classify_role({"speaker": speaker, "title": title})
+
+
+@pytest.mark.parametrize(
+    "title",
+    [
+        "Chairman and CEO, JPMorgan Chase",
+        "SVP, Capital Markets & Treasurer",
+        "Chief Risk Officer, Bank",
+        "Chief Financial Officer",
+        "President and Chief Operating Officer",
+        "Director of Investor Relations",
+        "SVP, Finance",
+        "Vice President, Corporate Development",
+        "Head of Investor Relations",
+    ],
+)
+def test_executive_titles(title):
+    assert role(title) == "executive"
+
+
+@pytest.mark.parametrize(
+    "title",
+    [
+        "Analyst",
+        "Morgan Stanley",
+        "Goldman Sachs",
+        "Managing Director, Goldman Sachs",
+        "Executive Director, Equity Research",
+        "Head of Research, Wolfe Research LLC",
+        "Bernstein & Co",
+        "Evercore ISI Partners",
+    ],
+)
+def test_analyst_titles(title):
+    assert role(title) == "analyst"
+
+
+def test_operator_and_unknown_titles():
+    assert role("", speaker="Operator") == "operator"
+    assert role("Operator") == "operator"
+    assert role("") == "other"
+    assert role("Moderator") == "other"
+
+
+def test_role_index_starts_qa_at_first_analyst():
+    segments = [
+        {"speaker": "Operator", "title": "", "content": "Welcome to the call."},
+        {"speaker": "Jamie", "title": "Chairman and CEO, JPMorgan Chase", "content": "Good morning."},
+        {"speaker": "Pat", "title": "Analyst, Morgan Stanley", "content": "Thanks for taking my question."},
+        {"speaker": "Jamie", "title": "", "content": "Sure."},
+    ]
+    index = build_role_index(segments)
+    assert index["roles"] == "oeae"
+    assert index["qa_start"] == 2
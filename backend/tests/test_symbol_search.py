@@ -0,0 +1,60 @@
+"""Tests for the typeahead symbol index and request parsing."""
+
+import json
+from types import SimpleNamespace
+
+import pytest
+
+from services.symbol_search import symbol_search
+
+
+@pytest.fixture
+def index():
+    return symbol_search.build_symbol_index(
+        {"AAPL", "AMZN", "MSFT"},
+        {
+            "AAPL": {"name": "Apple Inc.", "exchange": "NASDAQ"},
+            "MSFT": {"name": "Microsoft Corporation", "exchange": "NASDAQ"},
+        },
+    )
+
+
+@pytest.fixture
+def loaded(monkeypatch, index):
+    bucket = f"/{symbol_search.PROJECT_NAME}/{symbol_search.ENVIRONMENT}/earnings-data-bucket"
+    monkeypatch.setitem(symbol_search._parameters, bucket, "bucket")
+    monkeypatch.setattr(symbol_search, "_symbol_index", index)
+
+
+def handle(params):
+    context = SimpleNamespace(aws_request_id="test")
+    return symbol_search.lambda_handler({"queryStringParameters": params}, context)
+
+
+def test_symbol_prefix_returns_name_and_exchange(index):
+    assert symbol_search.search_symbols(index, "aa") == [
+        {"symbol": "AAPL", "name": "Apple Inc.", "exchange": "NASDAQ"}
+    ]
+
+
+def test_name_prefix_matches_company_names(index):
+    results = symbol_search.search_symbols(index, "micro")
+    assert [result["symbol"] for result in results] == ["MSFT"]
+
+
+def test_symbols_without_a_name_still_match_by_symbol(index):
+    assert symbol_search.search_symbols(index, "AMZ") == [
+        {"symbol": "AMZN", "name": "", "exchange": ""}
+    ]
+
+
+def test_invalid_limit_is_a_bad_request(loaded):
+    response = handle({"q": "A", "limit": "ten"})
+    assert response["statusCode"] == 400
+    assert json.loads(response["body"])["success"] is False
+
+
+def test_limit_is_clamped(loaded):
+    assert len(json.loads(handle({"q": "A", "limit": "0"})["body"])["data"]) == 1
+    assert len(json.loads(handle({"q": "", "limit": "500"})["body"])["data"]) == 0
+    assert len(json.loads(handle({"q": "A"})["body"])["data"]) == 2
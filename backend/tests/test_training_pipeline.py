@@ -0,0 +1,64 @@
+"""Tests for marking transcripts processed by the training pipeline."""
+
+from types import SimpleNamespace
+
+from botocore.exceptions import ClientError
+
+from src.training import pipeline
+
+
+class FakeClient:
+    """Records update requests and applies their transcript_id condition."""
+
+    def __init__(self, stored_ids):
+        self.stored_ids = stored_ids
+        self.updates = []
+
+    def check(self, update):
+        key = (update["Key"]["symbol"], update["Key"]["quarter"])
+        expected = update["ExpressionAttributeValues"].get(":tid")
+        return self.stored_ids.get(key) == expected
+
+    def transact_write_items(self, TransactItems):
+        if not all(self.check(action["Update"]) for action in TransactItems):
+            raise ClientError(
+                {"Error": {"Code": "TransactionCanceledException", "Message": ""}},
+                "TransactWriteItems",
+            )
+        self.updates.extend(action["Update"] for action in TransactItems)
+
+    def update_item(self, **update):
+        if not self.check(update):
+            raise ClientError(
+                {"Error": {"Code": "ConditionalCheckFailedException", "Message": ""}},
+                "UpdateItem",
+            )
+        self.updates.append(update)
+
+
+def fake_table(client):
+    return SimpleNamespace(name="transcripts", meta=SimpleNamespace(client=client))
+
+
+def test_update_is_conditional_on_the_processed_transcript_id():
+    client = FakeClient({("IBM", "2024Q1"): "IBM_2024Q1_aaaa"})
+    items = [{"symbol": "IBM", "quarter": "2024Q1", "transcript_id": "IBM_2024Q1_aaaa"}]
+
+    assert pipeline.mark_processed(fake_table(client), items, "shard-key") == 1
+    update = client.updates[0]
+    assert "transcript_id = :tid" in update["ConditionExpression"]
+    assert update["ExpressionAttributeValues"][":tid"] == "IBM_2024Q1_aaaa"
+
+
+def test_reingested_transcript_is_not_marked():
+    # AAPL was re-ingested (new transcript_id) after the pipeline read it
+    client = FakeClient(
+        {("IBM", "2024Q1"): "IBM_2024Q1_aaaa", ("AAPL", "2024Q1"): "AAPL_2024Q1_new"}
+    )
+    items = [
+        {"symbol": "IBM", "quarter": "2024Q1", "transcript_id": "IBM_2024Q1_aaaa"},
+        {"symbol": "AAPL", "quarter": "2024Q1", "transcript_id": "AAPL_2024Q1_old"},
+    ]
+
+    assert pipeline.mark_processed(fake_table(client), items, "shard-key") == 1
+    assert [update["Key"]["symbol"] for update in client.updates] == ["IBM"]
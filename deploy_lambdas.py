@@ -2,12 +2,43 @@
 
 import subprocess
 import sys
-import datetime
 import os
 import shutil
 import base64
 import json
 import time
+import glob
+import hashlib
+import zipfile
+import argparse
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+PROJECT_NAME = os.environ.get("PROJECT_NAME", "earnings-sentiment")
+ENVIRONMENT = os.environ.get("ENVIRONMENT", "dev")
+APP_NAME = os.environ.get("APP_NAME", "nextjs-app")
+AWS_REGION = os.environ.get("AWS_REGION", "us-east-1")
+
+BACKEND_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "backend")
+SERVICES_DIR = os.path.join(BACKEND_DIR, "services")
+
+# Modules shared by several images (copied in by each Dockerfile, never deployed alone)
+SHARED_DIR = os.path.join(SERVICES_DIR, "shared")
+
+# Service directory -> deployed function name parts (see terraform/lambda.tf).
+# Services not listed deploy to a function named after the directory.
+SERVICE_FUNCTIONS = {
+    "fmp": ["earnings-calendar", "calendar-api"],
+    "alpha_vantage": ["earnings-transcripts"],
+    "symbol_search": ["symbol-search"],
+}
+
+DEPLOY_CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".deploy-cache")
+
+# Fixed entry timestamp for reproducible ZIPs (the earliest ZIP supports)
+ZIP_TIMESTAMP = (1980, 1, 1, 0, 0, 0)
+
+# Files that never affect the built image
+IGNORED_NAMES = {"__pycache__", ".pytest_cache", ".env"}
 
 
 class DeploymentError(Exception):
@@ -123,176 +154,6 @@ def docker_login_ecr(repository_uri):
         return False
 
 
-def build_docker_image(repository_uri, image_tag):
-    """Build Docker image with proper platform handling."""
-    try:
-        full_tag = f"{repository_uri}:{image_tag}"
-
-        # Clean up any existing images
-        print("\nCleaning up any existing images...")
-        cleanup_cmd = "docker system prune -f"
-        subprocess.run(cleanup_cmd, shell=True, check=False)
-
-        # Build command with platform specification
-        build_cmd = [
-            "docker",
-            "build",
-            "--progress=plain",
-            "--no-cache",
-            "--platform",
-            "linux/amd64",  # Platform specified here instead of Dockerfile
-            "--build-arg",
-            "BUILDKIT_INLINE_CACHE=1",  # Enable inline caching
-            "-t",
-            full_tag,
-            ".",
-        ]
-
-        print(f"\nStarting build for: {full_tag}")
-        print("This may take several minutes...")
-        print(f"Build command: {' '.join(build_cmd)}")
-
-        # Set environment variables for build
-        env = os.environ.copy()
-        env["DOCKER_BUILDKIT"] = "1"  # Enable BuildKit
-
-        # Run build process with proper encoding
-        process = subprocess.Popen(
-            build_cmd,
-            env=env,
-            stdout=subprocess.PIPE,
-            stderr=subprocess.STDOUT,
-            encoding="utf-8",
-            errors="replace",
-            universal_newlines=True,
-        )
-
-        while True:
-            try:
-                # Read line by line with encoding error handling
-                line = process.stdout.readline()
-                if not line and process.poll() is not None:
-                    break
-                if line:
-                    # Handle encoding errors by replacing invalid characters
-                    print(
-                        line.encode("cp1252", errors="replace")
-                        .decode("cp1252", errors="replace")
-                        .rstrip()
-                    )
-            except UnicodeEncodeError:
-                # If we still get encoding errors, just skip the problematic line
-                continue
-
-        # Get the return code
-        return_code = process.poll()
-
-        if return_code != 0:
-            raise DockerError(f"Build process exited with code {return_code}")
-
-        print("\nBuild completed successfully!")
-        return True
-
-    except (OSError, subprocess.CalledProcessError) as e:
-        print(f"\nBuild failed with error: {str(e)}")
-        return False
-
-
-def push_docker_image(repository_uri, image_tag):
-    """Push Docker image to ECR with manifest handling."""
-    try:
-        # Build the image first
-        if not build_docker_image(repository_uri, image_tag):
-            return False
-
-        full_tag = f"{repository_uri}:{image_tag}"
-        region = "us-east-1"
-
-        # Get ECR credentials with explicit region
-        print("\nGetting ECR credentials...")
-        auth_cmd = ["aws", "ecr", "get-login-password", "--region", region]
-        auth_token = subprocess.run(
-            auth_cmd, capture_output=True, text=True, check=True
-        ).stdout.strip()
-
-        # Login to ECR
-        print("Logging into ECR...")
-        registry = repository_uri.split("/")[0]
-        login_cmd = [
-            "docker",
-            "login",
-            "--username",
-            "AWS",
-            "--password-stdin",
-            registry,
-        ]
-
-        login_process = subprocess.Popen(
-            login_cmd,
-            stdin=subprocess.PIPE,
-            stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE,
-            text=True,
-        )
-        _, stderr = login_process.communicate(input=auth_token)
-
-        if login_process.returncode != 0:
-            raise DockerError(f"Docker login failed: {stderr}")
-
-        print("Successfully logged into ECR")
-
-        # Ensure proper manifest format
-        inspect_cmd = ["docker", "inspect", full_tag]
-        subprocess.run(inspect_cmd, capture_output=True, text=True, check=True)
-
-        # Push the image
-        print(f"\nPushing image: {full_tag}")
-        push_cmd = [
-            "docker",
-            "push",
-            "--platform",
-            "linux/amd64",  # Explicitly set platform
-            full_tag,
-        ]
-
-        # Execute push with retries
-        max_retries = 3
-        for attempt in range(max_retries):
-            try:
-                print(f"\nPush attempt {attempt + 1} of {max_retries}")
-                subprocess.run(push_cmd, capture_output=True, text=True, check=True)
-                print("Push completed successfully!")
-                return True
-
-            except subprocess.CalledProcessError as e:
-                print(f"Push attempt {attempt + 1} failed:")
-                print(f"Error output: {e.stderr}")
-
-                if attempt < max_retries - 1:
-                    print("Refreshing ECR credentials and retrying...")
-                    # Re-authenticate before retry
-                    auth_token = subprocess.run(
-                        auth_cmd, capture_output=True, text=True, check=True
-                    ).stdout.strip()
-
-                    login_process = subprocess.Popen(
-                        login_cmd,
-                        stdin=subprocess.PIPE,
-                        stdout=subprocess.PIPE,
-                        stderr=subprocess.PIPE,
-                        text=True,
-                    )
-                    login_process.communicate(input=auth_token)
-                    time.sleep(10)
-
-        print("\nAll push attempts failed")
-        return False
-
-    except (subprocess.CalledProcessError, OSError) as e:
-        print(f"Error in push_docker_image: {str(e)}")
-        return False
-
-
 def debug_ecr_setup(repository_uri):
     """Debug ECR setup and permissions."""
     try:
@@ -348,246 +209,391 @@ def debug_ecr_setup(repository_uri):
         return False
 
 
-def get_lambda_package_type(function_name):
-    """Get the package type (Image or Zip) for a Lambda function."""
-    # Hardcode the package types based on what we know
-    package_types = {
-        "trading-prod-function": "Zip",
-        "trading-prod-symbol-lookup": "Image",
-        "trading-prod-coinbase": "Zip",
-    }
-    return package_types.get(function_name, "Zip")
-
-
-def create_zip_package(source_dir):
-    """Create a ZIP deployment package for a Lambda function."""
-    print(f"Creating ZIP package for {source_dir}...")
+def get_lambda_package_type(source_dir):
+    """Services with a Dockerfile deploy as images, everything else as ZIP."""
+    return "Image" if os.path.exists(os.path.join(source_dir, "Dockerfile")) else "Zip"
+
+
+def discover_services(services_dir=SERVICES_DIR):
+    """Find deployable services: each directory under backend/services with a handler."""
+    services = []
+    for name in sorted(os.listdir(services_dir)):
+        source_dir = os.path.join(services_dir, name)
+        if name in IGNORED_NAMES or source_dir == SHARED_DIR or not os.path.isdir(source_dir):
+            continue
+        if not any(item.endswith(".py") and item != "__init__.py" for item in os.listdir(source_dir)):
+            continue
+
+        dashed = name.replace("_", "-")
+        services.append(
+            {
+                "name": name,
+                "source_dir": source_dir,
+                "package_type": get_lambda_package_type(source_dir),
+                "repository_name": f"{APP_NAME}-{dashed}-lambda",
+                "functions": [
+                    f"{PROJECT_NAME}-{function}-{ENVIRONMENT}"
+                    for function in SERVICE_FUNCTIONS.get(name, [dashed])
+                ],
+            }
+        )
+    return services
+
+
+def dockerfile_sources(dockerfile):
+    """Files and directories under backend/ that a Dockerfile's COPY lines bring in."""
+    sources = [dockerfile]
+    with open(dockerfile, "r", encoding="utf-8") as f:
+        lines = f.read().replace("\\\n", " ").splitlines()
+    for line in lines:
+        parts = line.split()
+        if not parts or parts[0].upper() not in ("COPY", "ADD"):
+            continue
+        if any(part.startswith("--from") for part in parts[1:]):
+            continue  # copied from another build stage, not from backend/
+        arguments = [part for part in parts[1:] if not part.startswith("--")]
+        for pattern in arguments[:-1]:
+            matches = glob.glob(os.path.join(BACKEND_DIR, pattern))
+            if not matches:
+                raise FileNotFoundError(f"{dockerfile}: COPY source {pattern} not found")
+            sources.extend(sorted(matches))
+    return sources
+
+
+def source_hash(*paths):
+    """Hash of every file under the given files/directories, in a stable order."""
+    digest = hashlib.sha256()
+
+    def add_file(path):
+        digest.update(os.path.relpath(path, BACKEND_DIR).replace(os.sep, "/").encode("utf-8"))
+        with open(path, "rb") as f:
+            digest.update(hashlib.sha256(f.read()).digest())
+
+    for path in paths:
+        if os.path.isfile(path):
+            add_file(path)
+            continue
+        for root, dirs, files in os.walk(path):
+            dirs[:] = sorted(d for d in dirs if d not in IGNORED_NAMES)
+            for name in sorted(files):
+                if name in IGNORED_NAMES or name.endswith((".pyc", ".zip")):
+                    continue
+                add_file(os.path.join(root, name))
+    return digest.hexdigest()
+
+
+def run_quiet(command):
+    """Run a command (argument list), returning (success, combined output)."""
+    result = subprocess.run(
+        command,
+        capture_output=True,
+        text=True,
+        encoding="utf-8",
+        errors="replace",
+        check=False,
+    )
+    return result.returncode == 0, (result.stdout + result.stderr).strip()
 
-    # Create a temporary directory for the package
-    temp_dir = f"{source_dir}_deploy"
-    if os.path.exists(temp_dir):
-        shutil.rmtree(temp_dir)
-    os.makedirs(temp_dir)
 
-    # Copy all Python files and directories, preserving structure
-    def copy_source_files(src, dst):
-        for item in os.listdir(src):
-            src_path = os.path.join(src, item)
-            dst_path = os.path.join(dst, item)
+def image_exists(repository_name, image_tag):
+    """Whether ECR already holds this tag (i.e. this exact source was pushed)."""
+    ok, _ = run_quiet(
+        [
+            "aws", "ecr", "describe-images",
+            "--repository-name", repository_name,
+            "--image-ids", f"imageTag={image_tag}",
+            "--region", AWS_REGION,
+        ]
+    )
+    return ok
+
+
+def deployed_image_uri(function_name):
+    """Image URI the function currently runs, or None."""
+    ok, output = run_quiet(
+        [
+            "aws", "lambda", "get-function",
+            "--function-name", function_name,
+            "--query", "Code.ImageUri",
+            "--output", "text",
+            "--region", AWS_REGION,
+        ]
+    )
+    return output if ok else None
 
-            # Skip common files/directories we don't want
-            if item in {".git", "__pycache__", "*.pyc", ".env"}:
-                continue
 
-            if os.path.isdir(src_path):
-                # Recursively copy directories
-                shutil.copytree(src_path, dst_path)
-            elif item.endswith(".py"):
-                # Copy Python files
-                shutil.copy2(src_path, dst_path)
+def deploy_image_service(service, registry, force=False, dry_run=False):
+    """
+    Build, push and roll out one image service.
 
-    # Copy source files with structure preserved
-    copy_source_files(source_dir, temp_dir)
+    Images are tagged by source hash: an unchanged service skips the build and
+    push entirely, and functions already on that image are not updated.
+    """
+    name = service["name"]
+    repository_uri = f"{registry}/{service['repository_name']}"
+    # Everything the Dockerfile copies in, so shared modules count too
+    dockerfile = os.path.join(service["source_dir"], "Dockerfile")
+    image_tag = f"src-{source_hash(*dockerfile_sources(dockerfile))[:16]}"
+    image_uri = f"{repository_uri}:{image_tag}"
+    steps = []
 
-    # Install dependencies from requirements.txt
-    requirements_file = os.path.join(source_dir, "requirements.txt")
-    if os.path.exists(requirements_file):
-        subprocess.run(
-            ["pip", "install", "-r", requirements_file, "--target", temp_dir],
-            check=True,
+    if force or not image_exists(service["repository_name"], image_tag):
+        build_cmd = [
+            "docker", "build",
+            "--platform", "linux/amd64",
+            "--build-arg", "BUILDKIT_INLINE_CACHE=1",
+            "--cache-from", f"{repository_uri}:latest",
+            "-t", image_uri,
+            "-t", f"{repository_uri}:latest",
+            "-f", dockerfile,
+            BACKEND_DIR,
+        ]
+        if dry_run:
+            steps.append(f"would build and push {image_uri}")
+        else:
+            started = time.time()
+            ok, output = run_quiet(build_cmd)
+            if not ok:
+                raise DockerError(f"[{name}] build failed:\n{output[-4000:]}")
+            for tag in (image_uri, f"{repository_uri}:latest"):
+                ok, output = run_quiet(["docker", "push", tag])
+                if not ok:
+                    raise DockerError(f"[{name}] push of {tag} failed:\n{output[-2000:]}")
+            steps.append(f"built and pushed {image_tag} in {time.time() - started:.0f}s")
+    else:
+        steps.append(f"image {image_tag} unchanged, skipped build")
+
+    for function_name in service["functions"]:
+        if not force and deployed_image_uri(function_name) == image_uri:
+            steps.append(f"{function_name} already on {image_tag}")
+            continue
+        if dry_run:
+            steps.append(f"would update {function_name}")
+            continue
+
+        ok, output = run_quiet(
+            [
+                "aws", "lambda", "update-function-code",
+                "--function-name", function_name,
+                "--image-uri", image_uri,
+                "--region", AWS_REGION,
+            ]
         )
+        if not ok:
+            raise DeploymentError(f"[{name}] update of {function_name} failed: {output}")
+        steps.append(f"updated {function_name}")
 
-    # Create ZIP file
-    zip_file = f"{source_dir}.zip"
-    if os.path.exists(zip_file):
-        os.remove(zip_file)
+    return steps
 
-    shutil.make_archive(source_dir, "zip", temp_dir)
 
-    # Clean up temporary directory
-    shutil.rmtree(temp_dir)
+def file_sha256(path):
+    """SHA-256 hex digest of a file."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(block)
+    return digest.hexdigest()
 
-    return f"{source_dir}.zip"
 
+def get_dependency_layer(source_dir):
+    """
+    Installed dependencies for a service, cached by requirements.txt hash.
 
-def deploy_zip_lambda(source_dir, function_name):
-    """Deploy a ZIP-based Lambda function."""
-    print(f"\nDeploying ZIP package for {function_name}...")
+    pip only runs when the requirements change; every other deploy reuses the
+    cached install directory.
 
-    try:
-        # Create ZIP package
-        zip_file = create_zip_package(source_dir)
+    Returns:
+        Path of the install directory, or None without a requirements.txt
+    """
+    requirements_file = os.path.join(source_dir, "requirements.txt")
+    if not os.path.exists(requirements_file):
+        return None
 
-        # Update Lambda function
-        print(f"Updating Lambda function {function_name}...")
-        update_cmd = f"aws lambda update-function-code --function-name {function_name} --zip-file fileb://{zip_file}"
-        run_command(update_cmd)
+    layer_dir = os.path.join(DEPLOY_CACHE_DIR, "deps", file_sha256(requirements_file)[:16])
+    if os.path.isdir(layer_dir):
+        print(f"Reusing cached dependencies {os.path.basename(layer_dir)}")
+        return layer_dir
+
+    print(f"Installing dependencies from {requirements_file}...")
+    staging_dir = f"{layer_dir}.partial"
+    if os.path.exists(staging_dir):
+        shutil.rmtree(staging_dir)
+    os.makedirs(staging_dir)
+    subprocess.run(
+        ["pip", "install", "-r", requirements_file, "--target", staging_dir, "--no-compile"],
+        check=True,
+    )
+    os.replace(staging_dir, layer_dir)
+    return layer_dir
+
+
+def collect_package_files(source_dir, layer_dir=None):
+    """(archive name, path) for every file in the package, sorted by archive name."""
+    files = {}
+
+    if layer_dir:
+        for root, dirs, names in os.walk(layer_dir):
+            dirs[:] = [d for d in dirs if d not in IGNORED_NAMES]
+            for name in names:
+                if name.endswith(".pyc"):
+                    continue
+                path = os.path.join(root, name)
+                files[os.path.relpath(path, layer_dir).replace(os.sep, "/")] = path
+
+    # Top-level Python files plus whole subpackages, as before
+    for item in os.listdir(source_dir):
+        path = os.path.join(source_dir, item)
+        if item in IGNORED_NAMES or item.startswith("."):
+            continue
+        if os.path.isfile(path) and item.endswith(".py"):
+            files[item] = path
+        elif os.path.isdir(path):
+            for root, dirs, names in os.walk(path):
+                dirs[:] = [d for d in dirs if d not in IGNORED_NAMES]
+                for name in names:
+                    if name.endswith(".pyc"):
+                        continue
+                    file_path = os.path.join(root, name)
+                    arcname = os.path.relpath(file_path, source_dir).replace(os.sep, "/")
+                    files[arcname] = file_path
+
+    return sorted(files.items())
 
-        # Clean up ZIP file
-        if os.path.exists(zip_file):
-            os.remove(zip_file)
 
-        print(f"Successfully deployed {function_name}")
-        return True
+def create_zip_package(source_dir):
+    """
+    Create a deterministic ZIP deployment package for a Lambda function.
 
-    except (subprocess.CalledProcessError, OSError) as e:
-        print(f"Error deploying {function_name}: {str(e)}")
-        # Attempt to clean up ZIP file even on error
-        try:
-            if os.path.exists(zip_file):
-                os.remove(zip_file)
-        except OSError:
-            # Ignore cleanup errors
-            pass
-        return False
+    Entries are sorted and carry fixed timestamps and permissions, so the same
+    sources and dependencies always produce byte-identical archives.
 
+    Returns:
+        Path of the ZIP under the deploy cache
+    """
+    print(f"Creating ZIP package for {source_dir}...")
 
-def get_ecr_repository_uri(repository_name):
-    """Get the ECR repository URI."""
-    account_id = run_command(
-        "aws sts get-caller-identity --query Account --output text"
+    layer_dir = get_dependency_layer(source_dir)
+    os.makedirs(DEPLOY_CACHE_DIR, exist_ok=True)
+    zip_file = os.path.join(
+        DEPLOY_CACHE_DIR, f"{os.path.basename(os.path.normpath(source_dir))}.zip"
     )
-    region = "us-east-1"  # Hardcoded based on your configuration
-    return f"{account_id}.dkr.ecr.{region}.amazonaws.com/{repository_name}"
 
+    with zipfile.ZipFile(zip_file, "w", zipfile.ZIP_DEFLATED, compresslevel=9) as archive:
+        for arcname, path in collect_package_files(source_dir, layer_dir):
+            info = zipfile.ZipInfo(arcname, date_time=ZIP_TIMESTAMP)
+            info.compress_type = zipfile.ZIP_DEFLATED
+            info.external_attr = 0o100644 << 16
+            with open(path, "rb") as f:
+                archive.writestr(info, f.read())
+
+    return zip_file
 
-def deploy_container_lambda(source_dir, repository_name, function_name):
-    """Deploy a container-based Lambda function."""
-    print(f"\nDeploying container for {function_name}...")
+
+def lambda_code_sha256(zip_file):
+    """CodeSha256 as Lambda reports it: base64 of the raw SHA-256 digest."""
+    return base64.b64encode(bytes.fromhex(file_sha256(zip_file))).decode("ascii")
+
+
+def deploy_zip_lambda(source_dir, function_name):
+    """Deploy a ZIP-based Lambda function, skipping it when the code is unchanged."""
+    print(f"\nDeploying ZIP package for {function_name}...")
 
     try:
-        # Get AWS account and repository URI
-        aws_account = run_command(
-            "aws sts get-caller-identity --query Account --output text"
-        )
-        if not aws_account:
-            raise DeploymentError("Failed to get AWS account ID")
+        zip_file = create_zip_package(source_dir)
+        code_sha256 = lambda_code_sha256(zip_file)
 
-        repository_uri = (
-            f"{aws_account}.dkr.ecr.us-east-1.amazonaws.com/{repository_name}"
+        deployed_sha256 = run_command(
+            f"aws lambda get-function-configuration --function-name {function_name} "
+            f"--query CodeSha256 --output text",
+            check=False,
         )
-
-        # Generate tag
-        tag = datetime.datetime.now().strftime("%Y%m%d%H%M%S")
-        image_uri = f"{repository_uri}:{tag}"
-        local_tag = f"{repository_name}:latest"
-
-        # Build the image locally first
-        print(f"Building Docker image for {source_dir}...")
-        try:
-            build_cmd = f"docker build -t {local_tag} {source_dir}"
-            run_command(build_cmd)
-        except subprocess.CalledProcessError as e:
-            raise DockerError(f"Failed to build Docker image: {str(e)}") from e
-
-        # Get ECR credentials and login
-        print("Authenticating with ECR...")
-        try:
-            if not docker_login_ecr(repository_uri):
-                raise ECRAuthenticationError("Failed to log in to ECR")
-        except Exception as e:
-            raise ECRAuthenticationError(f"ECR authentication failed: {str(e)}") from e
-
-        # Tag for ECR
-        print(f"Tagging image as {image_uri}...")
-        try:
-            tag_cmd = f"docker tag {local_tag} {image_uri}"
-            run_command(tag_cmd)
-        except subprocess.CalledProcessError as e:
-            raise DockerError(f"Failed to tag image: {str(e)}") from e
-
-        # Push to ECR
-        print("Pushing to ECR...")
-        if not push_docker_image(repository_uri, tag):
-            raise DockerError("Failed to push image to ECR")
+        if deployed_sha256 == code_sha256:
+            print(f"{function_name} already runs this package ({code_sha256}), skipping")
+            return True
 
         # Update Lambda function
-        print("Updating Lambda function...")
-        try:
-            update_cmd = f"aws lambda update-function-code --function-name {function_name} --image-uri {image_uri}"
-            run_command(update_cmd)
-        except subprocess.CalledProcessError as e:
-            raise DeploymentError(f"Failed to update Lambda function: {str(e)}") from e
+        print(f"Updating Lambda function {function_name}...")
+        update_cmd = f"aws lambda update-function-code --function-name {function_name} --zip-file fileb://{zip_file}"
+        run_command(update_cmd)
 
         print(f"Successfully deployed {function_name}")
         return True
 
-    except (subprocess.CalledProcessError, OSError, DeploymentError) as e:
+    except (subprocess.CalledProcessError, OSError) as e:
         print(f"Error deploying {function_name}: {str(e)}")
-        # Clean up any leftover images
-        try:
-            run_command(f"docker rmi {local_tag} {image_uri}", check=False)
-        except subprocess.CalledProcessError:
-            print("Failed to clean up Docker images")
         return False
 
 
 def main():
-    """Main entry point for deploying all Lambda functions."""
-    try:
-        # Configure all Lambda functions
-        lambdas = [
-            ("src/lambda", "trading-prod-function", "trading-prod-function"),
-            ("src/lambda2", "trading-prod-symbol-lookup", "trading-prod-symbol-lookup"),
-            ("src/lambda3", "trading-prod-coinbase", "trading-prod-coinbase"),
-        ]
-
-        for source_dir, repo_name, function_name in lambdas:
-            # Get the package type for the function
-            package_type = get_lambda_package_type(function_name)
-
-            if package_type == "Image":
-                # Generate image tag
-                image_tag = datetime.datetime.now().strftime("%Y%m%d%H%M%S")
-                repository_uri = (
-                    f"565625954376.dkr.ecr.us-east-1.amazonaws.com/{repo_name}"
-                )
-
-                # Add debug check
-                if not debug_ecr_setup(repository_uri):
-                    print(f"ECR setup check failed for {function_name}")
-                    sys.exit(1)
-
-                print(f"\nProcessing container Lambda: {function_name}")
-                print(f"Source directory: {source_dir}")
-                print(f"Repository URI: {repository_uri}")
-                print(f"Image tag: {image_tag}")
+    """Main entry point for deploying the Lambda functions under backend/services."""
+    parser = argparse.ArgumentParser(description="Build and deploy Lambda services")
+    parser.add_argument("--only", nargs="+", help="Service directories to deploy")
+    parser.add_argument("--jobs", type=int, default=4, help="Services built in parallel")
+    parser.add_argument("--force", action="store_true", help="Rebuild and redeploy unchanged services")
+    parser.add_argument("--dry-run", action="store_true")
+    parser.add_argument("--debug", action="store_true", help="Check ECR setup first")
+    args = parser.parse_args()
+
+    started = time.time()
+    services = [
+        service
+        for service in discover_services()
+        if not args.only or service["name"] in args.only
+    ]
+    if not services:
+        print("No services to deploy")
+        sys.exit(1)
 
-                # Change to the correct directory
-                original_dir = os.getcwd()
-                os.chdir(source_dir)
+    try:
+        image_services = [s for s in services if s["package_type"] == "Image"]
+        registry = None
+
+        if image_services:
+            account_id = run_command(
+                "aws sts get-caller-identity --query Account --output text"
+            )
+            registry = f"{account_id}.dkr.ecr.{AWS_REGION}.amazonaws.com"
+
+            if args.debug and not debug_ecr_setup(
+                f"{registry}/{image_services[0]['repository_name']}"
+            ):
+                sys.exit(1)
+
+            # One login covers every repository in the registry
+            if not args.dry_run and not docker_login_ecr(registry):
+                raise ECRAuthenticationError("Failed to log in to ECR")
 
+        failures = []
+        with ThreadPoolExecutor(max_workers=max(1, args.jobs)) as executor:
+            futures = {
+                executor.submit(
+                    deploy_image_service, service, registry, args.force, args.dry_run
+                ): service
+                for service in image_services
+            }
+            for future in as_completed(futures):
+                name = futures[future]["name"]
                 try:
-                    # Verify directory contents
-                    print("\nVerifying directory contents:")
-                    print(f"Current directory: {os.getcwd()}")
-                    print("Files in directory:")
-                    subprocess.run(["dir"], shell=True, check=True)
-
-                    # Build and push image
-                    if not push_docker_image(repository_uri, image_tag):
-                        print(f"Failed to push image for {function_name}")
-                        sys.exit(1)
-
-                    # Update Lambda function
-                    print(f"\nUpdating Lambda function {function_name}...")
-                    update_cmd = f"aws lambda update-function-code --function-name {function_name} --image-uri {repository_uri}:{image_tag}"
-                    result = subprocess.run(
-                        update_cmd, capture_output=True, text=True, check=True
-                    )
-                    print(f"Lambda update result: {result.stdout}")
-
-                finally:
-                    # Always return to original directory
-                    os.chdir(original_dir)
-
-            else:  # 'Zip' package type
-                success = deploy_zip_lambda(source_dir, function_name)
-                if not success:
-                    print(f"Failed to deploy {function_name}")
-                    sys.exit(1)
-
-        print("\nAll Lambda functions deployed successfully!")
+                    for step in future.result():
+                        print(f"[{name}] {step}")
+                except DeploymentError as e:
+                    print(str(e))
+                    failures.append(name)
+
+        for service in services:
+            if service["package_type"] != "Zip":
+                continue
+            for function_name in service["functions"]:
+                if args.dry_run:
+                    print(f"[{service['name']}] would deploy ZIP to {function_name}")
+                elif not deploy_zip_lambda(service["source_dir"], function_name):
+                    failures.append(service["name"])
+
+        if failures:
+            print(f"\nDeployment failed for: {', '.join(sorted(set(failures)))}")
+            sys.exit(1)
+
+        print(f"\nAll Lambda functions deployed in {time.time() - started:.1f}s")
 
     except (subprocess.CalledProcessError, OSError, DeploymentError) as e:
         print(f"Deployment failed with error: {str(e)}")
@@ -1,6 +1,7 @@
 // src/hooks/useEarningsCalendar.ts
 import { useState } from 'react'
 import EarningsEvent from '../types/earningsevent'
+import apiClient from '../lib/api'
 
 export function useEarningsCalendar() {
   const [events, setEvents] = useState<EarningsEvent[]>([])
@@ -12,27 +13,16 @@ export function useEarningsCalendar() {
     setError(null)
 
     try {
-      // Mock implementation - replace with actual API call
-      // Use the month parameter to filter events
-      console.log('Fetching earnings for month:', month.toISOString().substring(0, 7)) // YYYY-MM format
+      const toDate = (d: Date) => d.toISOString().substring(0, 10) // YYYY-MM-DD
+      const startDate = toDate(new Date(Date.UTC(month.getFullYear(), month.getMonth(), 1)))
+      const endDate = toDate(new Date(Date.UTC(month.getFullYear(), month.getMonth() + 1, 0)))
 
-      const mockEvents: EarningsEvent[] = [
-        // mock data here
-        // Example:
-        {
-          symbol: 'AAPL',
-          company: 'Apple Inc.',
-          date: '2025-01-30',
-          time: '5:00 PM ET',
-          quarter: 'Q1 2025',
-          importance: 'high',
-        },
-      ]
+      const response = await apiClient.getEarningsCalendar(startDate, endDate)
+      if (!response.success) {
+        throw new Error(response.error || 'Failed to fetch earnings events')
+      }
 
-      // Simulate API call
-      await new Promise(resolve => setTimeout(resolve, 1000))
-
-      setEvents(mockEvents)
+      setEvents((response.data || []).flatMap(day => day.events))
     } catch (err) {
       const errorMessage = err instanceof Error ? err.message : 'Failed to fetch earnings events'
       setError(errorMessage)
@@ -180,23 +180,10 @@ class ApiClient {
     >
   > {
     try {
-      // For now, return mock data - replace with actual search endpoint
-      const mockResults = [
-        { symbol: 'AAPL', name: 'Apple Inc.', exchange: 'NASDAQ' },
-        { symbol: 'MSFT', name: 'Microsoft Corporation', exchange: 'NASDAQ' },
-        { symbol: 'GOOGL', name: 'Alphabet Inc.', exchange: 'NASDAQ' },
-        { symbol: 'TSLA', name: 'Tesla, Inc.', exchange: 'NASDAQ' },
-        { symbol: 'AMZN', name: 'Amazon.com, Inc.', exchange: 'NASDAQ' },
-      ].filter(
-        stock =>
-          stock.symbol.toLowerCase().includes(query.toLowerCase()) ||
-          stock.name.toLowerCase().includes(query.toLowerCase())
-      )
-
-      return {
-        success: true,
-        data: mockResults,
-      }
+      const response = await this.client.get('/search', {
+        params: { q: query },
+      })
+      return response.data
     } catch (error: unknown) {
       const errorMessage = this.extractErrorMessage(error)
       return {
@@ -0,0 +1,231 @@
+"""Measure Lambda cold-start cost: local import time and deployed INIT duration.
+
+Examples:
+    # Import time of each handler module (run with the service requirements installed)
+    python measure_cold_start.py imports --runs 5
+
+    # INIT duration from the last 24h of REPORT lines in CloudWatch Logs
+    python measure_cold_start.py init --hours 24
+
+    # Force fresh cold starts (invokes the functions!) and report INIT duration
+    python measure_cold_start.py init --force 3 --only calendar-api symbol-search
+"""
+
+import argparse
+import base64
+import json
+import os
+import re
+import statistics
+import subprocess
+import sys
+import time
+
+PROJECT_NAME = os.environ.get("PROJECT_NAME", "earnings-sentiment")
+ENVIRONMENT = os.environ.get("ENVIRONMENT", "dev")
+AWS_REGION = os.environ.get("AWS_REGION", "us-east-1")
+
+BACKEND_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "backend")
+
+# Handler name -> (module imported at INIT, deployed function suffix, forced-start payload)
+HANDLERS = {
+    "fmp": ("services.fmp.fmp", "earnings-calendar", {}),
+    "calendar-api": (
+        "services.fmp.calendar_snapshot",
+        "calendar-api",
+        {"queryStringParameters": {}},
+    ),
+    "alpha-vantage": (
+        "services.alpha_vantage.alpha_vantage",
+        "earnings-transcripts",
+        {"mode": "search", "query": "guidance", "quarters": []},
+    ),
+    "symbol-search": (
+        "services.symbol_search.symbol_search",
+        "symbol-search",
+        {"queryStringParameters": {"q": "A"}},
+    ),
+}
+
+IMPORT_TIME_LINE = re.compile(r"import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)")
+INIT_DURATION = re.compile(r"Init Duration: ([\d.]+) ms")
+
+
+def percentile(values, pct):
+    """Nearest-rank percentile of a non-empty list"""
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))]
+
+
+def measure_imports(module, runs):
+    """
+    Import `module` in fresh interpreters with -X importtime.
+
+    Returns:
+        dict with median total milliseconds and the slowest top-level imports
+    """
+    totals = []
+    top_level = {}
+
+    for _ in range(runs):
+        result = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+            cwd=BACKEND_DIR,
+            capture_output=True,
+            text=True,
+            check=False,
+        )
+        if result.returncode != 0:
+            error = result.stderr.strip().splitlines()[-1]
+            return {"error": error}
+
+        total = 0
+        for line in result.stderr.splitlines():
+            match = IMPORT_TIME_LINE.match(line)
+            if not match:
+                continue
+            cumulative, indent, name = int(match.group(2)), match.group(3), match.group(4)
+            # Top-level imports are the least indented lines
+            if len(indent) <= 1:
+                total += cumulative
+                top_level.setdefault(name, []).append(cumulative)
+        totals.append(total / 1000)
+
+    slowest = sorted(
+        ((name, statistics.median(times) / 1000) for name, times in top_level.items()),
+        key=lambda item: item[1],
+        reverse=True,
+    )[:5]
+    return {"median_ms": statistics.median(totals), "slowest": slowest}
+
+
+def report_imports(args):
+    """Print import time per handler module"""
+    print(f"{'handler':<16}{'import ms':>12}   slowest top-level imports")
+    for handler in args.only or HANDLERS:
+        module = HANDLERS[handler][0]
+        result = measure_imports(module, args.runs)
+        if "error" in result:
+            print(f"{handler:<16}{'error':>12}   {result['error']}")
+            continue
+        slowest = ", ".join(f"{name} {ms:.0f}ms" for name, ms in result["slowest"])
+        print(f"{handler:<16}{result['median_ms']:>12.1f}   {slowest}")
+
+
+def function_name(handler):
+    return f"{PROJECT_NAME}-{HANDLERS[handler][1]}-{ENVIRONMENT}"
+
+
+def init_durations_from_logs(logs_client, name, hours):
+    """INIT durations (ms) from REPORT lines in the function's log group"""
+    durations = []
+    kwargs = {
+        "logGroupName": f"/aws/lambda/{name}",
+        "startTime": int((time.time() - hours * 3600) * 1000),
+        "filterPattern": '"Init Duration"',
+    }
+    while True:
+        response = logs_client.filter_log_events(**kwargs)
+        for event in response["events"]:
+            match = INIT_DURATION.search(event["message"])
+            if match:
+                durations.append(float(match.group(1)))
+        if "nextToken" not in response:
+            break
+        kwargs["nextToken"] = response["nextToken"]
+    return durations
+
+
+def force_cold_starts(lambda_client, name, payload, count):
+    """
+    Force `count` cold starts by touching the function configuration, then invoke.
+
+    Updating an environment variable retires every warm container, so the next
+    invoke always runs INIT. The REPORT line comes back in the log tail. The
+    original environment is restored afterwards so the function matches
+    terraform again.
+    """
+    durations = []
+    config = lambda_client.get_function_configuration(FunctionName=name)
+    original = config.get("Environment", {}).get("Variables", {})
+    waiter = lambda_client.get_waiter("function_updated_v2")
+
+    try:
+        for _ in range(count):
+            variables = {**original, "COLD_START_NONCE": str(time.time_ns())}
+            lambda_client.update_function_configuration(
+                FunctionName=name, Environment={"Variables": variables}
+            )
+            waiter.wait(FunctionName=name)
+
+            response = lambda_client.invoke(
+                FunctionName=name, LogType="Tail", Payload=json.dumps(payload).encode("utf-8")
+            )
+            log_tail = base64.b64decode(response["LogResult"]).decode("utf-8", "replace")
+            match = INIT_DURATION.search(log_tail)
+            if match:
+                durations.append(float(match.group(1)))
+    finally:
+        lambda_client.update_function_configuration(
+            FunctionName=name, Environment={"Variables": original}
+        )
+        waiter.wait(FunctionName=name)
+
+    return durations
+
+
+def report_init(args):
+    """Print INIT duration statistics per deployed function"""
+    import boto3
+
+    logs_client = boto3.client("logs", region_name=AWS_REGION)
+    lambda_client = boto3.client("lambda", region_name=AWS_REGION)
+
+    print(f"{'handler':<16}{'samples':>8}{'p50 ms':>10}{'p90 ms':>10}{'max ms':>10}")
+    for handler in args.only or HANDLERS:
+        name = function_name(handler)
+        try:
+            if args.force:
+                durations = force_cold_starts(
+                    lambda_client, name, HANDLERS[handler][2], args.force
+                )
+            else:
+                durations = init_durations_from_logs(logs_client, name, args.hours)
+        except Exception as e:
+            print(f"{handler:<16}  error: {e}")
+            continue
+
+        if not durations:
+            print(f"{handler:<16}{0:>8}")
+            continue
+        print(
+            f"{handler:<16}{len(durations):>8}"
+            f"{percentile(durations, 50):>10.0f}"
+            f"{percentile(durations, 90):>10.0f}"
+            f"{max(durations):>10.0f}"
+        )
+
+
+def main():
+    """Main entry point."""
+    parser = argparse.ArgumentParser(description="Measure Lambda cold-start cost")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    imports_parser = subparsers.add_parser("imports", help="Local import time per handler")
+    imports_parser.add_argument("--runs", type=int, default=5)
+    imports_parser.add_argument("--only", nargs="+", choices=list(HANDLERS))
+
+    init_parser = subparsers.add_parser("init", help="Deployed INIT duration per handler")
+    init_parser.add_argument("--hours", type=float, default=24)
+    init_parser.add_argument("--force", type=int, default=0, help="Force N cold starts")
+    init_parser.add_argument("--only", nargs="+", choices=list(HANDLERS))
+
+    args = parser.parse_args()
+    if args.command == "imports":
+        report_imports(args)
+    else:
+        report_init(args)
+
+
+if __name__ == "__main__":
+    main()
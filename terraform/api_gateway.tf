@@ -59,6 +59,20 @@ resource "aws_api_gateway_resource" "health" {
   path_part   = "health"
 }
 
+# /search resource
+resource "aws_api_gateway_resource" "search" {
+  rest_api_id = aws_api_gateway_rest_api.main.id
+  parent_id   = aws_api_gateway_rest_api.main.root_resource_id
+  path_part   = "search"
+}
+
+# /calendar resource
+resource "aws_api_gateway_resource" "calendar" {
+  rest_api_id = aws_api_gateway_rest_api.main.id
+  parent_id   = aws_api_gateway_rest_api.main.root_resource_id
+  path_part   = "calendar"
+}
+
 # POST method for /sentiment
 resource "aws_api_gateway_method" "sentiment_post" {
   rest_api_id   = aws_api_gateway_rest_api.main.id
@@ -101,6 +115,33 @@ resource "aws_api_gateway_method" "health_get" {
   authorization = "NONE"
 }
 
+# GET method for /search?q=
+resource "aws_api_gateway_method" "search_get" {
+  rest_api_id   = aws_api_gateway_rest_api.main.id
+  resource_id   = aws_api_gateway_resource.search.id
+  http_method   = "GET"
+  authorization = "NONE"
+
+  request_parameters = {
+    "method.request.querystring.q"     = true
+    "method.request.querystring.limit" = false
+  }
+}
+
+# GET method for /calendar?start_date=&end_date=&symbols=
+resource "aws_api_gateway_method" "calendar_get" {
+  rest_api_id   = aws_api_gateway_rest_api.main.id
+  resource_id   = aws_api_gateway_resource.calendar.id
+  http_method   = "GET"
+  authorization = "NONE"
+
+  request_parameters = {
+    "method.request.querystring.start_date" = false
+    "method.request.querystring.end_date"   = false
+    "method.request.querystring.symbols"    = false
+  }
+}
+
 # OPTIONS methods for CORS
 resource "aws_api_gateway_method" "sentiment_options" {
   rest_api_id   = aws_api_gateway_rest_api.main.id
@@ -123,6 +164,20 @@ resource "aws_api_gateway_method" "prediction_options" {
   authorization = "NONE"
 }
 
+resource "aws_api_gateway_method" "search_options" {
+  rest_api_id   = aws_api_gateway_rest_api.main.id
+  resource_id   = aws_api_gateway_resource.search.id
+  http_method   = "OPTIONS"
+  authorization = "NONE"
+}
+
+resource "aws_api_gateway_method" "calendar_options" {
+  rest_api_id   = aws_api_gateway_rest_api.main.id
+  resource_id   = aws_api_gateway_resource.calendar.id
+  http_method   = "OPTIONS"
+  authorization = "NONE"
+}
+
 # Lambda integrations
 resource "aws_api_gateway_integration" "sentiment_lambda" {
   rest_api_id = aws_api_gateway_rest_api.main.id
@@ -154,6 +209,26 @@ resource "aws_api_gateway_integration" "prediction_lambda" {
   uri                     = aws_lambda_function.prediction_engine.invoke_arn
 }
 
+resource "aws_api_gateway_integration" "search_lambda" {
+  rest_api_id = aws_api_gateway_rest_api.main.id
+  resource_id = aws_api_gateway_resource.search.id
+  http_method = aws_api_gateway_method.search_get.http_method
+
+  integration_http_method = "POST"
+  type                    = "AWS_PROXY"
+  uri                     = aws_lambda_function.symbol_search_lambda.invoke_arn
+}
+
+resource "aws_api_gateway_integration" "calendar_lambda" {
+  rest_api_id = aws_api_gateway_rest_api.main.id
+  resource_id = aws_api_gateway_resource.calendar.id
+  http_method = aws_api_gateway_method.calendar_get.http_method
+
+  integration_http_method = "POST"
+  type                    = "AWS_PROXY"
+  uri                     = aws_lambda_function.calendar_api_lambda.invoke_arn
+}
+
 # Mock integrations for OPTIONS methods (CORS)
 resource "aws_api_gateway_integration" "sentiment_options_mock" {
   rest_api_id = aws_api_gateway_rest_api.main.id
@@ -194,6 +269,32 @@ resource "aws_api_gateway_integration" "prediction_options_mock" {
   }
 }
 
+resource "aws_api_gateway_integration" "search_options_mock" {
+  rest_api_id = aws_api_gateway_rest_api.main.id
+  resource_id = aws_api_gateway_resource.search.id
+  http_method = aws_api_gateway_method.search_options.http_method
+
+  type = "MOCK"
+  request_templates = {
+    "application/json" = jsonencode({
+      statusCode = 200
+    })
+  }
+}
+
+resource "aws_api_gateway_integration" "calendar_options_mock" {
+  rest_api_id = aws_api_gateway_rest_api.main.id
+  resource_id = aws_api_gateway_resource.calendar.id
+  http_method = aws_api_gateway_method.calendar_options.http_method
+
+  type = "MOCK"
+  request_templates = {
+    "application/json" = jsonencode({
+      statusCode = 200
+    })
+  }
+}
+
 # Health endpoint integration (mock for now)
 resource "aws_api_gateway_integration" "health_mock" {
   rest_api_id = aws_api_gateway_rest_api.main.id
@@ -294,6 +395,32 @@ resource "aws_api_gateway_method_response" "prediction_options_200" {
   }
 }
 
+resource "aws_api_gateway_method_response" "search_options_200" {
+  rest_api_id = aws_api_gateway_rest_api.main.id
+  resource_id = aws_api_gateway_resource.search.id
+  http_method = aws_api_gateway_method.search_options.http_method
+  status_code = "200"
+
+  response_parameters = {
+    "method.response.header.Access-Control-Allow-Headers" = true
+    "method.response.header.Access-Control-Allow-Methods" = true
+    "method.response.header.Access-Control-Allow-Origin"  = true
+  }
+}
+
+resource "aws_api_gateway_method_response" "calendar_options_200" {
+  rest_api_id = aws_api_gateway_rest_api.main.id
+  resource_id = aws_api_gateway_resource.calendar.id
+  http_method = aws_api_gateway_method.calendar_options.http_method
+  status_code = "200"
+
+  response_parameters = {
+    "method.response.header.Access-Control-Allow-Headers" = true
+    "method.response.header.Access-Control-Allow-Methods" = true
+    "method.response.header.Access-Control-Allow-Origin"  = true
+  }
+}
+
 # Integration responses for Lambda methods
 resource "aws_api_gateway_integration_response" "sentiment_lambda_integration_response" {
   rest_api_id = aws_api_gateway_rest_api.main.id
@@ -406,6 +533,36 @@ resource "aws_api_gateway_integration_response" "prediction_options_integration_
   depends_on = [aws_api_gateway_integration.prediction_options_mock]
 }
 
+resource "aws_api_gateway_integration_response" "search_options_integration_response" {
+  rest_api_id = aws_api_gateway_rest_api.main.id
+  resource_id = aws_api_gateway_resource.search.id
+  http_method = aws_api_gateway_method.search_options.http_method
+  status_code = aws_api_gateway_method_response.search_options_200.status_code
+
+  response_parameters = {
+    "method.response.header.Access-Control-Allow-Headers" = "'Content-Type,X-Amz-Date,Authorization,X-Api-Key,X-Amz-Security-Token'"
+    "method.response.header.Access-Control-Allow-Methods" = "'GET,OPTIONS'"
+    "method.response.header.Access-Control-Allow-Origin"  = "'*'"
+  }
+
+  depends_on = [aws_api_gateway_integration.search_options_mock]
+}
+
+resource "aws_api_gateway_integration_response" "calendar_options_integration_response" {
+  rest_api_id = aws_api_gateway_rest_api.main.id
+  resource_id = aws_api_gateway_resource.calendar.id
+  http_method = aws_api_gateway_method.calendar_options.http_method
+  status_code = aws_api_gateway_method_response.calendar_options_200.status_code
+
+  response_parameters = {
+    "method.response.header.Access-Control-Allow-Headers" = "'Content-Type,X-Amz-Date,Authorization,X-Api-Key,X-Amz-Security-Token,If-None-Match'"
+    "method.response.header.Access-Control-Allow-Methods" = "'GET,OPTIONS'"
+    "method.response.header.Access-Control-Allow-Origin"  = "'*'"
+  }
+
+  depends_on = [aws_api_gateway_integration.calendar_options_mock]
+}
+
 # API Gateway deployment
 resource "aws_api_gateway_deployment" "main" {
   depends_on = [
@@ -429,7 +586,17 @@ resource "aws_api_gateway_deployment" "main" {
     aws_api_gateway_method.sentiment_options,
     aws_api_gateway_method.stock_options,
     aws_api_gateway_method.prediction_options,
-    aws_api_gateway_method.health_get
+    aws_api_gateway_method.health_get,
+    aws_api_gateway_method.search_get,
+    aws_api_gateway_integration.search_lambda,
+    aws_api_gateway_method.search_options,
+    aws_api_gateway_integration.search_options_mock,
+    aws_api_gateway_integration_response.search_options_integration_response,
+    aws_api_gateway_method.calendar_get,
+    aws_api_gateway_integration.calendar_lambda,
+    aws_api_gateway_method.calendar_options,
+    aws_api_gateway_integration.calendar_options_mock,
+    aws_api_gateway_integration_response.calendar_options_integration_response
   ]
 
   rest_api_id = aws_api_gateway_rest_api.main.id
@@ -449,6 +616,18 @@ resource "aws_api_gateway_deployment" "main" {
       aws_api_gateway_integration.prediction_lambda.id,
       aws_api_gateway_integration.health_mock.id,
       aws_api_gateway_integration_response.health_integration_response.id,
+      aws_api_gateway_resource.search.id,
+      aws_api_gateway_method.search_get.id,
+      aws_api_gateway_integration.search_lambda.id,
+      aws_api_gateway_method.search_options.id,
+      aws_api_gateway_integration.search_options_mock.id,
+      aws_api_gateway_integration_response.search_options_integration_response.id,
+      aws_api_gateway_resource.calendar.id,
+      aws_api_gateway_method.calendar_get.id,
+      aws_api_gateway_integration.calendar_lambda.id,
+      aws_api_gateway_method.calendar_options.id,
+      aws_api_gateway_integration.calendar_options_mock.id,
+      aws_api_gateway_integration_response.calendar_options_integration_response.id,
     ]))
   }
 
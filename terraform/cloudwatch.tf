@@ -49,6 +49,26 @@ resource "aws_cloudwatch_log_group" "prediction_engine_logs" {
   })
 }
 
+resource "aws_cloudwatch_log_group" "symbol_search_lambda_logs" {
+  name              = "/aws/lambda/${aws_lambda_function.symbol_search_lambda.function_name}"
+  retention_in_days = 14
+  
+  tags = merge(var.tags, {
+    Name        = "${var.project_name}-symbol-search-logs-${var.environment}"
+    Environment = var.environment
+  })
+}
+
+resource "aws_cloudwatch_log_group" "calendar_api_lambda_logs" {
+  name              = "/aws/lambda/${aws_lambda_function.calendar_api_lambda.function_name}"
+  retention_in_days = 14
+  
+  tags = merge(var.tags, {
+    Name        = "${var.project_name}-calendar-api-logs-${var.environment}"
+    Environment = var.environment
+  })
+}
+
 # CloudWatch Log Group for ECS Application
 resource "aws_cloudwatch_log_group" "app" {
   name              = "/ecs/${var.app_name}"
@@ -224,4 +224,140 @@ resource "aws_dynamodb_table" "earnings_transcripts" {
     Environment = var.environment
     Purpose     = "Earnings transcript metadata storage"
   })
-}
\ No newline at end of file
+}
+
+# DynamoDB table for sector/period sentiment rollups maintained on ingest
+resource "aws_dynamodb_table" "analytics_rollups" {
+  name         = "${var.project_name}-analytics-rollups-${var.environment}"
+  billing_mode = "PAY_PER_REQUEST"
+  hash_key     = "rollup_id"
+  range_key    = "period"
+
+  attribute {
+    name = "rollup_id"
+    type = "S"
+  }
+
+  attribute {
+    name = "period"
+    type = "S"
+  }
+
+  # Global Secondary Index for reading every sector in one period
+  global_secondary_index {
+    name            = "period-index"
+    hash_key        = "period"
+    range_key       = "rollup_id"
+    projection_type = "ALL"
+  }
+
+  # Enable point-in-time recovery
+  point_in_time_recovery {
+    enabled = true
+  }
+
+  # Server-side encryption
+  server_side_encryption {
+    enabled = true
+  }
+
+  tags = merge(var.tags, {
+    Name        = "${var.project_name}-analytics-rollups-${var.environment}"
+    Environment = var.environment
+    Purpose     = "Precomputed sector and trend sentiment aggregates"
+  })
+}
+
+# DynamoDB table for resumable transcript backfill checkpoints
+resource "aws_dynamodb_table" "backfill_checkpoints" {
+  name         = "${var.project_name}-backfill-checkpoints-${var.environment}"
+  billing_mode = "PAY_PER_REQUEST"
+  hash_key     = "job_id"
+
+  attribute {
+    name = "job_id"
+    type = "S"
+  }
+
+  # Server-side encryption
+  server_side_encryption {
+    enabled = true
+  }
+
+  tags = merge(var.tags, {
+    Name        = "${var.project_name}-backfill-checkpoints-${var.environment}"
+    Environment = var.environment
+    Purpose     = "Progress of chained transcript backfills"
+  })
+}
+
+# DynamoDB table for per-key API call counters shared by every fetcher
+resource "aws_dynamodb_table" "api_quota" {
+  name         = "${var.project_name}-api-quota-${var.environment}"
+  billing_mode = "PAY_PER_REQUEST"
+  hash_key     = "counter_key"
+
+  attribute {
+    name = "counter_key"
+    type = "S"
+  }
+
+  # Minute and day counters expire on their own
+  ttl {
+    attribute_name = "expires_at"
+    enabled        = true
+  }
+
+  # Server-side encryption
+  server_side_encryption {
+    enabled = true
+  }
+
+  tags = merge(var.tags, {
+    Name        = "${var.project_name}-api-quota-${var.environment}"
+    Environment = var.environment
+    Purpose     = "Cross-invocation API quota ledger"
+  })
+}
+
+# DynamoDB table for per-role sentiment time series and their rollups
+resource "aws_dynamodb_table" "sentiment_series" {
+  name         = "${var.project_name}-sentiment-series-${var.environment}"
+  billing_mode = "PAY_PER_REQUEST"
+  hash_key     = "series_id"
+  range_key    = "period"
+
+  attribute {
+    name = "series_id"
+    type = "S"
+  }
+
+  attribute {
+    name = "period"
+    type = "S"
+  }
+
+  # Global Secondary Index for reading every symbol in one period
+  global_secondary_index {
+    name            = "period-index"
+    hash_key        = "period"
+    range_key       = "series_id"
+    projection_type = "ALL"
+  }
+
+  # Enable point-in-time recovery
+  point_in_time_recovery {
+    enabled = true
+  }
+
+  # Server-side encryption
+  server_side_encryption {
+    enabled = true
+  }
+
+  tags = merge(var.tags, {
+    Name        = "${var.project_name}-sentiment-series-${var.environment}"
+    Environment = var.environment
+    Purpose     = "Per-role sentiment time series with quarter, year and trailing-4Q rollups"
+  })
+}
@@ -97,8 +97,8 @@ resource "aws_ecr_lifecycle_policy" "fmp_lambda_repo" {
 resource "docker_image" "fmp_lambda_image" {
   name = "${aws_ecr_repository.fmp_lambda_repo.repository_url}:latest"
   build {
-    context    = "../backend/services/fmp"
-    dockerfile = "Dockerfile"
+    context    = "../backend"  # shared modules live in backend/services/shared
+    dockerfile = "services/fmp/Dockerfile"
     platform   = "linux/amd64"
   }
 
@@ -159,8 +159,8 @@ resource "aws_ecr_lifecycle_policy" "alpha_vantage_lambda_repo" {
 resource "docker_image" "alpha_vantage_lambda_image" {
   name = "${aws_ecr_repository.alpha_vantage_lambda_repo.repository_url}:latest"
   build {
-    context    = "../backend/services/alpha_vantage"
-    dockerfile = "Dockerfile"
+    context    = "../backend"  # shared modules live in backend/services/shared
+    dockerfile = "services/alpha_vantage/Dockerfile"
     platform   = "linux/amd64"
   }
 
@@ -179,4 +179,66 @@ resource "docker_registry_image" "alpha_vantage_lambda_image" {
   triggers = {
     image_id = docker_image.alpha_vantage_lambda_image.image_id
   }
-}
\ No newline at end of file
+}
+
+# ECR Repository for Symbol Search Lambda
+resource "aws_ecr_repository" "symbol_search_lambda_repo" {
+  name                 = "${var.app_name}-symbol-search-lambda"
+  image_tag_mutability = "MUTABLE"
+
+  image_scanning_configuration {
+    scan_on_push = true
+  }
+
+  tags = {
+    Name = "${var.app_name}-symbol-search-lambda-ecr"
+  }
+}
+
+# ECR Lifecycle Policy for Symbol Search Lambda
+resource "aws_ecr_lifecycle_policy" "symbol_search_lambda_repo" {
+  repository = aws_ecr_repository.symbol_search_lambda_repo.name
+
+  policy = jsonencode({
+    rules = [
+      {
+        rulePriority = 1
+        description  = "Keep last 10 images"
+        selection = {
+          tagStatus   = "any"
+          countType   = "imageCountMoreThan"
+          countNumber = 10
+        }
+        action = {
+          type = "expire"
+        }
+      }
+    ]
+  })
+}
+
+# Build and push Symbol Search Lambda Docker image
+resource "docker_image" "symbol_search_lambda_image" {
+  name = "${aws_ecr_repository.symbol_search_lambda_repo.repository_url}:latest"
+  build {
+    context    = "../backend"  # shared modules live in backend/services/shared
+    dockerfile = "services/symbol_search/Dockerfile"
+    platform   = "linux/amd64"
+  }
+
+  triggers = {
+    symbol_search_context_hash = sha1(join("", [
+      for f in concat(
+        [for f in fileset("../backend/services/symbol_search", "**") : "symbol_search/${f}"],
+        [for f in fileset("../backend/services/shared", "*.py") : "shared/${f}"],
+      ) : filesha1("../backend/services/${f}")
+    ]))
+  }
+}
+
+resource "docker_registry_image" "symbol_search_lambda_image" {
+  name = docker_image.symbol_search_lambda_image.name
+  triggers = {
+    image_id = docker_image.symbol_search_lambda_image.image_id
+  }
+}
@@ -35,4 +35,64 @@ resource "aws_cloudwatch_event_target" "earnings_transcripts_target" {
   rule      = aws_cloudwatch_event_rule.earnings_transcripts_schedule.name
   target_id = "EarningsTranscriptsTarget"
   arn       = aws_lambda_function.earnings_transcripts_lambda.arn
-}
\ No newline at end of file
+}
+
+# EventBridge Rule for calendar-driven transcript dispatch
+# Runs after the daily calendar refresh and enqueues only companies that just reported
+resource "aws_cloudwatch_event_rule" "earnings_transcripts_dispatch" {
+  name                = "${var.project_name}-earnings-transcripts-dispatch-${var.environment}"
+  description         = "Enqueue transcript fetches for companies that reported recently"
+  schedule_expression = "cron(0 8 * * ? *)"  # Daily at 8 AM UTC, after the calendar refresh
+
+  tags = merge(var.tags, {
+    Name        = "${var.project_name}-earnings-transcripts-dispatch-${var.environment}"
+    Environment = var.environment
+  })
+}
+
+# EventBridge Target for transcript dispatch
+resource "aws_cloudwatch_event_target" "earnings_transcripts_dispatch_target" {
+  rule      = aws_cloudwatch_event_rule.earnings_transcripts_dispatch.name
+  target_id = "EarningsTranscriptsDispatchTarget"
+  arn       = aws_lambda_function.earnings_transcripts_lambda.arn
+  input     = jsonencode({ mode = "dispatch", days_back = 3 })
+}
+
+# EventBridge Rule for folding newly ingested transcripts into the search index shards
+resource "aws_cloudwatch_event_rule" "search_index_compaction" {
+  name                = "${var.project_name}-search-index-compaction-${var.environment}"
+  description         = "Compact the transcript search index for recent quarters"
+  schedule_expression = "cron(0 */6 * * ? *)"  # Every 6 hours
+
+  tags = merge(var.tags, {
+    Name        = "${var.project_name}-search-index-compaction-${var.environment}"
+    Environment = var.environment
+  })
+}
+
+resource "aws_cloudwatch_event_target" "search_index_compaction_target" {
+  rule      = aws_cloudwatch_event_rule.search_index_compaction.name
+  target_id = "SearchIndexCompactionTarget"
+  arn       = aws_lambda_function.earnings_transcripts_lambda.arn
+  input     = jsonencode({ mode = "compact_index", recent_quarters = 2 })
+}
+
+
+# EventBridge Rule for rebuilding the symbol search index after the calendar refresh
+resource "aws_cloudwatch_event_rule" "symbol_search_rebuild" {
+  name                = "${var.project_name}-symbol-search-rebuild-${var.environment}"
+  description         = "Rebuild the symbol search index from calendar and transcript symbols"
+  schedule_expression = "cron(30 6 * * ? *)"  # Daily at 6:30 AM UTC
+
+  tags = merge(var.tags, {
+    Name        = "${var.project_name}-symbol-search-rebuild-${var.environment}"
+    Environment = var.environment
+  })
+}
+
+resource "aws_cloudwatch_event_target" "symbol_search_rebuild_target" {
+  rule      = aws_cloudwatch_event_rule.symbol_search_rebuild.name
+  target_id = "SymbolSearchRebuildTarget"
+  arn       = aws_lambda_function.symbol_search_lambda.arn
+  input     = jsonencode({ mode = "build" })
+}
@@ -41,7 +41,8 @@ resource "aws_iam_policy" "lambda_s3_policy" {
           "s3:GetObject",
           "s3:PutObject",
           "s3:DeleteObject",
-          "s3:ListBucket"
+          "s3:ListBucket",
+          "s3:AbortMultipartUpload"
         ]
         Resource = [
           aws_s3_bucket.ml_models.arn,
@@ -77,6 +78,7 @@ resource "aws_iam_policy" "lambda_dynamodb_policy" {
         Effect = "Allow"
         Action = [
           "dynamodb:GetItem",
+          "dynamodb:BatchGetItem",
           "dynamodb:PutItem",
           "dynamodb:UpdateItem",
           "dynamodb:DeleteItem",
@@ -88,7 +90,13 @@ resource "aws_iam_policy" "lambda_dynamodb_policy" {
           aws_dynamodb_table.earnings_cache.arn,
           "${aws_dynamodb_table.earnings_cache.arn}/index/*",
           aws_dynamodb_table.earnings_transcripts.arn,
-          "${aws_dynamodb_table.earnings_transcripts.arn}/index/*"
+          "${aws_dynamodb_table.earnings_transcripts.arn}/index/*",
+          aws_dynamodb_table.analytics_rollups.arn,
+          "${aws_dynamodb_table.analytics_rollups.arn}/index/*",
+          aws_dynamodb_table.backfill_checkpoints.arn,
+          aws_dynamodb_table.api_quota.arn,
+          aws_dynamodb_table.sentiment_series.arn,
+          "${aws_dynamodb_table.sentiment_series.arn}/index/*"
         ]
       }
     ]
@@ -472,4 +480,75 @@ resource "aws_lambda_permission" "earnings_transcripts_eventbridge" {
   source_arn    = "arn:aws:events:${data.aws_region.current.name}:${data.aws_caller_identity.current.account_id}:rule/${var.project_name}-earnings-transcripts-schedule-${var.environment}"
 
   depends_on = [aws_lambda_function.earnings_transcripts_lambda]
-}
\ No newline at end of file
+}
+
+resource "aws_lambda_permission" "earnings_transcripts_dispatch_eventbridge" {
+  statement_id  = "AllowExecutionFromEventBridge-earnings-transcripts-dispatch"
+  action        = "lambda:InvokeFunction"
+  function_name = aws_lambda_function.earnings_transcripts_lambda.function_name
+  principal     = "events.amazonaws.com"
+  source_arn    = aws_cloudwatch_event_rule.earnings_transcripts_dispatch.arn
+}
+
+resource "aws_lambda_permission" "search_index_compaction_eventbridge" {
+  statement_id  = "AllowExecutionFromEventBridge-search-index-compaction"
+  action        = "lambda:InvokeFunction"
+  function_name = aws_lambda_function.earnings_transcripts_lambda.function_name
+  principal     = "events.amazonaws.com"
+  source_arn    = aws_cloudwatch_event_rule.search_index_compaction.arn
+}
+
+# Allow the transcripts Lambda to enqueue async invocations of itself when dispatching
+resource "aws_iam_policy" "earnings_transcripts_dispatch_policy" {
+  name        = "${var.project_name}-earnings-transcripts-dispatch-policy-${var.environment}"
+  description = "IAM policy for the transcripts Lambda to enqueue per-quarter fetches"
+
+  policy = jsonencode({
+    Version = "2012-10-17"
+    Statement = [
+      {
+        Effect = "Allow"
+        Action = [
+          "lambda:InvokeFunction"
+        ]
+        Resource = [
+          "arn:aws:lambda:${data.aws_region.current.name}:${data.aws_caller_identity.current.account_id}:function:${var.project_name}-earnings-transcripts-${var.environment}"
+        ]
+      }
+    ]
+  })
+
+  tags = merge(var.tags, {
+    Name        = "${var.project_name}-earnings-transcripts-dispatch-policy-${var.environment}"
+    Environment = var.environment
+  })
+}
+
+resource "aws_iam_role_policy_attachment" "earnings_transcripts_lambda_dispatch_attachment" {
+  role       = aws_iam_role.earnings_transcripts_lambda_role.name
+  policy_arn = aws_iam_policy.earnings_transcripts_dispatch_policy.arn
+}
+
+resource "aws_lambda_permission" "symbol_search_api_gateway" {
+  statement_id  = "AllowExecutionFromAPIGateway-symbol-search"
+  action        = "lambda:InvokeFunction"
+  function_name = aws_lambda_function.symbol_search_lambda.function_name
+  principal     = "apigateway.amazonaws.com"
+  source_arn    = "arn:aws:execute-api:${data.aws_region.current.name}:${data.aws_caller_identity.current.account_id}:*/*/*"
+}
+
+resource "aws_lambda_permission" "symbol_search_eventbridge" {
+  statement_id  = "AllowExecutionFromEventBridge-symbol-search"
+  action        = "lambda:InvokeFunction"
+  function_name = aws_lambda_function.symbol_search_lambda.function_name
+  principal     = "events.amazonaws.com"
+  source_arn    = aws_cloudwatch_event_rule.symbol_search_rebuild.arn
+}
+
+resource "aws_lambda_permission" "calendar_api_api_gateway" {
+  statement_id  = "AllowExecutionFromAPIGateway-calendar-api"
+  action        = "lambda:InvokeFunction"
+  function_name = aws_lambda_function.calendar_api_lambda.function_name
+  principal     = "apigateway.amazonaws.com"
+  source_arn    = "arn:aws:execute-api:${data.aws_region.current.name}:${data.aws_caller_identity.current.account_id}:*/*/*"
+}
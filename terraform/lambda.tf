@@ -133,6 +133,7 @@ resource "aws_lambda_function" "earnings_calendar_lambda" {
     variables = {
       FMP_API_KEY             = var.fmp_api_key
       EARNINGS_CALENDAR_TABLE = aws_dynamodb_table.earnings_cache.name
+      EARNINGS_DATA_BUCKET    = aws_s3_bucket.earnings_data.bucket
       PROJECT_NAME            = var.project_name
       ENVIRONMENT             = var.environment
     }
@@ -170,6 +171,7 @@ resource "aws_lambda_function" "earnings_transcripts_lambda" {
       ML_MODELS_BUCKET            = aws_s3_bucket.ml_models.bucket
       PROJECT_NAME                = var.project_name
       ENVIRONMENT                 = var.environment
+      HOT_SYMBOLS                 = var.hot_symbols
     }
   }
 
@@ -186,4 +188,69 @@ resource "aws_lambda_function" "earnings_transcripts_lambda" {
     Environment = var.environment
     Purpose     = "Earnings transcripts data processor with dual storage"
   })
-}
\ No newline at end of file
+}
+
+# Symbol Search Lambda Function (Docker-based)
+resource "aws_lambda_function" "symbol_search_lambda" {
+  image_uri     = "${aws_ecr_repository.symbol_search_lambda_repo.repository_url}:latest"
+  package_type  = "Image"
+  function_name = "${var.project_name}-symbol-search-${var.environment}"
+  role          = aws_iam_role.lambda_execution_role.arn
+  timeout       = 60  # Index rebuilds scan the calendar and transcripts tables
+  memory_size   = 256
+
+  environment {
+    variables = {
+      PROJECT_NAME = var.project_name
+      ENVIRONMENT  = var.environment
+    }
+  }
+
+  depends_on = [
+    docker_registry_image.symbol_search_lambda_image,
+    aws_iam_role_policy_attachment.lambda_basic_execution,
+    aws_iam_role_policy_attachment.lambda_s3_policy_attachment,
+    aws_iam_role_policy_attachment.lambda_dynamodb_policy_attachment,
+    aws_iam_role_policy_attachment.lambda_ssm_policy_attachment,
+  ]
+
+  tags = merge(var.tags, {
+    Name        = "${var.project_name}-symbol-search-${var.environment}"
+    Environment = var.environment
+    Purpose     = "Typeahead symbol search"
+  })
+}
+
+# Earnings Calendar read API (same image as the FMP fetcher, different handler)
+resource "aws_lambda_function" "calendar_api_lambda" {
+  image_uri     = "${aws_ecr_repository.fmp_lambda_repo.repository_url}:latest"
+  package_type  = "Image"
+  function_name = "${var.project_name}-calendar-api-${var.environment}"
+  role          = aws_iam_role.earnings_lambda_role.arn
+  timeout       = 30
+  memory_size   = 256
+
+  image_config {
+    command = ["services.fmp.calendar_snapshot.lambda_handler"]
+  }
+
+  environment {
+    variables = {
+      PROJECT_NAME = var.project_name
+      ENVIRONMENT  = var.environment
+    }
+  }
+
+  depends_on = [
+    docker_registry_image.fmp_lambda_image,
+    aws_iam_role_policy_attachment.earnings_lambda_basic_execution,
+    aws_iam_role_policy_attachment.earnings_lambda_s3_attachment,
+    aws_iam_role_policy_attachment.earnings_lambda_ssm_attachment,
+  ]
+
+  tags = merge(var.tags, {
+    Name        = "${var.project_name}-calendar-api-${var.environment}"
+    Environment = var.environment
+    Purpose     = "Earnings calendar read API"
+  })
+}
@@ -90,4 +90,52 @@ resource "aws_ssm_parameter" "ml_models_bucket" {
     Name        = "${var.project_name}-ml-models-bucket-${var.environment}"
     Environment = var.environment
   })
-}
\ No newline at end of file
+}
+
+# Store the analytics rollups table name in Parameter Store
+resource "aws_ssm_parameter" "analytics_rollups_table_name" {
+  name  = "/${var.project_name}/${var.environment}/analytics-rollups-table"
+  type  = "String"
+  value = aws_dynamodb_table.analytics_rollups.name
+
+  tags = merge(var.tags, {
+    Name        = "${var.project_name}-analytics-rollups-table-name-${var.environment}"
+    Environment = var.environment
+  })
+}
+
+# Store the backfill checkpoints table name in Parameter Store
+resource "aws_ssm_parameter" "backfill_checkpoints_table_name" {
+  name  = "/${var.project_name}/${var.environment}/backfill-checkpoints-table"
+  type  = "String"
+  value = aws_dynamodb_table.backfill_checkpoints.name
+
+  tags = merge(var.tags, {
+    Name        = "${var.project_name}-backfill-checkpoints-table-name-${var.environment}"
+    Environment = var.environment
+  })
+}
+
+# Store the API quota ledger table name in Parameter Store
+resource "aws_ssm_parameter" "api_quota_table_name" {
+  name  = "/${var.project_name}/${var.environment}/api-quota-table"
+  type  = "String"
+  value = aws_dynamodb_table.api_quota.name
+
+  tags = merge(var.tags, {
+    Name        = "${var.project_name}-api-quota-table-name-${var.environment}"
+    Environment = var.environment
+  })
+}
+
+# Store the sentiment series table name in Parameter Store
+resource "aws_ssm_parameter" "sentiment_series_table_name" {
+  name  = "/${var.project_name}/${var.environment}/sentiment-series-table"
+  type  = "String"
+  value = aws_dynamodb_table.sentiment_series.name
+
+  tags = merge(var.tags, {
+    Name        = "${var.project_name}-sentiment-series-table-name-${var.environment}"
+    Environment = var.environment
+  })
+}
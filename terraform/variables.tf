@@ -74,4 +74,10 @@ variable "alpha_vantage_api_key" {
   description = "Alpha Vantage API key"
   type        = string
   sensitive   = true
-}
\ No newline at end of file
+}
+
+variable "hot_symbols" {
+  description = "Comma-separated symbols whose latest transcripts are prewarmed into the transcripts Lambda cache on INIT"
+  type        = string
+  default     = ""
+}